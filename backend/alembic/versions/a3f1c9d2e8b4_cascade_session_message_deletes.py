@@ -0,0 +1,37 @@
+"""Cascade session deletes to messages at the FK level
+
+Revision ID: a3f1c9d2e8b4
+Revises: 7cd633ebcde5
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d2e8b4'
+down_revision: Union[str, None] = '7cd633ebcde5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('messages_session_id_fkey', 'messages', type_='foreignkey')
+    op.create_foreign_key(
+        'messages_session_id_fkey', 'messages', 'sessions',
+        ['session_id'], ['id'], ondelete='CASCADE'
+    )
+    # Backs the cascade and every per-session message read
+    op.create_index('ix_messages_session_id', 'messages', ['session_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_session_id', table_name='messages')
+    op.drop_constraint('messages_session_id_fkey', 'messages', type_='foreignkey')
+    op.create_foreign_key(
+        'messages_session_id_fkey', 'messages', 'sessions',
+        ['session_id'], ['id']
+    )
@@ -0,0 +1,119 @@
+"""Range-partition messages by month on timestamp
+
+Revision ID: c81d4e6f2a90
+Revises: a3f1c9d2e8b4
+Create Date: 2026-10-18 11:40:07.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d4e6f2a90'
+down_revision: Union[str, None] = 'a3f1c9d2e8b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, session_id, sender_id, recipient_id, message_type, content, message_metadata, "
+    "timestamp, is_suggestion, human_approved, learning_confidence"
+)
+
+
+def upgrade() -> None:
+    op.drop_index('ix_messages_session_id', table_name='messages')
+    op.rename_table('messages', 'messages_legacy')
+    op.execute("ALTER TABLE messages_legacy RENAME CONSTRAINT messages_pkey TO messages_legacy_pkey")
+
+    op.execute("""
+        CREATE TABLE messages (
+            id UUID NOT NULL,
+            session_id UUID NOT NULL,
+            sender_id UUID,
+            recipient_id UUID,
+            message_type messagetype NOT NULL,
+            content TEXT NOT NULL,
+            message_metadata JSON,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            is_suggestion VARCHAR(10),
+            human_approved VARCHAR(10),
+            learning_confidence JSON,
+            CONSTRAINT messages_pkey PRIMARY KEY (id, timestamp),
+            CONSTRAINT messages_session_id_fkey FOREIGN KEY (session_id)
+                REFERENCES sessions (id) ON DELETE CASCADE,
+            CONSTRAINT messages_sender_id_fkey FOREIGN KEY (sender_id) REFERENCES agents (id),
+            CONSTRAINT messages_recipient_id_fkey FOREIGN KEY (recipient_id) REFERENCES agents (id)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("CREATE TABLE messages_default PARTITION OF messages DEFAULT")
+
+    # One partition per month from the oldest existing message to three months
+    # ahead (matching MessageArchiveService.ensure_partitions) or the newest
+    # message, whichever is later. No copied row may land in messages_default:
+    # its month could then only be split out by moving rows.
+    op.execute("""
+        DO $$
+        DECLARE
+            month_start DATE;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(COALESCE(MIN(timestamp), now()), now())),
+                    GREATEST(
+                        date_trunc('month', now()) + interval '3 months',
+                        date_trunc('month', COALESCE(MAX(timestamp), now()))
+                    ),
+                    interval '1 month'
+                )::date
+                FROM messages_legacy
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF messages FOR VALUES FROM (%L) TO (%L)',
+                    'messages_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+                    month_start,
+                    month_start + interval '1 month'
+                );
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"""
+        INSERT INTO messages ({COLUMNS})
+        SELECT id, session_id, sender_id, recipient_id, message_type, content, message_metadata,
+               COALESCE(timestamp, now() AT TIME ZONE 'utc'), is_suggestion, human_approved, learning_confidence
+        FROM messages_legacy
+    """)
+    op.drop_table('messages_legacy')
+    op.create_index('ix_messages_session_id_timestamp', 'messages', ['session_id', 'timestamp'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_session_id_timestamp', table_name='messages')
+    op.rename_table('messages', 'messages_partitioned')
+    op.execute("ALTER TABLE messages_partitioned RENAME CONSTRAINT messages_pkey TO messages_partitioned_pkey")
+
+    op.create_table('messages',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('sender_id', sa.UUID(), nullable=True),
+    sa.Column('recipient_id', sa.UUID(), nullable=True),
+    sa.Column('message_type', postgresql.ENUM('DIRECT', 'BROADCAST', 'REQUEST', 'RESPONSE', 'ESCALATION', 'SYSTEM', 'HUMAN', name='messagetype', create_type=False), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('message_metadata', sa.JSON(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.Column('is_suggestion', sa.String(length=10), nullable=True),
+    sa.Column('human_approved', sa.String(length=10), nullable=True),
+    sa.Column('learning_confidence', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['recipient_id'], ['agents.id'], name='messages_recipient_id_fkey'),
+    sa.ForeignKeyConstraint(['sender_id'], ['agents.id'], name='messages_sender_id_fkey'),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], name='messages_session_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(f"INSERT INTO messages ({COLUMNS}) SELECT {COLUMNS} FROM messages_partitioned")
+    # Dropping the parent drops every partition with it
+    op.drop_table('messages_partitioned')
+    op.create_index('ix_messages_session_id', 'messages', ['session_id'])
@@ -3,8 +3,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from app.core.database import get_db
-from app.schemas.agent import AgentCreate, AgentResponse, AgentUpdate, AgentTemplate
+from app.core.database import get_db, get_read_db
+from app.schemas.agent import (
+    AgentCreate, AgentResponse, AgentUpdate, AgentTemplate, AgentBulkUpdate, AgentBulkDelete
+)
 from app.services.agent_service import AgentService
 from app.services.template_service import TemplateService
 
@@ -21,6 +23,42 @@ async def create_agent(
     return await service.create_agent(agent_data)
 
 
+@router.post("/bulk", response_model=List[AgentResponse])
+async def create_agents(
+    agents_data: List[AgentCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many agents in one statement"""
+    service = AgentService(db)
+    return await service.create_agents(agents_data)
+
+
+@router.put("/bulk", response_model=List[AgentResponse])
+async def update_agents(
+    agents_data: List[AgentBulkUpdate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Update many agents; fails without changes if any agent is missing"""
+    service = AgentService(db)
+    agents = await service.update_agents(agents_data)
+    found = {agent.id for agent in agents}
+    missing = [str(item.id) for item in agents_data if item.id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Agents not found: {', '.join(missing)}")
+    return agents
+
+
+@router.post("/bulk-delete")
+async def delete_agents(
+    delete_data: AgentBulkDelete,
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete many agents in one statement"""
+    service = AgentService(db)
+    deleted_ids = await service.delete_agents(delete_data.agent_ids)
+    return {"deleted_ids": deleted_ids}
+
+
 @router.post("/from-template/{template_name}", response_model=AgentResponse)
 async def create_agent_from_template(
     template_name: str,
@@ -41,7 +79,7 @@ async def create_agent_from_template(
 async def list_agents(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all available agents"""
     service = AgentService(db)
@@ -63,7 +101,7 @@ async def list_team_templates():
 @router.get("/{agent_id}", response_model=AgentResponse)
 async def get_agent(
     agent_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific agent by ID"""
     service = AgentService(db)
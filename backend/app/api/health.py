@@ -1,44 +1,47 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-import redis.asyncio as redis
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
-from app.core.database import get_db
-from app.core.config import settings
+from app.core.realtime import get_delivery_stats
+from app.services.event_service import event_publisher
+from app.services.health_service import health_monitor
+from app.services.loop_monitor import loop_monitor
 
 router = APIRouter()
 
 
 @router.get("/")
-async def health_check(db: AsyncSession = Depends(get_db)):
-    health_status = {
-        "status": "healthy",
-        "services": {}
+async def health_check():
+    """Last background health snapshot for every dependency"""
+    return health_monitor.snapshot()
+
+
+@router.get("/live")
+async def liveness():
+    """Liveness: the process serves requests and the health loop is running"""
+    if not health_monitor.is_alive():
+        return JSONResponse(status_code=503, content={"status": "dead"})
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness():
+    """Readiness: required dependencies were healthy at the last refresh"""
+    snapshot = health_monitor.snapshot()
+    if not health_monitor.is_ready():
+        return JSONResponse(status_code=503, content=snapshot)
+    return snapshot
+
+
+@router.get("/realtime")
+async def realtime_stats():
+    """Pipeline event delivery counters and cross-worker latency"""
+    return {
+        "publisher": event_publisher.stats,
+        "message_queue": get_delivery_stats()
     }
-    
-    # Check database
-    try:
-        await db.execute(text("SELECT 1"))
-        health_status["services"]["database"] = "healthy"
-    except Exception as e:
-        health_status["services"]["database"] = f"unhealthy: {str(e)}"
-        health_status["status"] = "degraded"
-    
-    # Check Redis
-    try:
-        r = redis.from_url(settings.REDIS_URL)
-        await r.ping()
-        await r.close()
-        health_status["services"]["redis"] = "healthy"
-    except Exception as e:
-        health_status["services"]["redis"] = f"unhealthy: {str(e)}"
-        health_status["status"] = "degraded"
-    
-    # Check Anthropic API key
-    if settings.ANTHROPIC_API_KEY:
-        health_status["services"]["anthropic"] = "configured"
-    else:
-        health_status["services"]["anthropic"] = "not configured"
-        health_status["status"] = "degraded"
-    
-    return health_status
\ No newline at end of file
+
+
+@router.get("/loop")
+async def loop_stats():
+    """Event-loop lag percentiles and the stacks of recent blocking calls"""
+    return loop_monitor.snapshot()
@@ -1,13 +1,32 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from typing import Dict, Any, Iterator, Literal, Optional
 from pydantic import BaseModel
 import logging
+import math
 
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.responses import FastJSONResponse, select_fields
+from app.services.admission_service import admission_controller, is_critical, AdmissionRejected
+from app.services.fair_scheduler import bind_tenant
+from app.services.health_service import health_monitor
+from app.services.idempotency_service import idempotency_service, IdempotencyError
 from app.services.llm_service import llm_service, orchestrator, AgentResponse
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+
+async def tenant_context(
+    x_tenant_id: Optional[str] = Header(None, alias="X-Tenant-ID"),
+    x_traffic_class: Literal["interactive", "batch"] = Header("batch", alias="X-Traffic-Class")
+):
+    """Attribute this request's LLM calls for weighted fair scheduling
+
+    Requests are batch unless they opt in with X-Traffic-Class: interactive.
+    """
+    bind_tenant(x_tenant_id, x_traffic_class)
+
+
+router = APIRouter(dependencies=[Depends(tenant_context)])
 
 
 class AgentRequest(BaseModel):
@@ -49,6 +68,65 @@ class AgentTestRequest(BaseModel):
     agent_type: str = "triage_specialist"
 
 
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated top-level result keys to return, e.g. fields=final_content to omit iterations"
+)
+
+IDEMPOTENCY_HEADER = Header(
+    None,
+    alias="Idempotency-Key",
+    description="Retries with the same key replay the first result instead of re-running the pipeline"
+)
+
+
+def _agent_responses(value: Any) -> Iterator[AgentResponse]:
+    """Every AgentResponse in a pipeline result, including nested iterations"""
+    if isinstance(value, AgentResponse):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _agent_responses(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _agent_responses(item)
+
+
+def _completed_normally(results: Dict[str, Any]) -> bool:
+    """False when any stage errored, short-circuited or came back unparsable; those results must not be replayed"""
+    return not any(
+        response.metadata.get("error")
+        or response.metadata.get("circuit_open")
+        or response.metadata.get("parse_error")
+        for response in _agent_responses(results)
+    )
+
+
+async def _run_pipeline(
+    scope: str,
+    request: BaseModel,
+    idempotency_key: Optional[str],
+    run,
+    critical: bool = False
+):
+    """Run a pipeline under admission control, at most once per Idempotency-Key
+
+    Duplicates waiting on an idempotent result do not take an admission slot.
+    """
+    async def admitted():
+        async with admission_controller.slot(critical=critical):
+            return await run()
+
+    return await idempotency_service.run(
+        idempotency_key, scope, request, admitted, should_store=_completed_normally
+    )
+
+
+def _pipeline_response(results: Dict[str, Any], fields: Optional[str], replayed: bool) -> FastJSONResponse:
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return FastJSONResponse(select_fields(results, fields), headers=headers)
+
+
 @router.post("/agent/process", response_model=AgentResponse)
 async def process_agent_request(request: AgentRequest):
     """Process a request through a specific agent"""
@@ -68,61 +146,122 @@ async def process_agent_request(request: AgentRequest):
 
 
 @router.post("/customer-support/process")
-async def process_customer_support(request: CustomerSupportRequest):
+async def process_customer_support(
+    request: CustomerSupportRequest,
+    fields: Optional[str] = FIELDS_QUERY,
+    idempotency_key: Optional[str] = IDEMPOTENCY_HEADER
+):
     """Process a customer support request through the multi-agent pipeline"""
     try:
-        results = await orchestrator.process_customer_support_request(
-            request=request.request,
-            customer_context=request.customer_context
+        results, replayed = await _run_pipeline(
+            "customer-support",
+            request,
+            idempotency_key,
+            lambda: orchestrator.process_customer_support_request(
+                request=request.request,
+                customer_context=request.customer_context
+            ),
+            critical=is_critical(request.customer_context)
         )
-        return results
+        return _pipeline_response(results, fields, replayed)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=503, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         logger.error(f"Error processing customer support request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/content-creation/process")
-async def process_content_creation(request: ContentCreationRequest):
+async def process_content_creation(
+    request: ContentCreationRequest,
+    fields: Optional[str] = FIELDS_QUERY,
+    idempotency_key: Optional[str] = IDEMPOTENCY_HEADER
+):
     """Process content creation through iterative refinement pipeline"""
     try:
-        results = await orchestrator.process_content_creation_request(
-            source_material=request.source_material,
-            content_type=request.content_type,
-            target_audience=request.target_audience,
-            iterations=request.iterations
+        results, replayed = await _run_pipeline(
+            "content-creation",
+            request,
+            idempotency_key,
+            lambda: orchestrator.process_content_creation_request(
+                source_material=request.source_material,
+                content_type=request.content_type,
+                target_audience=request.target_audience,
+                iterations=request.iterations
+            )
         )
-        return results
+        return _pipeline_response(results, fields, replayed)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=503, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         logger.error(f"Error processing content creation request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/content-marketing/process")
-async def process_content_marketing(request: ContentMarketingRequest):
+async def process_content_marketing(
+    request: ContentMarketingRequest,
+    fields: Optional[str] = FIELDS_QUERY,
+    idempotency_key: Optional[str] = IDEMPOTENCY_HEADER
+):
     """Process content marketing through 2-agent prototype team"""
     try:
-        results = await orchestrator.process_content_marketing_request(
-            request=request.request,
-            target_audience=request.target_audience,
-            content_type=request.content_type,
-            brand_context=request.brand_context
+        results, replayed = await _run_pipeline(
+            "content-marketing",
+            request,
+            idempotency_key,
+            lambda: orchestrator.process_content_marketing_request(
+                request=request.request,
+                target_audience=request.target_audience,
+                content_type=request.content_type,
+                brand_context=request.brand_context
+            )
         )
-        return results
+        return _pipeline_response(results, fields, replayed)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=503, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         logger.error(f"Error processing content marketing request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/guest-concierge/process")
-async def process_guest_concierge(request: GuestConciergeRequest):
+async def process_guest_concierge(
+    request: GuestConciergeRequest,
+    fields: Optional[str] = FIELDS_QUERY,
+    idempotency_key: Optional[str] = IDEMPOTENCY_HEADER
+):
     """Process guest concierge request through 2-agent team"""
     try:
-        results = await orchestrator.process_guest_concierge_request(
-            guest_request=request.guest_request,
-            guest_context=request.guest_context,
-            location=request.location
+        results, replayed = await _run_pipeline(
+            "guest-concierge",
+            request,
+            idempotency_key,
+            lambda: orchestrator.process_guest_concierge_request(
+                guest_request=request.guest_request,
+                guest_context=request.guest_context,
+                location=request.location
+            )
         )
-        return results
+        return _pipeline_response(results, fields, replayed)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=503, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         logger.error(f"Error processing guest concierge request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -317,28 +456,34 @@ async def get_available_agents():
     }
 
 
+@router.get("/prompts")
+async def get_prompt_versions():
+    """Loaded prompt template versions and render cache statistics"""
+    prompts = llm_service.prompts
+    return {"versions": prompts.versions(), "render_cache": prompts.cache_info()}
+
+
+@router.post("/prompts/reload")
+async def reload_prompts():
+    """Reload prompt templates from disk without waiting for the change check"""
+    try:
+        return {"versions": llm_service.prompts.reload()}
+    except (OSError, RuntimeError) as e:
+        logger.error(f"Error reloading prompts: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/health")
 async def health_check():
-    """Health check for LLM service"""
-    try:
-        # Test basic functionality
-        test_response = await llm_service.process_agent_request(
-            agent_type="triage_specialist",
-            task="Health check test",
-            context={"test": True},
-            capabilities=["categorize_issues"],
-            goals=["Test functionality"],
-            constraints=["Keep response brief"]
-        )
-        
-        return {
-            "status": "healthy",
-            "llm_service": "operational",
-            "test_confidence": test_response.confidence
-        }
-    except Exception as e:
-        logger.error(f"LLM health check failed: {e}")
-        return {
-            "status": "unhealthy", 
-            "error": str(e)
-        }
\ No newline at end of file
+    """Cached LLM status from the background health monitor (no tokens spent)"""
+    breaker = llm_service.breaker.snapshot()
+    llm_status = health_monitor.components.get("llm")
+    if llm_status is None:
+        return {"status": "unknown", "llm_service": "not checked yet", "circuit_breaker": breaker}
+    if breaker["state"] != "closed":
+        llm_service_status = f"circuit {breaker['state']}"
+    elif llm_status["status"] == "healthy":
+        llm_service_status = "operational"
+    else:
+        llm_service_status = llm_status["status"]
+    return {**llm_status, "llm_service": llm_service_status, "circuit_breaker": breaker}
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.profiling import profile_store
+
+router = APIRouter()
+
+
+def _require_profiling():
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+
+
+@router.get("/")
+async def list_profiles(limit: int = Query(50, ge=1, le=500)):
+    """Summaries of the most recent profiled requests, newest first"""
+    _require_profiling()
+    return profile_store.summaries(limit)
+
+
+@router.get("/{request_id}")
+async def get_profile(request_id: str):
+    """Speedscope profile for a request; open it at https://www.speedscope.app"""
+    _require_profiling()
+    path = profile_store.profile_path(request_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=path.name)
@@ -1,13 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
+from datetime import datetime, timedelta
+import logging
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, AsyncSessionLocal
+from app.models.session import SessionStatus as SessionStatusModel
+from app.services.admission_service import AdmissionRejected
 from app.services.session_service import SessionService
-from app.schemas.session import SessionCreate, SessionUpdate, SessionResponse
+from app.schemas.session import (
+    SessionCreate, SessionUpdate, SessionResponse, SessionStatusResponse, SessionPurgeRequest
+)
 from app.schemas.message import MessageResponse
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -15,6 +23,10 @@ async def get_session_service(db: AsyncSession = Depends(get_db)) -> SessionServ
     return SessionService(db)
 
 
+async def get_read_session_service(db: AsyncSession = Depends(get_read_db)) -> SessionService:
+    return SessionService(db)
+
+
 @router.post("/", response_model=SessionResponse)
 async def create_session(
     session_data: SessionCreate,
@@ -22,11 +34,8 @@ async def create_session(
 ):
     """Create a new collaboration session"""
     try:
-        session = await service.create_session(session_data)
-        await service.db.commit()
-        return session
+        return await service.create_session(session_data)
     except Exception as e:
-        await service.db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -34,24 +43,83 @@ async def create_session(
 async def list_sessions(
     skip: int = 0,
     limit: int = 100,
-    service: SessionService = Depends(get_session_service)
+    service: SessionService = Depends(get_read_session_service)
 ):
     """List all sessions"""
     return await service.list_sessions(skip=skip, limit=limit)
 
 
+@router.post("/purge", status_code=202)
+async def purge_sessions(
+    purge_request: SessionPurgeRequest,
+    background_tasks: BackgroundTasks
+):
+    """Delete many sessions and their messages in chunks, in the background"""
+    if not (purge_request.session_ids or purge_request.older_than_days is not None or purge_request.statuses):
+        raise HTTPException(status_code=422, detail="At least one purge filter is required")
+
+    background_tasks.add_task(_run_session_purge, purge_request)
+    return {"message": "Session purge scheduled"}
+
+
+async def _run_session_purge(purge_request: SessionPurgeRequest):
+    older_than = None
+    if purge_request.older_than_days is not None:
+        older_than = datetime.utcnow() - timedelta(days=purge_request.older_than_days)
+    statuses = None
+    if purge_request.statuses:
+        statuses = [SessionStatusModel[status.value] for status in purge_request.statuses]
+
+    async with AsyncSessionLocal() as db:
+        try:
+            purged = await SessionService(db).purge_sessions(
+                session_ids=purge_request.session_ids,
+                older_than=older_than,
+                statuses=statuses,
+                chunk_size=purge_request.chunk_size
+            )
+            logger.info(f"Purged {purged} sessions")
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error purging sessions: {e}")
+
+
 @router.get("/{session_id}", response_model=SessionResponse)
 async def get_session(
     session_id: UUID,
-    service: SessionService = Depends(get_session_service)
+    service: SessionService = Depends(get_read_session_service)
 ):
     """Get a specific session"""
-    session = await service.get_session(session_id)
+    session = await service.get_session_summary(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return session
 
 
+@router.get("/{session_id}/status", response_model=SessionStatusResponse)
+async def get_session_status(
+    session_id: UUID,
+    service: SessionService = Depends(get_read_session_service)
+):
+    """Get a session's status for cheap polling"""
+    status = await service.get_session_status(session_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return status
+
+
+@router.delete("/{session_id}")
+async def delete_session(
+    session_id: UUID,
+    service: SessionService = Depends(get_session_service)
+):
+    """Delete a session and all of its messages"""
+    deleted = await service.delete_session(session_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"message": "Session deleted successfully"}
+
+
 @router.post("/{session_id}/start", response_model=SessionResponse)
 async def start_session(
     session_id: UUID,
@@ -62,18 +130,19 @@ async def start_session(
         session = await service.start_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        
-        await service.db.commit()
         return session
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=503, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
-        await service.db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{session_id}/messages", response_model=List[MessageResponse])
 async def get_session_messages(
     session_id: UUID,
-    service: SessionService = Depends(get_session_service)
+    service: SessionService = Depends(get_read_session_service)
 ):
     """Get all messages for a session"""
     messages = await service.get_session_messages(session_id)
@@ -88,9 +157,6 @@ async def add_human_message(
 ):
     """Add a human message to the session"""
     try:
-        message = await service.add_human_message(session_id, content)
-        await service.db.commit()
-        return message
+        return await service.add_human_message(session_id, content)
     except Exception as e:
-        await service.db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,175 @@
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by error rate and latency
+
+    Outcomes from the last window_seconds are kept while closed. Once at
+    least minimum_calls are recorded, the breaker opens when the failure
+    rate or the slow-call rate reaches its threshold. After open_seconds
+    it lets half_open_calls probes through: all succeeding closes it, any
+    failure or slow call re-opens it. A call only counts in the state it
+    started in; outcomes that land after a transition are ignored.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 60.0,
+        minimum_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 3,
+        is_failure: Callable[[BaseException], bool] = lambda e: True
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.is_failure = is_failure
+
+        self.state = BreakerState.CLOSED
+        self.opened_at = 0.0
+        self.open_count = 0
+        self.short_circuited = 0
+        # (timestamp, failed, slow) per completed call
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        # Bumped on every transition; calls remember the one they started in
+        self._generation = 0
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.open_seconds - time.monotonic())
+
+    def allows_requests(self) -> bool:
+        """True unless the breaker is open and still cooling down"""
+        return not (self.state == BreakerState.OPEN and self.retry_after() > 0)
+
+    def check(self):
+        """Raise CircuitOpenError without calling anything if the breaker is open"""
+        if not self.allows_requests():
+            self.short_circuited += 1
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        generation = self._acquire()
+        start = time.monotonic()
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as e:
+            # Cancellation says nothing about the dependency's health
+            failed = isinstance(e, Exception) and self.is_failure(e)
+            self._record(generation, failed, time.monotonic() - start, counted=isinstance(e, Exception))
+            raise
+        self._record(generation, False, time.monotonic() - start)
+        return result
+
+    def _acquire(self) -> int:
+        if self.state == BreakerState.OPEN:
+            if self.retry_after() > 0:
+                self.short_circuited += 1
+                raise CircuitOpenError(self.name, self.retry_after())
+            self._transition(BreakerState.HALF_OPEN)
+
+        if self.state == BreakerState.HALF_OPEN:
+            if self._half_open_in_flight + self._half_open_successes >= self.half_open_calls:
+                self.short_circuited += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self._half_open_in_flight += 1
+        return self._generation
+
+    def _record(self, generation: int, failed: bool, latency: float, counted: bool = True):
+        if generation != self._generation:
+            # Started before the last transition: not a probe, not in this window
+            return
+        slow = latency >= self.slow_call_seconds
+        now = time.monotonic()
+
+        if self.state == BreakerState.HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+            if not counted:
+                return
+            if failed or slow:
+                self._transition(BreakerState.OPEN)
+            else:
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.half_open_calls:
+                    self._transition(BreakerState.CLOSED)
+            return
+
+        if not counted or self.state != BreakerState.CLOSED:
+            return
+        self._outcomes.append((now, failed, slow))
+        self._evict(now)
+        failure_rate, slow_rate = self._rates()
+        if len(self._outcomes) >= self.minimum_calls and (
+            failure_rate >= self.failure_rate_threshold
+            or slow_rate >= self.slow_call_rate_threshold
+        ):
+            self._transition(BreakerState.OPEN)
+
+    def _evict(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._outcomes:
+            return 0.0, 0.0
+        total = len(self._outcomes)
+        failures = sum(1 for _, failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, _, slow in self._outcomes if slow)
+        return failures / total, slow / total
+
+    def _transition(self, state: BreakerState):
+        if state == self.state:
+            return
+        logger.warning(f"Circuit '{self.name}' {self.state.value} -> {state.value}")
+        self.state = state
+        self._generation += 1
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        if state == BreakerState.OPEN:
+            self.opened_at = time.monotonic()
+            self.open_count += 1
+        self._outcomes.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._evict(time.monotonic())
+        failure_rate, slow_rate = self._rates()
+        return {
+            "state": self.state.value,
+            "retry_after_seconds": round(self.retry_after(), 2) if self.state == BreakerState.OPEN else 0.0,
+            "window_calls": len(self._outcomes),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "times_opened": self.open_count,
+            "short_circuited": self.short_circuited
+        }
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
 import os
 
 
@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 5.0
     
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -32,6 +34,25 @@ class Settings(BaseSettings):
     
     # Anthropic
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
+    ANTHROPIC_BASE_URL: Optional[str] = os.getenv("ANTHROPIC_BASE_URL") or None  # e.g. benchmarks.fake_anthropic
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 90.0
+    LLM_CONTEXT_TOKEN_BUDGET: int = 1500  # estimated tokens of CONTEXT per agent prompt
+    PROMPT_RELOAD_INTERVAL_SECONDS: float = 5.0  # 0 disables hot reload of app/prompts
+    PROMPT_RENDER_CACHE_SIZE: int = 256
+
+    # LLM record/replay: off, record, replay (a miss is an error) or auto (record misses)
+    LLM_CASSETTE_MODE: str = os.getenv("LLM_CASSETTE_MODE", "off")
+    LLM_CASSETTE_PATH: str = os.getenv("LLM_CASSETTE_PATH", "cassettes/llm.jsonl")
+    LLM_CASSETTE_REPLAY_LATENCY: bool = False  # sleep for the recorded latency on replay
+
+    # LLM circuit breaker
+    LLM_BREAKER_WINDOW_SECONDS: float = 60.0
+    LLM_BREAKER_MINIMUM_CALLS: int = 10
+    LLM_BREAKER_FAILURE_RATE: float = 0.5
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 45.0
+    LLM_BREAKER_SLOW_CALL_RATE: float = 0.8
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
+    LLM_BREAKER_HALF_OPEN_CALLS: int = 3
     CLAUDE_MODEL: str = "claude-3-opus-20240229"
     
     # Email (for magic links)
@@ -49,6 +70,67 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_SESSIONS: int = 20
     MESSAGE_RATE_LIMIT: int = 100  # per minute
     SESSION_STORAGE_GB: float = 1.0
+    TEAM_CACHE_TTL_SECONDS: float = 30.0  # also how long other workers may serve a stale team
+
+    # Pipeline admission control
+    ADMISSION_MAX_IN_FLIGHT: Optional[int] = None  # defaults to MAX_CONCURRENT_SESSIONS
+    ADMISSION_QUEUE_SIZE: int = 10
+    ADMISSION_CRITICAL_QUEUE_SIZE: int = 20
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 5.0
+
+    # Weighted fair queuing of LLM calls by tenant and traffic class
+    LLM_MAX_CONCURRENT_CALLS: int = 10
+    FAIR_QUEUE_CLASS_WEIGHTS: Dict[str, float] = {"interactive": 4.0, "batch": 1.0}
+    FAIR_QUEUE_TENANT_WEIGHTS: Dict[str, float] = {}  # JSON in env, e.g. {"acme": 2}
+    FAIR_QUEUE_DEFAULT_TENANT_WEIGHT: float = 1.0
+
+    # Message retention
+    MESSAGE_RETENTION_DAYS: int = 0  # 0 keeps every partition hot
+    MESSAGE_ARCHIVE_DIR: str = os.getenv("MESSAGE_ARCHIVE_DIR", "archive/messages")
+    MESSAGE_ARCHIVE_INTERVAL_SECONDS: int = 24 * 60 * 60
+    MESSAGE_PARTITION_PREMAKE_MONTHS: int = 3
+
+    # Realtime pipeline events
+    EVENT_BUFFER_SIZE: int = 10000
+    EVENT_FLUSH_INTERVAL_SECONDS: float = 0.05
+    EVENT_MAX_BATCH_SIZE: int = 500
+    # Share Socket.IO emits across workers; needs Redis unless the URL is memory://
+    SOCKETIO_MESSAGE_QUEUE_ENABLED: bool = False
+    SOCKETIO_MESSAGE_QUEUE_URL: str = os.getenv("SOCKETIO_MESSAGE_QUEUE_URL", "")  # defaults to REDIS_URL
+    SOCKETIO_CHANNEL: str = "kyoryoku-socketio"
+
+    # Health checks
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    LLM_HEALTH_CHECK_INTERVAL_SECONDS: float = 60.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 3.0
+
+    # Tracing: none, otlp (OTEL_EXPORTER_OTLP_* variables), file or console
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")
+    TRACING_FILE_PATH: str = os.getenv("TRACING_FILE_PATH", "traces/spans.jsonl")
+    TRACING_SERVICE_NAME: str = "kyoryoku-api"
+    TRACING_SAMPLE_RATIO: float = 1.0
+
+    # Event-loop lag monitor: a watchdog thread logs the loop's stack when it blocks
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.05
+    LOOP_MONITOR_BLOCK_THRESHOLD_SECONDS: float = 0.1
+    LOOP_MONITOR_RECENT_BLOCKS: int = 20
+
+    # Opt-in request profiling (?profile=1 or X-Profile: 1); needs pyinstrument.
+    # Loop lag per profile comes from the loop monitor and its block threshold.
+    PROFILING_ENABLED: bool = False
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    PROFILING_MAX_STORED: int = 100
+
+    # Responses
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+
+    # Idempotency-Key support for pipeline endpoints
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # how long completed results are replayed
+    IDEMPOTENCY_LOCK_TTL_SECONDS: int = 900  # upper bound on an in-progress claim
+    IDEMPOTENCY_WAIT_TIMEOUT_SECONDS: float = 300.0
+    IDEMPOTENCY_POLL_INTERVAL_SECONDS: float = 0.25
     
     class Config:
         case_sensitive = True
@@ -11,6 +11,25 @@ engine = create_async_engine(
     future=True
 )
 
+
+def _read_only_connect_args() -> dict:
+    """Make every implicit transaction on read connections READ ONLY"""
+    if settings.DATABASE_URL.startswith("postgresql+asyncpg"):
+        return {"server_settings": {"default_transaction_read_only": "on"}}
+    return {}
+
+
+# Separate engine for GET endpoints. AUTOCOMMIT means no BEGIN/COMMIT round
+# trips; each statement runs in its own read-only implicit transaction, which
+# under READ COMMITTED sees the same snapshot per statement as before.
+read_only_engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    future=True,
+    isolation_level="AUTOCOMMIT",
+    connect_args=_read_only_connect_args()
+)
+
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -18,6 +37,14 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+# Session factory for pure reads: no autoflush, never committed
+ReadOnlySessionLocal = sessionmaker(
+    bind=read_only_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 # Create declarative base
 Base = declarative_base()
 
@@ -34,8 +61,18 @@ async def get_db():
             await session.close()
 
 
+# Dependency to get a read-only DB session for GET endpoints
+async def get_read_db():
+    async with ReadOnlySessionLocal() as session:
+        try:
+            yield session
+        finally:
+            # Nothing to persist: no flush, no COMMIT
+            await session.close()
+
+
 # Initialize database
 async def init_db():
     async with engine.begin() as conn:
         # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,83 @@
+from typing import Any, List, Optional, Tuple
+import json
+
+_EXPECT_OBJECT, _EXPECT_KEY, _IN_KEY, _EXPECT_COLON, _IN_VALUE, _DONE = range(6)
+
+
+class IncrementalJSONObjectParser:
+    """Surfaces top-level fields of a streamed JSON object as they complete
+
+    feed() takes successive text chunks and returns the (key, value) pairs
+    whose values finished in that chunk. Nested values are decoded once
+    whole; scalars are complete when the following ',' or '}' arrives.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._length = 0
+        self._state = _EXPECT_OBJECT
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._token_start = 0
+        self._key: Optional[str] = None
+        self.fields: dict = {}
+
+    @property
+    def complete(self) -> bool:
+        return self._state == _DONE
+
+    def _text(self, start: int, end: int) -> str:
+        return "".join(self._buffer)[start:end]
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        completed: List[Tuple[str, Any]] = []
+        offset = self._length
+        self._buffer.append(chunk)
+        self._length += len(chunk)
+
+        for i, char in enumerate(chunk, start=offset):
+            if self._state == _DONE:
+                break
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._state == _IN_KEY:
+                        self._key = json.loads(self._text(self._token_start, i + 1))
+                        self._state = _EXPECT_COLON
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._state == _EXPECT_KEY:
+                    self._state = _IN_KEY
+                    self._token_start = i
+            elif char in "{[":
+                self._depth += 1
+                if self._state == _EXPECT_OBJECT and char == "{":
+                    self._state = _EXPECT_KEY
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._state == _IN_VALUE:
+                        completed.append(self._complete_value(i))
+                    self._state = _DONE
+            elif self._depth == 1:
+                if char == ":" and self._state == _EXPECT_COLON:
+                    self._state = _IN_VALUE
+                    self._token_start = i + 1
+                elif char == "," and self._state == _IN_VALUE:
+                    completed.append(self._complete_value(i))
+                    self._state = _EXPECT_KEY
+
+        return completed
+
+    def _complete_value(self, end: int) -> Tuple[str, Any]:
+        value = json.loads(self._text(self._token_start, end))
+        self.fields[self._key] = value
+        return self._key, value
@@ -0,0 +1,165 @@
+from typing import Iterable, Optional
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+    generate_latest, multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily
+
+OTHER = "other"
+
+# Latency buckets sized for LLM calls and multi-agent pipelines (seconds)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 45, 60, 90, 120)
+PIPELINE_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 90, 120, 180, 300, 600)
+QUEUE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+LLM_CALL_SECONDS = Histogram(
+    "kyoryoku_llm_call_seconds",
+    "Latency of Anthropic messages calls",
+    ["agent_type", "model", "outcome"],
+    buckets=LLM_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "kyoryoku_llm_tokens",
+    "Tokens consumed by Anthropic messages calls",
+    ["agent_type", "model", "direction"]
+)
+AGENT_PARSE_RESULTS = Counter(
+    "kyoryoku_agent_parse_results",
+    "Agent responses by parse path: structured (tool input), text (JSON in prose) or failed",
+    ["agent_type", "result"]
+)
+LLM_DECISION_LEAD_SECONDS = Histogram(
+    "kyoryoku_llm_decision_lead_seconds",
+    "Time from an agent's decision fields completing to the end of its response; what an early exit saves",
+    ["agent_type"],
+    buckets=LLM_BUCKETS
+)
+LLM_EARLY_EXITS = Counter(
+    "kyoryoku_llm_early_exits",
+    "Streamed agent responses cut short once their decision fields settled the routing",
+    ["agent_type"]
+)
+AGENT_CONTEXT_TOKENS = Histogram(
+    "kyoryoku_agent_context_tokens",
+    "Estimated tokens of context sent with each agent prompt, after budgeting",
+    ["agent_type"],
+    buckets=(50, 100, 250, 500, 1000, 1500, 2000, 4000, 8000)
+)
+AGENT_CONTEXT_TRIMS = Counter(
+    "kyoryoku_agent_context_trims",
+    "Context fields summarized, truncated or dropped to fit the token budget",
+    ["agent_type", "action"]
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "kyoryoku_pipeline_stage_seconds",
+    "Duration of one orchestrator pipeline stage",
+    ["pipeline", "stage"],
+    buckets=LLM_BUCKETS
+)
+PIPELINE_SECONDS = Histogram(
+    "kyoryoku_pipeline_seconds",
+    "Duration of a whole orchestrator pipeline",
+    ["pipeline", "outcome"],
+    buckets=PIPELINE_BUCKETS
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "kyoryoku_queue_wait_seconds",
+    "Time work spends queued before it is processed",
+    ["queue"],
+    buckets=QUEUE_BUCKETS
+)
+CACHE_REQUESTS = Counter(
+    "kyoryoku_cache_requests",
+    "Cache lookups by result",
+    ["cache", "result"]
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "kyoryoku_event_loop_lag_seconds",
+    "How late the loop monitor's heartbeat woke up; time every coroutine on the worker waited",
+    buckets=QUEUE_BUCKETS
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "kyoryoku_event_loop_blocks",
+    "Times the event loop was blocked for longer than the loop monitor's threshold"
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "kyoryoku_admission_in_flight",
+    "Pipelines currently admitted",
+    multiprocess_mode="livesum"
+)
+ADMISSION_QUEUED = Gauge(
+    "kyoryoku_admission_queued",
+    "Pipelines waiting for admission",
+    ["lane"],
+    multiprocess_mode="livesum"
+)
+ADMISSION_REJECTED = Counter(
+    "kyoryoku_admission_rejected",
+    "Pipelines rejected by admission control",
+    ["reason"]
+)
+FAIR_QUEUE_DEPTH = Gauge(
+    "kyoryoku_fair_queue_depth",
+    "LLM calls waiting per tenant (configured tenants, others as 'other') and traffic class",
+    ["tenant", "traffic_class"],
+    multiprocess_mode="livesum"
+)
+SESSIONS = Gauge(
+    "kyoryoku_sessions",
+    "Sessions by status, refreshed by the health monitor",
+    ["status"],
+    multiprocess_mode="max"
+)
+
+
+def bounded_label(value: Optional[str], allowed: Iterable[str]) -> str:
+    """Collapse values outside a known set so label cardinality stays fixed"""
+    return value if value in allowed else OTHER
+
+
+class DatabasePoolCollector:
+    """Reports SQLAlchemy pool usage at scrape time, off the request path"""
+
+    def __init__(self, engines):
+        self.engines = engines
+
+    def collect(self):
+        size = GaugeMetricFamily("kyoryoku_db_pool_size", "Configured pool size", labels=["engine"])
+        checked_out = GaugeMetricFamily("kyoryoku_db_pool_checked_out", "Connections in use", labels=["engine"])
+        overflow = GaugeMetricFamily("kyoryoku_db_pool_overflow", "Connections above pool size", labels=["engine"])
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue  # NullPool/StaticPool keep no statistics
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        yield size
+        yield checked_out
+        yield overflow
+
+
+_custom_collectors = []
+
+
+def register_database_pools(engines):
+    collector = DatabasePoolCollector(engines)
+    _custom_collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def render_metrics() -> bytes:
+    """Exposition text, aggregating workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # Pool statistics are per process; the scraped worker reports its own
+        for collector in _custom_collectors:
+            registry.register(collector)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
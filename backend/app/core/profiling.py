@@ -0,0 +1,164 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+import asyncio
+import json
+import logging
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.services.loop_monitor import EventLoopMonitor
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pyinstrument is optional; profiling stays off without it
+    Profiler = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+TRUTHY = ("1", "true", "yes", "on")
+
+
+def profiling_requested(scope: Scope) -> bool:
+    """?profile=1 or an X-Profile: 1 header"""
+    if Headers(scope=scope).get(PROFILE_HEADER, "").lower() in TRUTHY:
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return any(value.lower() in TRUTHY for value in query.get("profile", ()))
+
+
+def request_id_for(scope: Scope) -> str:
+    """The caller's X-Request-ID when it is safe to use as a file name, else a fresh one"""
+    request_id = Headers(scope=scope).get("x-request-id", "")
+    return request_id if REQUEST_ID_PATTERN.match(request_id) else uuid.uuid4().hex
+
+
+class ProfileStore:
+    """Speedscope profiles and their summaries on disk, keyed by request id
+
+    Files are shared by every worker, so a profile can be fetched from
+    whichever worker serves the follow-up request. The oldest are pruned
+    past max_profiles.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = 100):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def profile_path(self, request_id: str) -> Optional[Path]:
+        if not REQUEST_ID_PATTERN.match(request_id):
+            return None
+        path = self.directory / f"{request_id}.speedscope.json"
+        return path if path.exists() else None
+
+    def summaries(self, limit: int = 50) -> List[Dict[str, Any]]:
+        if not self.directory.exists():
+            return []
+        paths = sorted(self.directory.glob("*.summary.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        summaries = []
+        for path in paths[:limit]:
+            try:
+                summaries.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue  # pruned or half-written by another worker
+        return summaries
+
+    async def save(self, request_id: str, session, summary: Dict[str, Any]):
+        # Rendering walks every sample; keep it and the file writes off the loop
+        await asyncio.to_thread(self._write, request_id, session, summary)
+
+    def _write(self, request_id: str, session, summary: Dict[str, Any]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{request_id}.speedscope.json").write_text(
+            SpeedscopeRenderer().render(session), encoding="utf-8"
+        )
+        (self.directory / f"{request_id}.summary.json").write_text(json.dumps(summary), encoding="utf-8")
+        self._prune()
+
+    def _prune(self):
+        summaries = sorted(self.directory.glob("*.summary.json"), key=lambda p: p.stat().st_mtime)
+        for path in summaries[:max(0, len(summaries) - self.max_profiles)]:
+            request_id = path.name[:-len(".summary.json")]
+            for stale in (path, self.directory / f"{request_id}.speedscope.json"):
+                stale.unlink(missing_ok=True)
+
+
+# Global instance
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_STORED)
+
+
+class ProfilingMiddleware:
+    """Samples opted-in requests with pyinstrument and tracks event-loop lag
+
+    A request opts in with ?profile=1 or X-Profile: 1. The response carries
+    X-Profile-Id; the speedscope profile is stored under that id once the
+    body has been sent, so profiling never delays the response itself.
+    Loop lag for the request comes from the shared EventLoopMonitor.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        monitor: EventLoopMonitor,
+        interval: float = 0.001
+    ):
+        self.app = app
+        self.store = store
+        self.monitor = monitor
+        self.interval = interval
+        if Profiler is None:
+            logger.warning("Profiling is enabled but pyinstrument is not installed; requests are not profiled")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or Profiler is None or not profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_id_for(scope)
+        status = None
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = request_id
+            await send(message)
+
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        started_at = time.time()
+        window = self.monitor.open_window()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            loop_lag = self.monitor.close_window(window)
+            summary = {
+                "request_id": request_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "started_at": started_at,
+                "duration_ms": round(session.duration * 1000, 2),
+                "cpu_ms": round(session.cpu_time * 1000, 2),
+                "samples": session.sample_count,
+                "loop": loop_lag
+            }
+            try:
+                await self.store.save(request_id, session, summary)
+                logger.info(
+                    f"Profiled {scope['method']} {scope['path']} as {request_id}: "
+                    f"{summary['duration_ms']}ms, loop blocked {loop_lag['blocked_ms']}ms"
+                )
+            except OSError as e:
+                logger.error(f"Could not store profile {request_id}: {e}")
@@ -0,0 +1,119 @@
+from collections import defaultdict, deque
+from typing import Dict, List
+import asyncio
+import time
+
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+from app.core.config import settings
+
+
+class DeliveryStatsMixin:
+    """Tracks cross-worker delivery latency and dropped events
+
+    Emits are stamped when published to the message queue; every worker
+    records the publish-to-handle latency when the emit comes back to it.
+    """
+
+    def _init_delivery_stats(self):
+        self.delivery_stats = {"published": 0, "delivered": 0, "dropped": 0}
+        self._latencies = deque(maxlen=1000)
+
+    async def _publish(self, data):
+        if data.get("method") == "emit":
+            data = {**data, "published_at": time.time()}
+        result = await super()._publish(data)
+        if data.get("method") == "emit":
+            if result is None:
+                # The Redis manager gives up after one reconnect attempt
+                self.delivery_stats["dropped"] += 1
+            else:
+                self.delivery_stats["published"] += 1
+        return result
+
+    async def _handle_emit(self, message):
+        published_at = message.pop("published_at", None)
+        if published_at is not None:
+            self._latencies.append(time.time() - published_at)
+            self.delivery_stats["delivered"] += 1
+        return await super()._handle_emit(message)
+
+    def get_delivery_stats(self) -> Dict[str, float]:
+        stats = dict(self.delivery_stats)
+        if self._latencies:
+            latencies = sorted(self._latencies)
+            stats["latency_p50_ms"] = latencies[len(latencies) // 2] * 1000
+            stats["latency_p99_ms"] = latencies[int(len(latencies) * 0.99)] * 1000
+            stats["latency_max_ms"] = latencies[-1] * 1000
+        return stats
+
+
+class InstrumentedRedisManager(DeliveryStatsMixin, socketio.AsyncRedisManager):
+    def __init__(self, *args, **kwargs):
+        self._init_delivery_stats()
+        super().__init__(*args, **kwargs)
+
+
+class _InMemoryPubSub(AsyncPubSubManager):
+    _subscribers: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+
+    async def _publish(self, data):
+        # Copy so no subscriber sees another's mutations, as with pickling
+        for queue in self._subscribers[self.channel]:
+            queue.put_nowait(dict(data))
+        return len(self._subscribers[self.channel])
+
+    async def _listen(self):
+        queue = asyncio.Queue()
+        self._subscribers[self.channel].append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[self.channel].remove(queue)
+
+
+class InMemoryPubSubManager(DeliveryStatsMixin, _InMemoryPubSub):
+    """In-process stand-in for Redis pub/sub
+
+    Every manager on the same channel in this process receives every
+    message, so several AsyncServer instances behave like several workers.
+    Selected with SOCKETIO_MESSAGE_QUEUE_URL=memory://.
+    """
+
+    name = "memory"
+
+    def __init__(self, *args, **kwargs):
+        self._init_delivery_stats()
+        super().__init__(*args, **kwargs)
+
+
+def create_client_manager(write_only: bool = False):
+    """Message-queue client manager shared by every worker, or None
+
+    write_only managers let background jobs emit into rooms without
+    running a Socket.IO server.
+    """
+    if not settings.SOCKETIO_MESSAGE_QUEUE_ENABLED:
+        return None
+
+    url = settings.SOCKETIO_MESSAGE_QUEUE_URL or settings.REDIS_URL
+    if url.startswith("memory://"):
+        return InMemoryPubSubManager(channel=settings.SOCKETIO_CHANNEL, write_only=write_only)
+    return InstrumentedRedisManager(url, channel=settings.SOCKETIO_CHANNEL, write_only=write_only)
+
+
+# Socket.IO server shared by the ASGI app and the services that emit events
+sio = socketio.AsyncServer(
+    async_mode='asgi',
+    cors_allowed_origins=settings.CORS_ORIGINS,
+    client_manager=create_client_manager()
+)
+
+
+def get_delivery_stats() -> Dict[str, float]:
+    manager = sio.manager
+    if isinstance(manager, DeliveryStatsMixin):
+        return manager.get_delivery_stats()
+    return {}
@@ -0,0 +1,32 @@
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Process-wide Redis client backed by a shared connection pool
+
+    Connections are opened lazily, so calling this never blocks or fails
+    when Redis is down; errors surface on the first command instead.
+    """
+    global _client
+    if _client is None:
+        _client = redis.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=30
+        )
+    return _client
+
+
+async def close_redis():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,38 @@
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps_json(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-rendered JSON response
+
+    Returning it directly from an endpoint skips FastAPI's jsonable_encoder
+    pass as well; pydantic models inside the content are dumped by orjson's
+    default hook. UUIDs, datetimes and enums are handled natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def select_fields(content: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    """Keep only the comma-separated top-level keys in fields
+
+    Unknown names are ignored; an empty or missing fields keeps everything.
+    """
+    if not fields:
+        return content
+    wanted = {name.strip() for name in fields.split(",") if name.strip()}
+    return {key: value for key, value in content.items() if key in wanted}
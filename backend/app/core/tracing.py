@@ -0,0 +1,79 @@
+from typing import Optional, Sequence
+import logging
+import os
+import threading
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# No-op until setup_tracing installs an SDK provider
+tracer = trace.get_tracer("kyoryoku")
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends finished spans to a JSON-lines file for offline analysis"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+def _create_exporter(kind: str) -> Optional[SpanExporter]:
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+        return OTLPSpanExporter()
+    if kind == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if kind == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    if kind != "none":
+        logger.warning(f"Unknown TRACING_EXPORTER '{kind}', tracing disabled")
+    return None
+
+
+def setup_tracing(app, engines: Sequence) -> Optional[TracerProvider]:
+    """Install the tracer provider and instrument FastAPI and SQLAlchemy
+
+    With TRACING_EXPORTER=none nothing is instrumented and the spans created
+    in the orchestrator are non-recording.
+    """
+    exporter = _create_exporter(settings.TRACING_EXPORTER)
+    if exporter is None:
+        return None
+
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="api/health,metrics")
+    SQLAlchemyInstrumentor().instrument(engines=[engine.sync_engine for engine in engines])
+    logger.info(f"Tracing enabled with the {settings.TRACING_EXPORTER} exporter")
+    return provider
@@ -1,20 +1,48 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import socketio
 
 from app.core.config import settings
-from app.api import agents, teams, sessions, health, llm
-from app.core.database import init_db
+from app.api import agents, teams, sessions, health, llm, profiles
+from app.core.database import init_db, engine, read_only_engine
+from app.core.tracing import setup_tracing
+from app.core.metrics import METRICS_CONTENT_TYPE, register_database_pools, render_metrics
+from app.core.realtime import sio
+from app.core.redis import close_redis
+from app.core.compression import CompressionMiddleware
+from app.core.profiling import ProfilingMiddleware, profile_store
+from app.core.responses import FastJSONResponse
+from app.services.event_service import event_publisher, session_room
+from app.services.health_service import health_monitor
+from app.services.loop_monitor import loop_monitor
+from app.services.message_archive_service import message_archive_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
+    await message_archive_service.ensure_partitions()
+    retention_task = None
+    if settings.MESSAGE_RETENTION_DAYS > 0:
+        retention_task = asyncio.create_task(message_archive_service.run_forever())
+    event_publisher.start(sio)
+    health_monitor.start()
+    # Profiles read their loop lag from the monitor, so it runs for them too
+    if settings.LOOP_MONITOR_ENABLED or settings.PROFILING_ENABLED:
+        loop_monitor.start()
     yield
     # Shutdown
-    # Add cleanup code here if needed
+    await loop_monitor.stop()
+    await health_monitor.stop()
+    await event_publisher.stop()
+    if retention_task:
+        retention_task.cancel()
+    await close_redis()
+    if tracer_provider:
+        tracer_provider.shutdown()
 
 
 app = FastAPI(
@@ -33,19 +61,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+if settings.PROFILING_ENABLED:
+    # Outermost, so compression and CORS show up in the profile too
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        monitor=loop_monitor,
+        interval=settings.PROFILING_INTERVAL_SECONDS
+    )
+
+register_database_pools({"read_write": engine, "read_only": read_only_engine})
+tracer_provider = setup_tracing(app, [engine, read_only_engine])
+
 # Socket.IO setup
-sio = socketio.AsyncServer(
-    async_mode='asgi',
-    cors_allowed_origins=settings.CORS_ORIGINS
-)
 socket_app = socketio.ASGIApp(sio, app)
 
 # Include routers
 app.include_router(health.router, prefix="/api/health", tags=["health"])
 app.include_router(agents.router, prefix="/api/agents", tags=["agents"])
 app.include_router(teams.router, prefix="/api/teams", tags=["teams"])
-app.include_router(sessions.router, prefix="/api/sessions", tags=["sessions"])
-app.include_router(llm.router, prefix="/api/llm", tags=["llm"])
+app.include_router(
+    sessions.router, prefix="/api/sessions", tags=["sessions"],
+    default_response_class=FastJSONResponse
+)
+app.include_router(profiles.router, prefix="/api/profiles", tags=["profiles"])
+app.include_router(
+    llm.router, prefix="/api/llm", tags=["llm"],
+    default_response_class=FastJSONResponse
+)
 
 
 @app.get("/")
@@ -53,6 +98,11 @@ async def root():
     return {"message": "Kyoryoku API is running"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 # WebSocket event handlers
 @sio.event
 async def connect(sid, environ):
@@ -68,4 +118,15 @@ async def disconnect(sid):
 @sio.event
 async def agent_message(sid, data):
     # Handle agent messages
-    await sio.emit('agent_response', data, to=sid)
\ No newline at end of file
+    await sio.emit('agent_response', data, to=sid)
+
+
+@sio.event
+async def join_session(sid, data):
+    # Subscribe to a session's pipeline_events
+    await sio.enter_room(sid, session_room(data["session_id"]))
+
+
+@sio.event
+async def leave_session(sid, data):
+    await sio.leave_room(sid, session_room(data["session_id"]))
\ No newline at end of file
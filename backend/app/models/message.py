@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, JSON, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, String, JSON, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -20,15 +20,21 @@ class MessageType(enum.Enum):
 
 class Message(Base):
     __tablename__ = "messages"
+    # Range-partitioned by month on timestamp; old partitions are archived to
+    # Parquet by MessageArchiveService. The partition key must be in the PK.
+    __table_args__ = (
+        Index("ix_messages_session_id_timestamp", "session_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    session_id = Column(UUID(as_uuid=True), ForeignKey('sessions.id'), nullable=False)
+    session_id = Column(UUID(as_uuid=True), ForeignKey('sessions.id', ondelete='CASCADE'), nullable=False)
     sender_id = Column(UUID(as_uuid=True), ForeignKey('agents.id'))  # None for human messages
     recipient_id = Column(UUID(as_uuid=True), ForeignKey('agents.id'))  # None for broadcast
     message_type = Column(Enum(MessageType), nullable=False)
     content = Column(Text, nullable=False)
     message_metadata = Column(JSON, default=dict)  # Reasoning traces, confidence, etc.
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, primary_key=True, default=datetime.utcnow)
     
     # Shadow learning specific fields
     is_suggestion = Column(String(10), default="false")  # true/false as string for JSON compatibility
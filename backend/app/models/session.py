@@ -34,4 +34,10 @@ class Session(Base):
     
     # Relationships
     team = relationship("Team", back_populates="sessions")
-    messages = relationship("Message", back_populates="session", cascade="all, delete-orphan")
\ No newline at end of file
+    # Messages are removed by ON DELETE CASCADE; never load them just to delete
+    messages = relationship(
+        "Message",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
\ No newline at end of file
@@ -1,11 +1,11 @@
-from .agent import AgentCreate, AgentUpdate, AgentResponse
+from .agent import AgentCreate, AgentUpdate, AgentResponse, AgentBulkUpdate, AgentBulkDelete
 from .team import TeamCreate, TeamUpdate, TeamResponse
-from .session import SessionCreate, SessionUpdate, SessionResponse
+from .session import SessionCreate, SessionUpdate, SessionResponse, SessionStatusResponse, SessionPurgeRequest
 from .message import MessageCreate, MessageResponse
 
 __all__ = [
-    "AgentCreate", "AgentUpdate", "AgentResponse",
+    "AgentCreate", "AgentUpdate", "AgentResponse", "AgentBulkUpdate", "AgentBulkDelete",
     "TeamCreate", "TeamUpdate", "TeamResponse", 
-    "SessionCreate", "SessionUpdate", "SessionResponse",
+    "SessionCreate", "SessionUpdate", "SessionResponse", "SessionStatusResponse", "SessionPurgeRequest",
     "MessageCreate", "MessageResponse"
 ]
\ No newline at end of file
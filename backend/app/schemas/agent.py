@@ -30,6 +30,14 @@ class AgentUpdate(BaseModel):
     template_type: Optional[str] = None
 
 
+class AgentBulkUpdate(AgentUpdate):
+    id: UUID
+
+
+class AgentBulkDelete(BaseModel):
+    agent_ids: List[UUID] = Field(..., description="Agents to delete")
+
+
 class AgentResponse(AgentBase):
     id: UUID
     created_at: datetime
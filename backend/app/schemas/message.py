@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Dict, Optional, Any
 from uuid import UUID
 from datetime import datetime
@@ -26,6 +26,12 @@ class MessageBase(BaseModel):
     human_approved: Optional[str] = Field(None, max_length=10, description="Whether a human approved this suggestion")
     learning_confidence: Dict[str, Any] = Field(default_factory=dict, description="Confidence scores for shadow learning")
 
+    @field_validator("message_type", mode="before")
+    @classmethod
+    def _message_type_from_orm(cls, value):
+        # ORM enums carry lowercase values; the API exposes member names
+        return value.name if isinstance(value, Enum) else value
+
 
 class MessageCreate(MessageBase):
     pass
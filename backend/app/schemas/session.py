@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Dict, Optional, Any
 from uuid import UUID
 from datetime import datetime
@@ -23,6 +23,12 @@ class SessionBase(BaseModel):
     metrics: Dict[str, Any] = Field(default_factory=dict, description="Performance and outcome metrics")
     configuration: Dict[str, Any] = Field(default_factory=dict, description="Session-specific configuration")
 
+    @field_validator("status", mode="before")
+    @classmethod
+    def _status_from_orm(cls, value):
+        # ORM enums carry lowercase values; the API exposes member names
+        return value.name if isinstance(value, Enum) else value
+
 
 class SessionCreate(SessionBase):
     pass
@@ -45,4 +51,26 @@ class SessionResponse(SessionBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class SessionStatusResponse(BaseModel):
+    id: UUID
+    status: SessionStatus
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def _status_from_orm(cls, value):
+        return value.name if isinstance(value, Enum) else value
+
+    class Config:
+        from_attributes = True
+
+
+class SessionPurgeRequest(BaseModel):
+    session_ids: Optional[List[UUID]] = Field(None, description="Explicit sessions to delete")
+    older_than_days: Optional[int] = Field(None, ge=0, description="Delete sessions created more than this many days ago")
+    statuses: Optional[List[SessionStatus]] = Field(None, description="Only delete sessions in these states")
+    chunk_size: int = Field(default=500, ge=1, le=10000, description="Sessions deleted per transaction")
\ No newline at end of file
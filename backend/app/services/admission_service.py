@@ -0,0 +1,155 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional
+import asyncio
+import logging
+import math
+import time
+
+from app.core.config import settings
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_REJECTED, QUEUE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_queue_wait = QUEUE_WAIT_SECONDS.labels("admission")
+
+
+def is_critical(customer_context: Optional[Dict[str, Any]]) -> bool:
+    """Tickets flagged urgency=critical take the priority lane"""
+    urgency = (customer_context or {}).get("urgency")
+    return isinstance(urgency, str) and urgency.lower() == "critical"
+
+
+class AdmissionRejected(Exception):
+    """Raised when a pipeline cannot be admitted; maps to 503 + Retry-After"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Caps in-flight pipelines and sheds the excess early
+
+    Up to `limit` pipelines run at once. Further requests wait in a short
+    bounded queue for at most `queue_timeout` seconds; beyond that they are
+    rejected with a Retry-After derived from recent pipeline durations.
+    Critical requests use their own lane, which is always served before the
+    normal queue.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int,
+        max_critical_queue: int,
+        queue_timeout: float,
+        initial_duration_estimate: float = 10.0
+    ):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_critical_queue = max_critical_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._queue: Deque[asyncio.Future] = deque()
+        self._critical_queue: Deque[asyncio.Future] = deque()
+        # Exponentially weighted mean pipeline duration, for Retry-After
+        self._mean_duration = initial_duration_estimate
+        self.stats = {"admitted": 0, "waited": 0, "rejected": 0, "timed_out": 0}
+
+    def retry_after(self) -> int:
+        """Seconds until the queue ahead of a new request should have drained"""
+        waiting = len(self._queue) + len(self._critical_queue) + 1
+        return max(1, math.ceil(self._mean_duration * waiting / self.limit))
+
+    def _reject(self, reason: str):
+        self.stats["rejected"] += 1
+        ADMISSION_REJECTED.labels(reason).inc()
+        raise AdmissionRejected(f"Pipeline capacity exhausted ({reason})", self.retry_after())
+
+    async def _acquire(self, critical: bool):
+        lane = self._critical_queue if critical else self._queue
+        # Normal requests may not jump ahead of anyone already waiting
+        ahead = len(self._critical_queue) if critical else len(self._queue) + len(self._critical_queue)
+        if self.in_flight < self.limit and ahead == 0:
+            self.in_flight += 1
+            return
+
+        if len(lane) >= (self.max_critical_queue if critical else self.max_queue):
+            self._reject("critical_queue_full" if critical else "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        lane.append(waiter)
+        self.stats["waited"] += 1
+        self._update_gauges()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the timeout fired
+                pass
+            else:
+                waiter.cancel()
+                lane.remove(waiter)
+                self.stats["timed_out"] += 1
+                self._update_gauges()
+                self._reject("queue_timeout")
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                waiter.cancel()
+                lane.remove(waiter)
+            self._update_gauges()
+            raise
+        _queue_wait.observe(time.monotonic() - start)
+
+    def _release(self):
+        for lane in (self._critical_queue, self._queue):
+            while lane:
+                waiter = lane.popleft()
+                if not waiter.done():
+                    # Hand the slot straight to the next waiter
+                    waiter.set_result(None)
+                    self._update_gauges()
+                    return
+        self.in_flight -= 1
+        self._update_gauges()
+
+    def _update_gauges(self):
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+        ADMISSION_QUEUED.labels("critical").set(len(self._critical_queue))
+        ADMISSION_QUEUED.labels("normal").set(len(self._queue))
+
+    @asynccontextmanager
+    async def slot(self, critical: bool = False):
+        await self._acquire(critical)
+        self.stats["admitted"] += 1
+        self._update_gauges()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._mean_duration = 0.8 * self._mean_duration + 0.2 * (time.monotonic() - start)
+            self._release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._queue),
+            "critical_queued": len(self._critical_queue),
+            "mean_pipeline_seconds": round(self._mean_duration, 2),
+            **self.stats
+        }
+
+
+# Global instance
+admission_controller = AdmissionController(
+    limit=settings.ADMISSION_MAX_IN_FLIGHT or settings.MAX_CONCURRENT_SESSIONS,
+    max_queue=settings.ADMISSION_QUEUE_SIZE,
+    max_critical_queue=settings.ADMISSION_CRITICAL_QUEUE_SIZE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+)
@@ -1,10 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import Boolean, case, column, select, insert, update, delete, values
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from app.models.agent import Agent
-from app.schemas.agent import AgentCreate, AgentUpdate
+from app.models.team import team_members
+from app.schemas.agent import AgentCreate, AgentUpdate, AgentBulkUpdate
+from app.services.team_cache import team_composition_cache
 
 
 class AgentService:
@@ -12,21 +14,26 @@ class AgentService:
         self.db = db
 
     async def create_agent(self, agent_data: AgentCreate) -> Agent:
-        """Create a new agent"""
-        db_agent = Agent(
-            name=agent_data.name,
-            description=agent_data.description,
-            capabilities=agent_data.capabilities,
-            beliefs=agent_data.beliefs,
-            goals=agent_data.goals,
-            constraints=agent_data.constraints,
-            memory=agent_data.memory,
-            template_type=agent_data.template_type
+        """Create a new agent with a single INSERT ... RETURNING"""
+        result = await self.db.scalars(
+            insert(Agent).values(**agent_data.model_dump()).returning(Agent)
         )
-        self.db.add(db_agent)
-        await self.db.flush()
-        await self.db.refresh(db_agent)
-        return db_agent
+        agent = result.one()
+        team_composition_cache.invalidate_on_commit(self.db, agent_ids=[agent.id])
+        return agent
+
+    async def create_agents(self, agents_data: List[AgentCreate]) -> List[Agent]:
+        """Create many agents with one batched INSERT ... RETURNING"""
+        if not agents_data:
+            return []
+
+        result = await self.db.scalars(
+            insert(Agent).returning(Agent, sort_by_parameter_order=True),
+            [agent_data.model_dump() for agent_data in agents_data]
+        )
+        agents = result.all()
+        team_composition_cache.invalidate_on_commit(self.db, agent_ids=[agent.id for agent in agents])
+        return agents
 
     async def get_agent(self, agent_id: UUID) -> Optional[Agent]:
         """Get agent by ID"""
@@ -43,32 +50,103 @@ class AgentService:
         return result.scalars().all()
 
     async def update_agent(self, agent_id: UUID, agent_data: AgentUpdate) -> Optional[Agent]:
-        """Update an existing agent"""
-        agent = await self.get_agent(agent_id)
-        if not agent:
-            return None
-
+        """Update an existing agent with a single UPDATE ... RETURNING"""
         update_data = agent_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(agent, field, value)
+        if not update_data:
+            return await self.get_agent(agent_id)
 
-        await self.db.flush()
-        await self.db.refresh(agent)
+        result = await self.db.scalars(
+            update(Agent)
+            .where(Agent.id == agent_id)
+            .values(**update_data)
+            .returning(Agent)
+            .execution_options(populate_existing=True)
+        )
+        agent = result.one_or_none()
+        if agent:
+            team_composition_cache.invalidate_on_commit(self.db, agent_ids=[agent_id])
         return agent
 
+    async def update_agents(self, agents_data: List[AgentBulkUpdate]) -> List[Agent]:
+        """Update many agents with one UPDATE ... FROM (VALUES ...) RETURNING
+
+        Each agent may set different fields, so every updated column comes
+        with a per-row flag saying whether that row sets it. Agents that do
+        not exist are left out of the result, which keeps input order; a
+        repeated id takes its fields in input order.
+        """
+        changes: Dict[UUID, Dict[str, Any]] = {}
+        for agent_data in agents_data:
+            changes.setdefault(agent_data.id, {}).update(
+                agent_data.model_dump(exclude={"id"}, exclude_unset=True)
+            )
+        fields = sorted({field for update_data in changes.values() for field in update_data})
+        if not fields:
+            agents = await self.db.scalars(select(Agent).where(Agent.id.in_(changes)))
+            by_id = {agent.id: agent for agent in agents}
+            return [by_id[agent_id] for agent_id in changes if agent_id in by_id]
+
+        table = Agent.__table__
+        rows = values(
+            column("id", table.c.id.type),
+            *(column(field, table.c[field].type) for field in fields),
+            *(column(f"sets_{field}", Boolean) for field in fields),
+            name="changes"
+        ).data([
+            (
+                agent_id,
+                *(update_data.get(field) for field in fields),
+                *(field in update_data for field in fields)
+            )
+            for agent_id, update_data in changes.items()
+        ])
+        result = await self.db.scalars(
+            update(Agent)
+            .where(Agent.id == rows.c.id)
+            .values({
+                field: case((rows.c[f"sets_{field}"], rows.c[field]), else_=table.c[field])
+                for field in fields
+            })
+            .returning(Agent)
+            .execution_options(populate_existing=True)
+        )
+        by_id = {agent.id: agent for agent in result}
+        team_composition_cache.invalidate_on_commit(self.db, agent_ids=list(by_id))
+        return [by_id[agent_id] for agent_id in changes if agent_id in by_id]
+
     async def delete_agent(self, agent_id: UUID) -> bool:
         """Delete an agent"""
-        agent = await self.get_agent(agent_id)
-        if not agent:
-            return False
+        return bool(await self.delete_agents([agent_id]))
+
+    async def delete_agents(self, agent_ids: List[UUID]) -> List[UUID]:
+        """Delete agents and their team memberships in one statement
+
+        Returns the ids that were actually deleted.
+        """
+        if not agent_ids:
+            return []
 
-        await self.db.delete(agent)
-        await self.db.flush()
-        return True
+        # Team memberships used to be removed by the ORM; a data-modifying
+        # CTE keeps that behaviour without a separate round trip
+        memberships = (
+            delete(team_members)
+            .where(team_members.c.agent_id.in_(agent_ids))
+            .cte("removed_memberships")
+        )
+        result = await self.db.execute(
+            delete(Agent)
+            .where(Agent.id.in_(agent_ids))
+            .add_cte(memberships)
+            .returning(Agent.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = result.scalars().all()
+        team_composition_cache.invalidate_on_commit(self.db, agent_ids=deleted_ids)
+        return deleted_ids
 
     async def get_agents_by_template(self, template_type: str) -> List[Agent]:
         """Get all agents of a specific template type"""
         result = await self.db.execute(
             select(Agent).where(Agent.template_type == template_type)
         )
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
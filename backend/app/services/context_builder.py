@@ -0,0 +1,129 @@
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import math
+
+from app.core.config import settings
+
+# Rough chars-per-token for compact JSON; errs towards overestimating
+CHARS_PER_TOKEN = 3.5
+
+# Strings are never truncated below this many characters; they get dropped instead
+MIN_TRUNCATED_CHARS = 200
+TRUNCATION_MARKER = "… [truncated]"
+
+# Context keys each agent needs most, highest first. Keys not listed rank
+# below these and are trimmed first, in reverse insertion order.
+CONTEXT_PRIORITIES: Dict[str, Tuple[str, ...]] = {
+    "triage_specialist": ("urgency",),
+    "solution_researcher": ("triage_result",),
+    "response_crafter": ("research_result", "triage_result"),
+    "escalation_analyst": ("triage_result", "research_result", "urgency"),
+    "story_miner": ("content_type", "target_audience"),
+    "structure_architect": ("story_mining_result", "content_type", "target_audience"),
+    "technical_translator": ("structure_result", "target_audience"),
+    "voice_crafter": ("translation_result", "target_audience"),
+    "hook_designer": ("voice_result", "content_type", "target_audience"),
+    "content_strategist": ("target_audience", "content_type"),
+    "content_producer": ("strategy_result", "target_audience", "content_type"),
+    "guest_experience_agent": ("location",),
+    "concierge_coordinator": ("experience_recommendations", "location"),
+}
+
+# Fields of a prior AgentResponse worth keeping when it is summarized
+RESPONSE_SUMMARY_FIELDS = ("content", "confidence", "escalation_needed")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without calling the API"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def dumps_compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _is_agent_response(value: Any) -> bool:
+    return isinstance(value, dict) and "content" in value and "confidence" in value
+
+
+class ContextBuilder:
+    """Serializes agent context compactly and fits it to a token budget
+
+    Over budget, fields are degraded one at a time from the lowest priority
+    up, stopping as soon as the context fits. Each field is degraded as far
+    as it goes before the next one is touched: a prior agent response is
+    summarized to its decision fields, a long string (or response content)
+    is truncated, and if the context still does not fit the field is
+    dropped. The report holds one entry per field with its final action.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+
+    def _trim_order(self, agent_type: Optional[str], context: Dict[str, Any]) -> List[str]:
+        priorities = CONTEXT_PRIORITIES.get(agent_type, ())
+        rank = {key: i for i, key in enumerate(priorities)}
+        keys = list(context)
+        unlisted = [key for key in reversed(keys) if key not in rank]
+        listed = sorted((key for key in keys if key in rank), key=rank.get, reverse=True)
+        return unlisted + listed
+
+    def build(
+        self,
+        agent_type: Optional[str],
+        context: Dict[str, Any],
+        budget: Optional[int] = None
+    ) -> Tuple[str, int, List[Dict[str, Any]]]:
+        """Return (serialized context, estimated tokens, trimmed fields)"""
+        budget = self.budget if budget is None else budget
+        text = dumps_compact(context)
+        tokens = estimate_tokens(text)
+        if tokens <= budget:
+            return text, tokens, []
+
+        context = dict(context)
+        trimmed: List[Dict[str, Any]] = []
+
+        def fits() -> bool:
+            nonlocal text, tokens
+            text = dumps_compact(context)
+            tokens = estimate_tokens(text)
+            return tokens <= budget
+
+        for key in self._trim_order(agent_type, context):
+            value = context[key]
+            nested = _is_agent_response(value)
+            if nested:
+                summary = {k: value[k] for k in RESPONSE_SUMMARY_FIELDS if k in value}
+                if summary != value:
+                    value = context[key] = summary
+                    trimmed.append({"field": key, "action": "summarized"})
+                    if fits():
+                        break
+
+            string = value.get("content") if nested else value
+            if isinstance(string, str) and len(string) > MIN_TRUNCATED_CHARS:
+                excess_chars = math.ceil((tokens - budget) * CHARS_PER_TOKEN) + len(TRUNCATION_MARKER)
+                keep = max(MIN_TRUNCATED_CHARS, len(string) - excess_chars)
+                if keep < len(string):
+                    shortened = string[:keep] + TRUNCATION_MARKER
+                    context[key] = {**value, "content": shortened} if nested else shortened
+                    action = {"field": key, "action": "truncated", "chars_removed": len(string) - keep}
+                    if trimmed and trimmed[-1]["field"] == key:
+                        trimmed[-1] = action
+                    else:
+                        trimmed.append(action)
+                    if fits():
+                        break
+
+            del context[key]
+            if trimmed and trimmed[-1]["field"] == key:
+                trimmed.pop()
+            trimmed.append({"field": key, "action": "dropped"})
+            if fits():
+                break
+        return text, tokens, trimmed
+
+
+# Global instance
+context_builder = ContextBuilder(settings.LLM_CONTEXT_TOKEN_BUDGET)
@@ -0,0 +1,108 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+from collections import defaultdict, deque
+from datetime import datetime
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import QUEUE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_queue_wait = QUEUE_WAIT_SECONDS.labels("pipeline_events")
+
+# Called by pipelines for every progress event: (event, payload)
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def session_room(session_id: UUID) -> str:
+    return f"session:{session_id}"
+
+
+class PipelineEventPublisher:
+    """Batches pipeline progress events into per-session Socket.IO rooms
+
+    publish() never blocks: events go into a bounded buffer that a single
+    background task drains, grouping events per room into one emit per flush.
+    When the buffer is full the oldest event is dropped, so a slow emitter
+    can never stall a pipeline worker.
+    """
+
+    def __init__(self, max_buffer: int, flush_interval: float, max_batch: int):
+        self.max_buffer = max_buffer
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._buffer: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._server = None
+        self.stats = {"published": 0, "emitted": 0, "dropped": 0, "batches": 0}
+
+    def start(self, server):
+        self._server = server
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            await self._flush()
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, room: str, event: str, data: Dict[str, Any]):
+        if self._task is None:
+            # Not running inside the API server (CLIs, scripts)
+            return
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self.stats["dropped"] += 1
+        self._buffer.append((room, {
+            "event": event,
+            "data": data,
+            "timestamp": datetime.utcnow().isoformat()
+        }, time.monotonic()))
+        self.stats["published"] += 1
+        self._wakeup.set()
+
+    def for_session(self, session_id: UUID) -> ProgressCallback:
+        """Progress callback that publishes into a session's room"""
+        room = session_room(session_id)
+        return lambda event, data: self.publish(room, event, data)
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Let a few more events accumulate so they share one emit
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self._flush()
+            except Exception as e:
+                logger.error(f"Error emitting pipeline events: {e}")
+
+    async def _flush(self):
+        while self._buffer:
+            batch: List[Tuple[str, Dict[str, Any], float]] = []
+            while self._buffer and len(batch) < self.max_batch:
+                batch.append(self._buffer.popleft())
+
+            now = time.monotonic()
+            by_room: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for room, event, enqueued_at in batch:
+                by_room[room].append(event)
+                _queue_wait.observe(now - enqueued_at)
+
+            for room, events in by_room.items():
+                await self._server.emit("pipeline_events", {"events": events}, room=room)
+                self.stats["emitted"] += len(events)
+            self.stats["batches"] += 1
+
+
+# Global instance
+event_publisher = PipelineEventPublisher(
+    max_buffer=settings.EVENT_BUFFER_SIZE,
+    flush_interval=settings.EVENT_FLUSH_INTERVAL_SECONDS,
+    max_batch=settings.EVENT_MAX_BATCH_SIZE
+)
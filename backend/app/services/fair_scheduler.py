@@ -0,0 +1,190 @@
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import time
+
+from app.core.config import settings
+from app.core.metrics import FAIR_QUEUE_DEPTH, QUEUE_WAIT_SECONDS, bounded_label
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+ANONYMOUS = "anonymous"
+
+# Who the current LLM work is for; set per request or per session run
+current_tenant: ContextVar[str] = ContextVar("current_tenant", default=ANONYMOUS)
+# Interactive weight is opt-in, so unlabelled bulk traffic cannot claim it
+current_traffic_class: ContextVar[str] = ContextVar("current_traffic_class", default=BATCH)
+
+_queue_wait = QUEUE_WAIT_SECONDS.labels("llm")
+
+
+def bind_tenant(tenant: Optional[str], traffic_class: Optional[str] = None):
+    """Attribute LLM calls in the current context to a tenant and traffic class
+
+    Anything but an explicit "interactive" is scheduled as batch.
+    """
+    current_tenant.set(tenant or ANONYMOUS)
+    current_traffic_class.set(INTERACTIVE if traffic_class == INTERACTIVE else BATCH)
+
+
+@contextmanager
+def tenant_scope(tenant: Optional[str], traffic_class: Optional[str] = None):
+    """Like bind_tenant, restoring the previous attribution on exit"""
+    tenant_token = current_tenant.set(ANONYMOUS)
+    class_token = current_traffic_class.set(BATCH)
+    bind_tenant(tenant, traffic_class)
+    try:
+        yield
+    finally:
+        current_traffic_class.reset(class_token)
+        current_tenant.reset(tenant_token)
+
+
+class _Flow:
+    __slots__ = ("weight", "last_finish", "queued", "in_flight")
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.last_finish = 0.0
+        self.queued = 0
+        self.in_flight = 0
+
+
+class WeightedFairScheduler:
+    """Start-time fair queuing of LLM call slots across (tenant, class) flows
+
+    Each flow's share of `capacity` is proportional to its tenant weight
+    times its traffic-class weight. Every call advances the flow's virtual
+    finish tag by 1/weight, and freed slots go to the waiting call with the
+    smallest start tag, so a tenant flooding the queue only delays itself.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        class_weights: Dict[str, float],
+        tenant_weights: Dict[str, float],
+        default_tenant_weight: float = 1.0
+    ):
+        self.capacity = capacity
+        self.class_weights = class_weights
+        self.tenant_weights = tenant_weights
+        self.default_tenant_weight = default_tenant_weight
+        self.in_flight = 0
+        self._virtual_time = 0.0
+        self._flows: Dict[Tuple[str, str], _Flow] = {}
+        self._heap: List[Tuple[float, int, asyncio.Future, Tuple[str, str]]] = []
+        self._sequence = itertools.count()
+
+    def _weight(self, tenant: str, traffic_class: str) -> float:
+        tenant_weight = self.tenant_weights.get(tenant, self.default_tenant_weight)
+        return max(tenant_weight * self.class_weights.get(traffic_class, 1.0), 1e-6)
+
+    def _flow(self, key: Tuple[str, str]) -> _Flow:
+        flow = self._flows.get(key)
+        if flow is None:
+            flow = self._flows[key] = _Flow(weight=self._weight(*key))
+        return flow
+
+    def _tag(self, flow: _Flow) -> float:
+        start = max(self._virtual_time, flow.last_finish)
+        flow.last_finish = start + 1.0 / flow.weight
+        return start
+
+    async def _acquire(self, key: Tuple[str, str]):
+        flow = self._flow(key)
+        start_tag = self._tag(flow)
+        if self.in_flight < self.capacity and not self._heap:
+            self._virtual_time = start_tag
+            self.in_flight += 1
+            flow.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (start_tag, next(self._sequence), waiter, key))
+        flow.queued += 1
+        self._update_depth(key, flow)
+        queued_at = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled after being handed a slot: pass it on
+                self._release(key)
+            else:
+                # Its heap entry is skipped lazily once the waiter is cancelled
+                flow.queued -= 1
+                self._update_depth(key, flow)
+                self._forget_idle()
+            raise
+        _queue_wait.observe(time.monotonic() - queued_at)
+
+    def _release(self, key: Tuple[str, str]):
+        flow = self._flows[key]
+        flow.in_flight -= 1
+        while self._heap:
+            start_tag, _, waiter, next_key = heapq.heappop(self._heap)
+            if waiter.done():
+                continue
+            next_flow = self._flows[next_key]
+            next_flow.queued -= 1
+            next_flow.in_flight += 1
+            self._update_depth(next_key, next_flow)
+            self._virtual_time = start_tag
+            waiter.set_result(None)
+            break
+        else:
+            self.in_flight -= 1
+        self._forget_idle()
+
+    def _forget_idle(self):
+        # Virtual-time history only matters while calls are waiting; once the
+        # queue is empty, idle flows are dropped so memory tracks active tenants
+        if self._heap:
+            return
+        for idle_key in [k for k, f in self._flows.items() if f.queued == 0 and f.in_flight == 0]:
+            del self._flows[idle_key]
+
+    def _update_depth(self, key: Tuple[str, str], flow: _Flow):
+        tenant, traffic_class = key
+        FAIR_QUEUE_DEPTH.labels(bounded_label(tenant, self.tenant_weights), traffic_class).set(flow.queued)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one LLM call slot on behalf of the current tenant and class"""
+        key = (current_tenant.get(), current_traffic_class.get())
+        await self._acquire(key)
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "queued": sum(flow.queued for flow in self._flows.values()),
+            "flows": [
+                {
+                    "tenant": tenant,
+                    "traffic_class": traffic_class,
+                    "weight": flow.weight,
+                    "queued": flow.queued,
+                    "in_flight": flow.in_flight
+                }
+                for (tenant, traffic_class), flow in self._flows.items()
+                if flow.queued or flow.in_flight
+            ]
+        }
+
+
+# Global instance
+fair_scheduler = WeightedFairScheduler(
+    capacity=settings.LLM_MAX_CONCURRENT_CALLS,
+    class_weights=settings.FAIR_QUEUE_CLASS_WEIGHTS,
+    tenant_weights=settings.FAIR_QUEUE_TENANT_WEIGHTS,
+    default_tenant_weight=settings.FAIR_QUEUE_DEFAULT_TENANT_WEIGHT
+)
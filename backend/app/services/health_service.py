@@ -0,0 +1,158 @@
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+
+from sqlalchemy import func, select, text
+
+from app.core.config import settings
+from app.core.database import read_only_engine
+from app.core.metrics import SESSIONS
+from app.core.redis import get_redis
+from app.models.session import Session, SessionStatus
+from app.services.admission_service import admission_controller
+from app.services.fair_scheduler import fair_scheduler
+from app.services.llm_service import llm_service
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+# A dependency this deployment does not use, e.g. the LLM without an API key
+NOT_APPLICABLE = "not applicable"
+
+# Components that must be healthy for the instance to take traffic
+REQUIRED_COMPONENTS = ("database",)
+
+
+class HealthMonitor:
+    """Background health checks with a cached snapshot
+
+    Database and Redis are pinged every interval through the shared pools;
+    the LLM check lists models (no tokens) on its own, slower interval.
+    Probe endpoints only read the snapshot.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.HEALTH_CHECK_INTERVAL_SECONDS,
+        llm_interval: float = settings.LLM_HEALTH_CHECK_INTERVAL_SECONDS,
+        timeout: float = settings.HEALTH_CHECK_TIMEOUT_SECONDS
+    ):
+        self.interval = interval
+        self.llm_interval = llm_interval
+        self.timeout = timeout
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self._last_llm_check = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _check_database(self):
+        async with read_only_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _refresh_session_gauges(self):
+        """Session counts by status; piggybacks on the database check interval"""
+        async with read_only_engine.connect() as conn:
+            result = await conn.execute(
+                select(Session.status, func.count()).group_by(Session.status)
+            )
+            counts = {status: count for status, count in result.all()}
+        for status in SessionStatus:
+            SESSIONS.labels(status.value).set(counts.get(status, 0))
+
+    async def _check_redis(self):
+        await get_redis().ping()
+
+    async def _check_llm(self):
+        await llm_service.client.models.list(limit=1)
+
+    async def _run_check(self, name: str, check: Callable[[], Awaitable[None]]):
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), timeout=self.timeout)
+            result = {"status": HEALTHY}
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if self.components.get(name, {}).get("error") != error:
+                logger.warning(f"Health check for {name} failed: {error}")
+            result = {"status": UNHEALTHY, "error": error}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        result["checked_at"] = datetime.utcnow().isoformat()
+        self.components[name] = result
+
+    async def refresh(self, include_llm: Optional[bool] = None):
+        checks = [
+            self._run_check("database", self._check_database),
+            self._run_check("redis", self._check_redis)
+        ]
+
+        now = time.monotonic()
+        if include_llm is None:
+            include_llm = now - self._last_llm_check >= self.llm_interval
+        if not settings.ANTHROPIC_API_KEY:
+            self.components["llm"] = {"status": NOT_APPLICABLE, "checked_at": datetime.utcnow().isoformat()}
+        elif include_llm:
+            self._last_llm_check = now
+            checks.append(self._run_check("llm", self._check_llm))
+
+        await asyncio.gather(*checks)
+
+        if self.components["database"]["status"] == HEALTHY:
+            try:
+                await asyncio.wait_for(self._refresh_session_gauges(), timeout=self.timeout)
+            except Exception as e:
+                logger.warning(f"Could not refresh session gauges: {e}")
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def is_alive(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def is_ready(self) -> bool:
+        return all(
+            self.components.get(name, {}).get("status") == HEALTHY
+            for name in REQUIRED_COMPONENTS
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        statuses = [
+            component["status"] for component in self.components.values()
+            if component["status"] != NOT_APPLICABLE
+        ]
+        if not self.components or not self.is_ready():
+            status = UNHEALTHY
+        elif all(s == HEALTHY for s in statuses):
+            status = HEALTHY
+        else:
+            status = "degraded"
+        return {
+            "status": status,
+            "services": self.components,
+            "circuit_breakers": {llm_service.breaker.name: llm_service.breaker.snapshot()},
+            "admission": admission_controller.snapshot(),
+            "llm_scheduler": fair_scheduler.snapshot()
+        }
+
+
+# Global instance
+health_monitor = HealthMonitor()
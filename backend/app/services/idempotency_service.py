@@ -0,0 +1,149 @@
+from typing import Any, Awaitable, Callable, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import uuid
+
+import orjson
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.responses import dumps_json
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+class IdempotencyError(Exception):
+    """Raised when a keyed request cannot be run or replayed"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class IdempotencyService:
+    """Idempotency-Key handling backed by Redis
+
+    The first request claims the key with SET NX and stores its result for
+    ttl_seconds. Concurrent duplicates poll until that result appears;
+    completed duplicates get it straight back. A failed run releases the key
+    so the client can retry.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = settings.IDEMPOTENCY_TTL_SECONDS,
+        lock_ttl_seconds: int = settings.IDEMPOTENCY_LOCK_TTL_SECONDS,
+        wait_timeout: float = settings.IDEMPOTENCY_WAIT_TIMEOUT_SECONDS,
+        poll_interval: float = settings.IDEMPOTENCY_POLL_INTERVAL_SECONDS
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def fingerprint(payload: BaseModel) -> str:
+        return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+    async def run(
+        self,
+        key: Optional[str],
+        scope: str,
+        payload: BaseModel,
+        run: Callable[[], Awaitable[Any]],
+        should_store: Callable[[Any], bool] = lambda result: True
+    ) -> Tuple[Any, bool]:
+        """Run the pipeline at most once per key
+
+        Returns (result, replayed). Without a key the pipeline simply runs.
+        Results rejected by should_store release the key instead of being
+        replayed, so a retry runs the pipeline again.
+        """
+        if not key:
+            return await run(), False
+
+        client = get_redis()
+        redis_key = f"idempotency:{scope}:{key}"
+        fingerprint = self.fingerprint(payload)
+        token = uuid.uuid4().hex
+        deadline = asyncio.get_running_loop().time() + self.wait_timeout
+
+        while True:
+            try:
+                claimed = await client.set(
+                    redis_key,
+                    orjson.dumps({"state": IN_PROGRESS, "fingerprint": fingerprint, "token": token}),
+                    nx=True,
+                    ex=self.lock_ttl_seconds
+                )
+                record = None if claimed else await client.get(redis_key)
+            except redis.RedisError as e:
+                # Fail open: a Redis outage should not take the pipelines down
+                logger.warning(f"Idempotency store unavailable, running {scope} without key: {e}")
+                return await run(), False
+
+            if claimed:
+                return await self._run_claimed(client, redis_key, fingerprint, token, run, should_store), False
+
+            if record is None:
+                # The owner failed and released the key between SET and GET
+                continue
+
+            record = orjson.loads(record)
+            if record["fingerprint"] != fingerprint:
+                raise IdempotencyError(422, "Idempotency-Key was already used with a different request body")
+            if record["state"] == COMPLETED:
+                return orjson.loads(record["result"]), True
+
+            if asyncio.get_running_loop().time() >= deadline:
+                raise IdempotencyError(409, "A request with this Idempotency-Key is still in progress")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _run_claimed(self, client: redis.Redis, redis_key: str, fingerprint: str, token: str, run, should_store):
+        try:
+            result = await run()
+        except BaseException:
+            await self._release(client, redis_key, token)
+            raise
+
+        if not should_store(result):
+            await self._release(client, redis_key, token)
+            return result
+
+        record = {
+            "state": COMPLETED,
+            "fingerprint": fingerprint,
+            "result": dumps_json(result).decode()
+        }
+        try:
+            await client.set(redis_key, orjson.dumps(record), ex=self.ttl_seconds)
+        except redis.RedisError as e:
+            logger.warning(f"Could not store idempotent result for {redis_key}: {e}")
+        return result
+
+    async def _release(self, client: redis.Redis, redis_key: str, token: str):
+        """Delete the claim only if it is still ours"""
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(redis_key)
+                raw = await pipe.get(redis_key)
+                if raw is None or orjson.loads(raw).get("token") != token:
+                    return
+                pipe.multi()
+                pipe.delete(redis_key)
+                await pipe.execute()
+        except redis.WatchError:
+            pass
+        except redis.RedisError as e:
+            logger.warning(f"Could not release idempotency key {redis_key}: {e}")
+
+
+# Global instance
+idempotency_service = IdempotencyService()
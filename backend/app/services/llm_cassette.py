@@ -0,0 +1,118 @@
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("off", "record", "replay", "auto")
+
+# Request fields that decide the model's answer; anything else (timeouts,
+# headers) may differ between recording and replay
+FINGERPRINT_FIELDS = ("model", "system", "messages", "tools", "tool_choice", "max_tokens", "temperature")
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recording for a request"""
+
+    def __init__(self, fingerprint: str, path: Path):
+        self.fingerprint = fingerprint
+        super().__init__(f"No recording for request {fingerprint[:12]} in {path}")
+
+
+def fingerprint(request: Dict[str, Any]) -> str:
+    """Stable hash of the parts of a messages request that shape the answer"""
+    canonical = {field: request.get(field) for field in FINGERPRINT_FIELDS}
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class LLMCassette:
+    """Records LLM request/response pairs to a JSON-lines file and replays them
+
+    Modes: off; record (call the API, append every exchange); replay (serve
+    recordings by request fingerprint, raising CassetteMiss when there is
+    none); auto (replay when recorded, otherwise call the API and record).
+    Repeated identical requests replay their recordings in order, then
+    keep serving the last one. Only complete responses are recorded.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = "off", replay_latency: bool = False):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {CASSETTE_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._recordings: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursors: Dict[str, int] = defaultdict(int)
+        self._write_lock = threading.Lock()
+        if self.replays:
+            self._load()
+
+    @property
+    def replays(self) -> bool:
+        return self.mode in ("replay", "auto")
+
+    @property
+    def records(self) -> bool:
+        return self.mode in ("record", "auto")
+
+    def _load(self):
+        if not self.path.exists():
+            logger.warning(f"Cassette {self.path} does not exist yet; every request will miss")
+            return
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._recordings[entry["fingerprint"]].append(entry)
+        logger.info(f"Loaded {sum(map(len, self._recordings.values()))} LLM recordings from {self.path}")
+
+    async def replay(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The recorded exchange for request, or None (auto mode) when there is none"""
+        key = fingerprint(request)
+        entries = self._recordings.get(key)
+        if not entries:
+            if self.mode == "replay":
+                raise CassetteMiss(key, self.path)
+            return None
+
+        cursor = self._cursors[key]
+        self._cursors[key] = cursor + 1
+        entry = entries[min(cursor, len(entries) - 1)]
+        if self.replay_latency:
+            await asyncio.sleep(entry.get("latency_seconds", 0.0))
+        return entry
+
+    async def record(
+        self,
+        request: Dict[str, Any],
+        response: Union[Dict[str, Any], str],
+        usage: Optional[Dict[str, int]],
+        latency_seconds: float,
+        agent_type: Optional[str] = None
+    ):
+        entry = {
+            "fingerprint": fingerprint(request),
+            "agent_type": agent_type,
+            "recorded_at": datetime.utcnow().isoformat(),
+            "latency_seconds": round(latency_seconds, 4),
+            "usage": usage,
+            "request": {field: request.get(field) for field in FINGERPRINT_FIELDS},
+            "response": response,
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        await asyncio.to_thread(self._append, line)
+        if self.mode == "auto":
+            self._recordings[entry["fingerprint"]].append(entry)
+
+    def _append(self, line: str):
+        with self._write_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
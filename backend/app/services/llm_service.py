@@ -1,6 +1,10 @@
 import asyncio
+import functools
 import json
-from typing import Dict, List, Optional, Any
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
+import anthropic
 from anthropic import AsyncAnthropic
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
@@ -8,10 +12,36 @@ from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 import logging
 
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.core.config import settings
+from app.core.json_stream import IncrementalJSONObjectParser
+from app.core.metrics import (
+    AGENT_CONTEXT_TOKENS, AGENT_CONTEXT_TRIMS, AGENT_PARSE_RESULTS, LLM_CALL_SECONDS,
+    LLM_DECISION_LEAD_SECONDS, LLM_EARLY_EXITS, LLM_TOKENS, PIPELINE_SECONDS, PIPELINE_STAGE_SECONDS,
+    bounded_label
+)
+from app.core.tracing import tracer
+from app.services.context_builder import context_builder
+from app.services.event_service import ProgressCallback
+from app.services.fair_scheduler import fair_scheduler
+from app.services.llm_cassette import LLMCassette
+from app.services.prompt_registry import PROMPTS_DIR, PromptRegistry
 
 logger = logging.getLogger(__name__)
 
+AGENT_MODEL = "claude-3-5-sonnet-20241022"
+
+# Agent types with a dedicated prompt; anything else is reported as "other"
+AGENT_TYPES = frozenset({
+    "triage_specialist", "solution_researcher", "response_crafter", "escalation_analyst",
+    "story_miner", "technical_translator", "voice_crafter", "structure_architect", "hook_designer",
+    "content_strategist", "content_producer",
+    "guest_experience_agent", "concierge_coordinator"
+})
+
+# Name of the orchestrator pipeline running in the current task
+current_pipeline: ContextVar[str] = ContextVar("current_pipeline", default="none")
+
 
 class AgentResponse(BaseModel):
     content: str
@@ -22,11 +52,73 @@ class AgentResponse(BaseModel):
     metadata: Dict[str, Any] = {}
 
 
+def _is_dependency_failure(error: BaseException) -> bool:
+    """Errors that say Anthropic is unhealthy, as opposed to a bad request"""
+    return isinstance(error, (
+        anthropic.APIConnectionError,  # includes timeouts
+        anthropic.RateLimitError,
+        anthropic.InternalServerError,  # 5xx, including 529 overloaded
+        asyncio.TimeoutError
+    ))
+
+
+# Agents answer by calling this tool, so the API returns schema-shaped input
+# instead of free text that has to be searched for JSON. Decision fields come
+# first so a streamed answer can be routed before its content is written.
+AGENT_RESPONSE_TOOL = {
+    "name": "submit_agent_response",
+    "description": "Submit your final answer for this task. Always call this exactly once.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "escalation_needed": {"type": "boolean", "description": "True if human review is required"},
+            "confidence": {"type": "number", "minimum": 0, "maximum": 1, "description": "Confidence from 0.0 to 1.0"},
+            "content": {"type": "string", "description": "Your answer, decision or deliverable"},
+            "reasoning": {"type": "string", "description": "Brief explanation of your decision process"},
+            "suggestions": {"type": "array", "items": {"type": "string"}, "description": "Alternatives or next steps"}
+        },
+        "required": ["escalation_needed", "confidence", "content", "reasoning"]
+    }
+}
+
+# Fields the orchestrator routes on; once both have streamed the rest is prose
+DECISION_FIELDS = frozenset({"escalation_needed", "confidence"})
+
+# Decides from the fields streamed so far whether the rest of the answer is needed
+StopCondition = Callable[[Dict[str, Any]], bool]
+
+
 class LLMService:
     def __init__(self):
-        self.client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL,
+            timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS
+        )
+        self.breaker = CircuitBreaker(
+            "anthropic",
+            window_seconds=settings.LLM_BREAKER_WINDOW_SECONDS,
+            minimum_calls=settings.LLM_BREAKER_MINIMUM_CALLS,
+            failure_rate_threshold=settings.LLM_BREAKER_FAILURE_RATE,
+            slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=settings.LLM_BREAKER_SLOW_CALL_RATE,
+            open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+            half_open_calls=settings.LLM_BREAKER_HALF_OPEN_CALLS,
+            is_failure=_is_dependency_failure
+        )
+        self.prompts = PromptRegistry(
+            PROMPTS_DIR,
+            reload_interval=settings.PROMPT_RELOAD_INTERVAL_SECONDS,
+            cache_size=settings.PROMPT_RENDER_CACHE_SIZE,
+            suffix=f"\n\nSubmit these fields, in this order, by calling the {AGENT_RESPONSE_TOOL['name']} tool."
+        )
+        self.cassette = LLMCassette(
+            settings.LLM_CASSETTE_PATH,
+            mode=settings.LLM_CASSETTE_MODE,
+            replay_latency=settings.LLM_CASSETTE_REPLAY_LATENCY
+        )
         self.chat_model = ChatAnthropic(
-            model="claude-3-5-sonnet-20241022",
+            model=AGENT_MODEL,
             api_key=settings.ANTHROPIC_API_KEY,
             max_tokens=2048,
             temperature=0.3
@@ -39,19 +131,42 @@ class LLMService:
         context: Dict[str, Any],
         capabilities: List[str],
         goals: List[str],
-        constraints: List[str]
+        constraints: List[str],
+        stop_when: Optional[StopCondition] = None
     ) -> AgentResponse:
-        """Process a request for a specific agent type"""
+        """Process a request for a specific agent type
+
+        stop_when is checked as each top-level field streams in, once the
+        DECISION_FIELDS are all in; when it returns True generation stops
+        and the response carries the fields received so far, flagged with
+        metadata["early_exit"].
+        """
         
-        system_prompt = self._build_agent_system_prompt(
+        system_prompt, prompt_version = self._build_agent_system_prompt(
             agent_type, capabilities, goals, constraints
         )
         
-        user_prompt = self._build_user_prompt(task, context)
+        user_prompt, context_trimmed = self._build_user_prompt(task, context, agent_type)
         
         try:
-            response = await self._call_claude(system_prompt, user_prompt)
-            return self._parse_agent_response(response)
+            response = await self._call_claude(system_prompt, user_prompt, agent_type, stop_when)
+            parsed = self._parse_agent_response(response, agent_type)
+            parsed.metadata = {**parsed.metadata, "prompt_version": prompt_version}
+            if context_trimmed:
+                parsed.metadata["context_trimmed"] = context_trimmed
+            return parsed
+        except CircuitOpenError as e:
+            return AgentResponse(
+                content="The AI service is temporarily unavailable; this request needs human review.",
+                confidence=0.0,
+                reasoning="LLM circuit breaker is open",
+                escalation_needed=True,
+                metadata={
+                    "circuit_open": True,
+                    "retry_after_seconds": round(e.retry_after, 2),
+                    "prompt_version": prompt_version
+                }
+            )
         except Exception as e:
             logger.error(f"Error processing agent request: {e}")
             return AgentResponse(
@@ -59,7 +174,7 @@ class LLMService:
                 confidence=0.0,
                 reasoning="Technical error occurred",
                 escalation_needed=True,
-                metadata={"error": str(e)}
+                metadata={"error": str(e), "prompt_version": prompt_version}
             )
     
     def _build_agent_system_prompt(
@@ -68,296 +183,190 @@ class LLMService:
         capabilities: List[str],
         goals: List[str],
         constraints: List[str]
-    ) -> str:
-        """Build system prompt based on agent configuration"""
-        
-        prompts = {
-            "triage_specialist": """You are a Customer Support Triage Specialist agent. Your role is to categorize incoming support requests, assess their urgency, and route them appropriately.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each request:
-1. Categorize the issue type (technical, billing, account, etc.)
-2. Assess urgency level (low, medium, high, critical)
-3. Determine appropriate routing
-4. Provide clear reasoning for your decisions
-
-Respond in JSON format with:
-- content: Your triage decision and routing recommendation
-- confidence: 0.0-1.0 confidence in your assessment
-- reasoning: Brief explanation of your decision process
-- suggestions: Alternative actions if confidence is low
-- escalation_needed: true if human review required""",
-
-            "solution_researcher": """You are a Solution Research Specialist agent. Your role is to find relevant answers in documentation, past tickets, and knowledge bases.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each query:
-1. Search through available knowledge sources
-2. Find the most relevant and accurate solutions
-3. Rank solutions by relevance and confidence
-4. Cite sources for all recommendations
-
-Respond in JSON format with:
-- content: The solution or information found
-- confidence: 0.0-1.0 confidence in the solution
-- reasoning: How you found and validated the solution
-- suggestions: Alternative solutions or next steps
-- escalation_needed: true if no sufficient solution found""",
-
-            "response_crafter": """You are a Response Crafting Specialist agent. Your role is to write empathetic, accurate, and brand-aligned customer responses.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each response:
-1. Maintain empathetic and professional tone
-2. Ensure accuracy and completeness
-3. Follow brand voice guidelines
-4. Include clear next steps
-
-Respond in JSON format with:
-- content: The customer-ready response
-- confidence: 0.0-1.0 confidence in response quality
-- reasoning: Why this response addresses the customer's needs
-- suggestions: Alternative phrasings or approaches
-- escalation_needed: true if complex issues require human touch""",
-
-            "escalation_analyst": """You are an Escalation Analysis Specialist agent. Your role is to identify when human intervention is needed and prepare proper handoffs.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each case:
-1. Assess complexity and risk factors
-2. Determine if human expertise is needed
-3. Identify the right specialist type
-4. Prepare comprehensive handoff documentation
-
-Respond in JSON format with:
-- content: Escalation recommendation and handoff notes
-- confidence: 0.0-1.0 confidence in escalation decision
-- reasoning: Factors leading to escalation decision
-- suggestions: Specialist type and handoff approach
-- escalation_needed: always true for this agent type""",
-
-            # Content Creation Team Agents (Demo/Validation Use Case)
-            "story_miner": """You are a Story Miner agent for content creation. Your role is to extract compelling narratives and human elements from source material.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each piece of source material:
-1. Identify the most compelling human stories and experiences
-2. Extract key moments that create emotional connection
-3. Find relatable elements that resonate with audiences
-4. Surface authentic experiences and genuine insights
-
-Respond in JSON format with:
-- content: The compelling narratives and stories you've extracted
-- confidence: 0.0-1.0 confidence in story relevance and impact
-- reasoning: Why these stories are compelling and authentic
-- suggestions: Alternative narrative angles or additional story elements
-- escalation_needed: true if source material lacks compelling narratives""",
-
-            "technical_translator": """You are a Technical Translator agent for content creation. Your role is to simplify complex concepts for general audiences without losing essential meaning.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each technical concept:
-1. Break down complex ideas into understandable components
-2. Create analogies and metaphors that clarify meaning
-3. Remove jargon while preserving accuracy
-4. Make concepts accessible to non-technical audiences
-
-Respond in JSON format with:
-- content: Simplified, accessible explanation of the technical concepts
-- confidence: 0.0-1.0 confidence in translation accuracy and clarity
-- reasoning: How you maintained accuracy while simplifying
-- suggestions: Alternative explanations or additional clarifications
-- escalation_needed: true if concepts are too complex to simplify safely""",
-
-            "voice_crafter": """You are a Voice Crafter agent for content creation. Your role is to maintain authentic, personal tone throughout content.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each piece of content:
-1. Ensure authentic, human voice that connects with readers
-2. Maintain consistent tone and personality
-3. Balance professionalism with genuine warmth
-4. Make content feel personal and engaging
-
-Respond in JSON format with:
-- content: Content refined for authentic voice and tone
-- confidence: 0.0-1.0 confidence in voice consistency and authenticity
-- reasoning: How you enhanced the human connection and authenticity
-- suggestions: Alternative tone approaches or voice adjustments
-- escalation_needed: true if content feels too corporate or impersonal""",
-
-            "structure_architect": """You are a Structure Architect agent for content creation. Your role is to organize ideas into compelling narrative flow.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each piece of content:
-1. Create logical progression that builds engagement
-2. Organize ideas for maximum impact and clarity
-3. Ensure smooth transitions between concepts
-4. Structure content for optimal readability and flow
-
-Respond in JSON format with:
-- content: Content restructured for optimal narrative flow
-- confidence: 0.0-1.0 confidence in structural improvements
-- reasoning: How the new structure enhances readability and impact
-- suggestions: Alternative structural approaches or organization methods
-- escalation_needed: true if content lacks sufficient substance for good structure""",
-
-            "hook_designer": """You are a Hook Designer agent for content creation. Your role is to create engaging openings and maintain momentum throughout.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each piece of content:
-1. Create compelling opening that captures immediate attention
-2. Design hooks that maintain reader interest throughout
-3. Craft memorable conclusions that leave lasting impact
-4. Ensure momentum builds naturally from start to finish
-
-Respond in JSON format with:
-- content: Content enhanced with engaging hooks and strong momentum
-- confidence: 0.0-1.0 confidence in engagement and memorability
-- reasoning: How the hooks enhance reader engagement and retention
-- suggestions: Alternative hook approaches or engagement techniques
-- escalation_needed: true if content lacks engaging elements to work with""",
-
-            # Content Marketing Prototype Team (2 agents)
-            "content_strategist": """You are a Content Strategist agent for content marketing. Your role is to research audiences, plan content strategy, and optimize performance.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each content marketing request:
-1. Analyze target audience and market positioning
-2. Create content strategy and editorial approach
-3. Define key messaging and content themes
-4. Plan distribution and performance metrics
-
-Respond in JSON format with:
-- content: Strategic content brief and recommendations
-- confidence: 0.0-1.0 confidence in strategy effectiveness
-- reasoning: Strategic rationale and market analysis
-- suggestions: Alternative approaches or optimization ideas
-- escalation_needed: true if strategy requires specialized expertise""",
-
-            "content_producer": """You are a Content Producer agent for content marketing. Your role is to create high-quality content optimized for engagement and search.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each content production request:
-1. Write engaging, high-quality content based on strategy
-2. Optimize for SEO and target audience
-3. Ensure brand voice consistency and accuracy
-4. Include calls-to-action and engagement elements
-
-Respond in JSON format with:
-- content: Polished, ready-to-publish content
-- confidence: 0.0-1.0 confidence in content quality and effectiveness
-- reasoning: Content decisions and optimization rationale
-- suggestions: Distribution recommendations or content variations
-- escalation_needed: true if content requires expert review""",
-
-            # Guest Concierge Team (2 agents)
-            "guest_experience_agent": """You are a Guest Experience Agent for hospitality concierge services. Your role is to understand guest needs and create personalized experience recommendations.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each guest request:
-1. Understand guest preferences, budget, and context
-2. Assess guest mood, urgency, and special requirements
-3. Identify optimal experience opportunities
-4. Consider timing, logistics, and guest satisfaction
-
-Respond in JSON format with:
-- content: Personalized experience recommendations and insights
-- confidence: 0.0-1.0 confidence in recommendation fit
-- reasoning: Guest analysis and recommendation rationale
-- suggestions: Alternative options or enhancement ideas
-- escalation_needed: true if request requires specialized local knowledge""",
-
-            "concierge_coordinator": """You are a Concierge Coordinator agent for hospitality services. Your role is to arrange experiences, manage logistics, and ensure seamless execution.
-
-CAPABILITIES: {capabilities}
-GOALS: {goals}
-CONSTRAINTS: {constraints}
-
-For each coordination request:
-1. Arrange reservations, bookings, and logistics
-2. Coordinate timing and transportation details
-3. Anticipate potential issues and backup plans
-4. Ensure premium service delivery and follow-up
-
-Respond in JSON format with:
-- content: Detailed coordination plan and arrangements
-- confidence: 0.0-1.0 confidence in execution feasibility
-- reasoning: Logistics planning and risk assessment
-- suggestions: Enhancements or contingency options
-- escalation_needed: true if arrangements require manager approval"""
-        }
-        
-        base_prompt = prompts.get(agent_type, prompts["triage_specialist"])
-        
-        return base_prompt.format(
-            capabilities=", ".join(capabilities),
-            goals="; ".join(goals),
-            constraints="; ".join(constraints)
-        )
+    ) -> Tuple[str, str]:
+        """Render the agent's system prompt; returns (prompt, prompt version)"""
+        return self.prompts.render(agent_type, capabilities, goals, constraints)
     
-    def _build_user_prompt(self, task: str, context: Dict[str, Any]) -> str:
-        """Build user prompt with task and context"""
+    def _build_user_prompt(
+        self,
+        task: str,
+        context: Dict[str, Any],
+        agent_type: Optional[str] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Build user prompt with task and budgeted context
+
+        Returns the prompt and the context fields trimmed to fit the budget.
+        """
         
         context_str = ""
+        trimmed = []
         if context:
-            context_str = f"\n\nCONTEXT:\n{json.dumps(context, indent=2)}"
-        
-        return f"TASK: {task}{context_str}\n\nPlease process this request according to your role and respond in the specified JSON format."
+            agent_label = bounded_label(agent_type, AGENT_TYPES)
+            serialized, tokens, trimmed = context_builder.build(agent_type, context)
+            AGENT_CONTEXT_TOKENS.labels(agent_label).observe(tokens)
+            for trim in trimmed:
+                AGENT_CONTEXT_TRIMS.labels(agent_label, trim["action"]).inc()
+            if trimmed:
+                logger.info(f"Trimmed {agent_type} context to ~{tokens} tokens: {trimmed}")
+            context_str = f"\n\nCONTEXT:\n{serialized}"
+        
+        prompt = f"TASK: {task}{context_str}\n\nPlease process this request according to your role and submit your answer with the {AGENT_RESPONSE_TOOL['name']} tool."
+        return prompt, trimmed
     
-    async def _call_claude(self, system_prompt: str, user_prompt: str) -> str:
-        """Call Claude API with prompts"""
-        
-        response = await self.client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=2048,
-            temperature=0.3,
-            system=system_prompt,
-            messages=[
+    async def _call_claude(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        agent_type: Optional[str] = None,
+        stop_when: Optional[StopCondition] = None
+    ) -> Union[Dict[str, Any], str]:
+        """Call Claude API with prompts through the circuit breaker
+
+        Returns the submit_agent_response tool input, or the text if the model
+        answered without calling the tool. When stop_when cuts the stream
+        short, returns the fields received so far. The cassette may serve
+        the answer from a recording or record this exchange; while recording,
+        streams are drained so the recording (and its replay) is complete.
+        """
+        
+        agent_label = bounded_label(agent_type, AGENT_TYPES)
+        request = {
+            "model": AGENT_MODEL,
+            "max_tokens": 2048,
+            "temperature": 0.3,
+            "system": system_prompt,
+            "messages": [
                 {"role": "user", "content": user_prompt}
-            ]
-        )
-        
-        return response.content[0].text
+            ],
+            "tools": [AGENT_RESPONSE_TOOL],
+            "tool_choice": {"type": "tool", "name": AGENT_RESPONSE_TOOL["name"]}
+        }
+        outcome = "error"
+        start = time.perf_counter()
+        with tracer.start_as_current_span("anthropic.messages.create", attributes={
+            "gen_ai.system": "anthropic",
+            "gen_ai.request.model": AGENT_MODEL,
+            "kyoryoku.agent_type": agent_label
+        }) as span:
+            if self.cassette.replays:
+                recording = await self.cassette.replay(request)
+                if recording is not None:
+                    span.set_attribute("kyoryoku.outcome", "replayed")
+                    LLM_CALL_SECONDS.labels(agent_label, AGENT_MODEL, "replayed").observe(time.perf_counter() - start)
+                    return recording["response"]
+
+            try:
+                # Fail fast instead of queueing behind other tenants when open
+                self.breaker.check()
+                async with fair_scheduler.slot():
+                    start = time.perf_counter()
+                    response, partial, decided_at = await self.breaker.call(
+                        self._stream_message, None if self.cassette.records else stop_when, **request
+                    )
+                outcome = "ok"
+            except CircuitOpenError:
+                outcome = "short_circuit"
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                span.set_attribute("kyoryoku.outcome", outcome)
+                LLM_CALL_SECONDS.labels(agent_label, AGENT_MODEL, outcome).observe(elapsed)
+
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                span.set_attribute("gen_ai.usage.input_tokens", usage.input_tokens)
+                span.set_attribute("gen_ai.usage.output_tokens", usage.output_tokens)
+                LLM_TOKENS.labels(agent_label, AGENT_MODEL, "input").inc(usage.input_tokens)
+                LLM_TOKENS.labels(agent_label, AGENT_MODEL, "output").inc(usage.output_tokens)
+
+            if decided_at is not None:
+                decision_seconds = decided_at - start
+                span.set_attribute("kyoryoku.decision_seconds", decision_seconds)
+                if partial is None:
+                    LLM_DECISION_LEAD_SECONDS.labels(agent_label).observe(time.perf_counter() - decided_at)
+
+        if partial is not None:
+            LLM_EARLY_EXITS.labels(agent_label).inc()
+            # Say what was decided instead of passing on an empty content field
+            payload = {
+                "content": (
+                    f"Stopped at the decision: escalation_needed={partial['escalation_needed']}, "
+                    f"confidence={partial['confidence']}; no further content was generated."
+                ),
+                "reasoning": "Generation stopped once the decision fields settled the routing.",
+                **partial,
+                "metadata": {
+                    "early_exit": True,
+                    "fields_received": list(partial),
+                    "decision_seconds": round(decision_seconds, 3)
+                }
+            }
+        else:
+            payload = next((
+                block.input for block in response.content
+                if block.type == "tool_use" and block.name == AGENT_RESPONSE_TOOL["name"]
+            ), None)
+            if payload is None:
+                payload = "".join(block.text for block in response.content if block.type == "text")
+
+        if self.cassette.records:
+            await self.cassette.record(
+                request,
+                payload,
+                {"input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens} if usage is not None else None,
+                elapsed,
+                agent_type
+            )
+        return payload
+
+    async def _stream_message(
+        self,
+        stop_when: Optional[StopCondition],
+        **request
+    ) -> Tuple[Any, Optional[Dict[str, Any]], Optional[float]]:
+        """Stream a messages request, parsing the tool input as it arrives
+
+        Returns (message, partial fields, decision time). stop_when is only
+        consulted once every DECISION_FIELDS field has completed, so a cut
+        stream always carries the full decision. partial is None unless
+        stop_when ended the stream, in which case message is the snapshot at
+        that point. Decision time (perf_counter) is when DECISION_FIELDS had
+        all completed.
+        """
+        parser = IncrementalJSONObjectParser()
+        decided_at = None
+        async with self.client.messages.stream(**request) as stream:
+            async for event in stream:
+                if event.type != "content_block_delta" or event.delta.type != "input_json_delta":
+                    continue
+                if not parser.feed(event.delta.partial_json):
+                    continue
+
+                if decided_at is None and DECISION_FIELDS <= parser.fields.keys():
+                    decided_at = time.perf_counter()
+                if decided_at is not None and stop_when is not None and stop_when(parser.fields):
+                    # Leaving the block closes the connection, which stops generation
+                    return stream.current_message_snapshot, dict(parser.fields), decided_at
+
+            return await stream.get_final_message(), None, decided_at
     
-    def _parse_agent_response(self, response_text: str) -> AgentResponse:
-        """Parse Claude's response into AgentResponse object"""
-        
+    def _parse_agent_response(self, response: Union[Dict[str, Any], str], agent_type: Optional[str] = None) -> AgentResponse:
+        """Parse Claude's response into AgentResponse object
+
+        Tool input is already schema-shaped and only needs validating; free
+        text falls back to extracting the outermost JSON object.
+        """
+        agent_label = bounded_label(agent_type, AGENT_TYPES)
+        if isinstance(response, dict):
+            try:
+                parsed = self._agent_response_from_data(response)
+                AGENT_PARSE_RESULTS.labels(agent_label, "structured").inc()
+                return parsed
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Invalid {AGENT_RESPONSE_TOOL['name']} input: {e}")
+                response = json.dumps(response)
+
+        response_text = response
         try:
             # Try to extract JSON from response
             start_idx = response_text.find('{')
@@ -365,43 +374,12 @@ Respond in JSON format with:
             
             if start_idx != -1 and end_idx != 0:
                 json_str = response_text[start_idx:end_idx]
-                data = json.loads(json_str)
-                
-                # Handle flexible response formats from Claude
-                content = data.get("content", "")
-                if isinstance(content, dict):
-                    content = json.dumps(content, indent=2)
-                elif not isinstance(content, str):
-                    content = str(content)
-                
-                # Handle reasoning field
-                reasoning = data.get("reasoning", "")
-                if isinstance(reasoning, list):
-                    reasoning = ". ".join(str(r) for r in reasoning)
-                elif not isinstance(reasoning, str):
-                    reasoning = str(reasoning)
-                
-                # Handle suggestions field
-                suggestions = data.get("suggestions", [])
-                if isinstance(suggestions, dict):
-                    # Convert dict suggestions to list of strings
-                    suggestions = [f"{k}: {v}" for k, v in suggestions.items()]
-                elif not isinstance(suggestions, list):
-                    suggestions = [str(suggestions)]
-                
-                # Ensure all suggestion items are strings
-                suggestions = [str(s) for s in suggestions]
-                
-                return AgentResponse(
-                    content=content,
-                    confidence=float(data.get("confidence", 0.5)),
-                    reasoning=reasoning,
-                    suggestions=suggestions,
-                    escalation_needed=bool(data.get("escalation_needed", False)),
-                    metadata=data.get("metadata", {})
-                )
+                parsed = self._agent_response_from_data(json.loads(json_str))
+                AGENT_PARSE_RESULTS.labels(agent_label, "text").inc()
+                return parsed
             else:
                 # Fallback if no JSON found
+                AGENT_PARSE_RESULTS.labels(agent_label, "text").inc()
                 return AgentResponse(
                     content=response_text,
                     confidence=0.7,
@@ -409,7 +387,9 @@ Respond in JSON format with:
                     escalation_needed=False
                 )
                 
-        except json.JSONDecodeError as e:
+        except (ValueError, TypeError) as e:
+            # json.JSONDecodeError is a ValueError
+            AGENT_PARSE_RESULTS.labels(agent_label, "failed").inc()
             logger.warning(f"Failed to parse JSON response: {e}")
             return AgentResponse(
                 content=response_text,
@@ -419,17 +399,144 @@ Respond in JSON format with:
                 metadata={"parse_error": str(e)}
             )
 
+    @staticmethod
+    def _agent_response_from_data(data: Dict[str, Any]) -> AgentResponse:
+        """Build an AgentResponse, tolerating the field shapes Claude tends to vary"""
+        if not isinstance(data, dict):
+            raise TypeError(f"expected an object, got {type(data).__name__}")
+
+        content = data.get("content", "")
+        if isinstance(content, dict):
+            content = json.dumps(content, indent=2)
+        elif not isinstance(content, str):
+            content = str(content)
+        
+        # Handle reasoning field
+        reasoning = data.get("reasoning", "")
+        if isinstance(reasoning, list):
+            reasoning = ". ".join(str(r) for r in reasoning)
+        elif not isinstance(reasoning, str):
+            reasoning = str(reasoning)
+        
+        # Handle suggestions field
+        suggestions = data.get("suggestions", [])
+        if isinstance(suggestions, dict):
+            # Convert dict suggestions to list of strings
+            suggestions = [f"{k}: {v}" for k, v in suggestions.items()]
+        elif not isinstance(suggestions, list):
+            suggestions = [str(suggestions)]
+        
+        # Ensure all suggestion items are strings
+        suggestions = [str(s) for s in suggestions]
+        
+        confidence = data.get("confidence")
+        if confidence is None:
+            if data.get("metadata", {}).get("early_exit"):
+                raise ValueError("early-exit response stopped before its confidence arrived")
+            confidence = 0.5
+
+        return AgentResponse(
+            content=content,
+            confidence=float(confidence),
+            reasoning=reasoning,
+            suggestions=suggestions,
+            escalation_needed=bool(data.get("escalation_needed", False)),
+            metadata=data.get("metadata", {})
+        )
+
+
+def _pipeline(pipeline):
+    """Time and trace an orchestrator pipeline, short-circuiting it when the LLM breaker opens
+
+    While the breaker is open the pipeline stops at its next stage instead of
+    chaining more failing calls, and CircuitOpenError reaches the caller.
+    """
+    name = pipeline.__name__.removeprefix("process_").removesuffix("_request")
+
+    @functools.wraps(pipeline)
+    async def wrapper(self, *args, **kwargs):
+        token = current_pipeline.set(name)
+        outcome = "error"
+        start = time.perf_counter()
+        with tracer.start_as_current_span(f"pipeline {name}", attributes={"kyoryoku.pipeline": name}) as span:
+            try:
+                result = await pipeline(self, *args, **kwargs)
+                outcome = "ok"
+                return result
+            except CircuitOpenError as e:
+                outcome = "short_circuited"
+                logger.warning(f"{pipeline.__name__} short-circuited: {e}")
+                progress = kwargs.get("progress")
+                if progress:
+                    progress("pipeline_short_circuited", {"retry_after_seconds": round(e.retry_after, 2)})
+                raise
+            finally:
+                span.set_attribute("kyoryoku.outcome", outcome)
+                PIPELINE_SECONDS.labels(name, outcome).observe(time.perf_counter() - start)
+                current_pipeline.reset(token)
+
+    return wrapper
+
 
 class MultiAgentOrchestrator:
     """Orchestrates multiple agents working together"""
     
     def __init__(self, llm_service: LLMService):
         self.llm_service = llm_service
+
+    @staticmethod
+    def _triage_escalates(fields: Dict[str, Any]) -> bool:
+        """True when the streamed decision fields already route triage to escalation"""
+        confidence = fields.get("confidence")
+        return fields.get("escalation_needed") is True or (
+            isinstance(confidence, (int, float)) and confidence < 0.6
+        )
+
+    async def _run_stage(
+        self,
+        progress: Optional[ProgressCallback],
+        stage: str,
+        **agent_request
+    ) -> AgentResponse:
+        """Run one pipeline stage, reporting its start and result"""
+        agent_type = agent_request["agent_type"]
+        breaker = self.llm_service.breaker
+        breaker.check()
+        if progress:
+            progress("stage_started", {"stage": stage, "agent_type": agent_type})
+
+        pipeline = current_pipeline.get()
+        start = time.perf_counter()
+        with tracer.start_as_current_span(f"stage {stage}", attributes={
+            "kyoryoku.pipeline": pipeline,
+            "kyoryoku.stage": stage,
+            "kyoryoku.agent_type": agent_type
+        }) as span:
+            response = await self.llm_service.process_agent_request(**agent_request)
+            span.set_attribute("kyoryoku.confidence", response.confidence)
+            span.set_attribute("kyoryoku.escalation_needed", response.escalation_needed)
+            span.set_attribute("kyoryoku.early_exit", bool(response.metadata.get("early_exit")))
+        # Iterated stages ("iteration_2.voice") share one label per stage
+        PIPELINE_STAGE_SECONDS.labels(pipeline, stage.rsplit(".", 1)[-1]).observe(
+            time.perf_counter() - start
+        )
+        if response.metadata.get("circuit_open"):
+            raise CircuitOpenError(breaker.name, response.metadata["retry_after_seconds"])
+
+        if progress:
+            progress("stage_finished", {
+                "stage": stage,
+                "agent_type": agent_type,
+                "response": response.dict()
+            })
+        return response
     
+    @_pipeline
     async def process_customer_support_request(
         self,
         request: str,
-        customer_context: Dict[str, Any] = None
+        customer_context: Dict[str, Any] = None,
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """Process a customer support request through the multi-agent pipeline"""
         
@@ -439,19 +546,25 @@ class MultiAgentOrchestrator:
         pipeline_results = {}
         
         # Step 1: Triage
-        triage_response = await self.llm_service.process_agent_request(
+        triage_response = await self._run_stage(
+            progress,
+            "triage",
             agent_type="triage_specialist",
             task=f"Triage this customer support request: {request}",
             context=customer_context,
             capabilities=["categorize_issues", "identify_urgency", "route_appropriately"],
             goals=["Categorize incoming requests accurately", "Identify urgent issues requiring immediate attention"],
-            constraints=["Must escalate if unsure about urgency", "Follow established routing rules"]
+            constraints=["Must escalate if unsure about urgency", "Follow established routing rules"],
+            stop_when=self._triage_escalates
         )
         pipeline_results["triage"] = triage_response
         
-        # If confidence is too low, escalate immediately
+        # If confidence is too low, escalate immediately; triage stops
+        # generating as soon as it has streamed that decision
         if triage_response.confidence < 0.6 or triage_response.escalation_needed:
-            escalation_response = await self.llm_service.process_agent_request(
+            escalation_response = await self._run_stage(
+                progress,
+                "escalation",
                 agent_type="escalation_analyst",
                 task=f"Analyze escalation need for: {request}",
                 context={**customer_context, "triage_result": triage_response.dict()},
@@ -463,7 +576,9 @@ class MultiAgentOrchestrator:
             return pipeline_results
         
         # Step 2: Solution Research
-        research_response = await self.llm_service.process_agent_request(
+        research_response = await self._run_stage(
+            progress,
+            "research",
             agent_type="solution_researcher",
             task=f"Find solution for: {request}",
             context={**customer_context, "triage_result": triage_response.dict()},
@@ -480,7 +595,9 @@ class MultiAgentOrchestrator:
             "research_result": research_response.dict()
         }
         
-        crafting_response = await self.llm_service.process_agent_request(
+        crafting_response = await self._run_stage(
+            progress,
+            "response",
             agent_type="response_crafter",
             task=f"Craft customer response for: {request}",
             context=response_context,
@@ -498,7 +615,9 @@ class MultiAgentOrchestrator:
         )
         
         if overall_confidence < 0.8:
-            escalation_response = await self.llm_service.process_agent_request(
+            escalation_response = await self._run_stage(
+                progress,
+                "escalation",
                 agent_type="escalation_analyst",
                 task=f"Review overall confidence for: {request}",
                 context=response_context,
@@ -510,12 +629,14 @@ class MultiAgentOrchestrator:
         
         return pipeline_results
 
+    @_pipeline
     async def process_content_creation_request(
         self,
         source_material: str,
         content_type: str = "blog_post",
         target_audience: str = "business_professionals",
-        iterations: int = 2
+        iterations: int = 2,
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """Process content creation through iterative refinement pipeline"""
         
@@ -533,7 +654,9 @@ class MultiAgentOrchestrator:
             iteration_results[f"iteration_{iteration + 1}"] = {}
             
             # Round 1: Story Mining
-            story_response = await self.llm_service.process_agent_request(
+            story_response = await self._run_stage(
+                progress,
+                f"iteration_{iteration + 1}.story_mining",
                 agent_type="story_miner",
                 task=f"Extract compelling narratives from this material: {current_content}",
                 context={**content_context, "iteration": iteration + 1},
@@ -545,7 +668,9 @@ class MultiAgentOrchestrator:
             current_content = story_response.content
             
             # Round 2: Structure Architecture  
-            structure_response = await self.llm_service.process_agent_request(
+            structure_response = await self._run_stage(
+                progress,
+                f"iteration_{iteration + 1}.structure",
                 agent_type="structure_architect",
                 task=f"Organize this content into compelling narrative flow: {current_content}",
                 context={**content_context, "iteration": iteration + 1, "story_mining_result": story_response.dict()},
@@ -557,7 +682,9 @@ class MultiAgentOrchestrator:
             current_content = structure_response.content
             
             # Round 3: Technical Translation
-            translation_response = await self.llm_service.process_agent_request(
+            translation_response = await self._run_stage(
+                progress,
+                f"iteration_{iteration + 1}.translation",
                 agent_type="technical_translator",
                 task=f"Simplify complex concepts for {target_audience}: {current_content}",
                 context={**content_context, "iteration": iteration + 1, "structure_result": structure_response.dict()},
@@ -569,7 +696,9 @@ class MultiAgentOrchestrator:
             current_content = translation_response.content
             
             # Round 4: Voice Crafting
-            voice_response = await self.llm_service.process_agent_request(
+            voice_response = await self._run_stage(
+                progress,
+                f"iteration_{iteration + 1}.voice",
                 agent_type="voice_crafter",
                 task=f"Enhance authentic voice and tone: {current_content}",
                 context={**content_context, "iteration": iteration + 1, "translation_result": translation_response.dict()},
@@ -581,7 +710,9 @@ class MultiAgentOrchestrator:
             current_content = voice_response.content
             
             # Round 5: Hook Design
-            hook_response = await self.llm_service.process_agent_request(
+            hook_response = await self._run_stage(
+                progress,
+                f"iteration_{iteration + 1}.hooks",
                 agent_type="hook_designer",
                 task=f"Create engaging hooks and maintain momentum: {current_content}",
                 context={**content_context, "iteration": iteration + 1, "voice_result": voice_response.dict()},
@@ -626,12 +757,14 @@ class MultiAgentOrchestrator:
         
         return final_result
 
+    @_pipeline
     async def process_content_marketing_request(
         self,
         request: str,
         target_audience: str = "business_professionals",
         content_type: str = "blog_post",
-        brand_context: Dict[str, Any] = None
+        brand_context: Dict[str, Any] = None,
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """Process content marketing request through 2-agent prototype team"""
         
@@ -645,7 +778,9 @@ class MultiAgentOrchestrator:
         }
         
         # Step 1: Content Strategy
-        strategy_response = await self.llm_service.process_agent_request(
+        strategy_response = await self._run_stage(
+            progress,
+            "strategy",
             agent_type="content_strategist",
             task=f"Create content strategy for: {request}",
             context=content_context,
@@ -660,7 +795,9 @@ class MultiAgentOrchestrator:
             "strategy_result": strategy_response.dict()
         }
         
-        production_response = await self.llm_service.process_agent_request(
+        production_response = await self._run_stage(
+            progress,
+            "production",
             agent_type="content_producer",
             task=f"Create content based on strategy: {request}",
             context=production_context,
@@ -686,11 +823,13 @@ class MultiAgentOrchestrator:
             }
         }
 
+    @_pipeline
     async def process_guest_concierge_request(
         self,
         guest_request: str,
         guest_context: Dict[str, Any] = None,
-        location: str = "city_center"
+        location: str = "city_center",
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """Process guest concierge request through 2-agent team"""
         
@@ -703,7 +842,9 @@ class MultiAgentOrchestrator:
         }
         
         # Step 1: Guest Experience Analysis
-        experience_response = await self.llm_service.process_agent_request(
+        experience_response = await self._run_stage(
+            progress,
+            "experience_analysis",
             agent_type="guest_experience_agent",
             task=f"Analyze guest needs and recommend experiences: {guest_request}",
             context=concierge_context,
@@ -718,7 +859,9 @@ class MultiAgentOrchestrator:
             "experience_recommendations": experience_response.dict()
         }
         
-        coordination_response = await self.llm_service.process_agent_request(
+        coordination_response = await self._run_stage(
+            progress,
+            "coordination_plan",
             agent_type="concierge_coordinator",
             task=f"Coordinate arrangements for guest experience: {guest_request}",
             context=coordination_context,
@@ -0,0 +1,196 @@
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+STACK_DEPTH = 20  # innermost frames kept per blocked-loop stack
+LAG_WINDOW = 1200  # heartbeats kept for the lag percentiles
+
+
+class LagWindow:
+    """Heartbeat lag seen while a window is open, e.g. for one profiled request
+
+    Lag is loop-wide: a stall caused by a concurrent request shows up here
+    too, which is exactly what a slow request waiting on the loop feels.
+    """
+
+    __slots__ = ("threshold", "ticks", "max_lag", "blocked", "stalls")
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.ticks = 0
+        self.max_lag = 0.0
+        self.blocked = 0.0
+        self.stalls = 0
+
+    def observe(self, lag: float):
+        self.ticks += 1
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self.threshold:
+            self.stalls += 1
+            self.blocked += lag
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "blocked_ms": round(self.blocked * 1000, 2),
+            "stalls": self.stalls
+        }
+
+
+class EventLoopMonitor:
+    """Measures event-loop lag and catches whatever blocks the loop
+
+    A heartbeat coroutine sleeps for interval and records how late it wakes.
+    A watchdog thread notices when the heartbeat has been silent for longer
+    than threshold and captures the loop thread's stack while it is still
+    blocked, so the log names the synchronous code responsible rather than
+    whatever runs next.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.LOOP_MONITOR_INTERVAL_SECONDS,
+        threshold: float = settings.LOOP_MONITOR_BLOCK_THRESHOLD_SECONDS,
+        recent_blocks: int = settings.LOOP_MONITOR_RECENT_BLOCKS
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocks = 0
+        self.blocked_seconds = 0.0
+        self._lags: deque = deque(maxlen=LAG_WINDOW)
+        self._recent: deque = deque(maxlen=recent_blocks)
+        self._lock = threading.Lock()
+        self._last_beat = time.perf_counter()
+        self._expected_beat = self._last_beat
+        self._beats = 0
+        self._reported_beat = -1
+        self._current: Optional[Dict[str, Any]] = None
+        self._windows: Set[LagWindow] = set()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    async def _heartbeat(self):
+        while True:
+            expected = self._expected_beat = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            with self._lock:
+                self._last_beat = now
+                self._beats += 1
+                self._lags.append(lag)
+                block, self._current = self._current, None
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+            for window in self._windows:
+                window.observe(lag)
+            if block is not None:
+                block["duration_ms"] = round(lag * 1000, 1)
+                self.blocked_seconds += lag
+                logger.warning(f"Event loop was blocked for {block['duration_ms']}ms (detected at {block['detected_at']})")
+
+    def _watch(self):
+        while not self._stopping.wait(self.threshold / 4):
+            with self._lock:
+                silent = time.perf_counter() - self._last_beat - self.interval
+                if silent < self.threshold or self._reported_beat == self._beats:
+                    continue
+                self._reported_beat = self._beats
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = traceback.format_stack(frame, limit=STACK_DEPTH) if frame is not None else []
+            block = {
+                "detected_at": datetime.utcnow().isoformat(),
+                "duration_ms": None,  # filled in when the loop wakes up
+                "stack": [line.rstrip() for line in stack]
+            }
+            with self._lock:
+                if self._reported_beat == self._beats:
+                    self._current = block
+                else:
+                    block["duration_ms"] = round(silent * 1000, 1)  # woke up while we looked
+                self._recent.append(block)
+                self.blocks += 1
+            EVENT_LOOP_BLOCKS.inc()
+            logger.warning(
+                f"Event loop blocked for over {silent * 1000:.0f}ms; loop thread stack:\n" + "".join(stack)
+            )
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await asyncio.to_thread(self._watchdog.join)
+        self._watchdog = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def open_window(self) -> LagWindow:
+        """Start collecting heartbeat lag into a new window"""
+        window = LagWindow(self.threshold)
+        self._windows.add(window)
+        return window
+
+    def close_window(self, window: LagWindow) -> Dict[str, Any]:
+        self._windows.discard(window)
+        if self.running:
+            # A heartbeat the loop was too blocked to run is lag all the same
+            overdue = time.perf_counter() - self._expected_beat
+            if overdue >= window.threshold:
+                window.observe(overdue)
+        return {**window.summary(), "monitored": self.running}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lags = sorted(self._lags)
+            recent: List[Dict[str, Any]] = [dict(block) for block in self._recent]
+            blocked_now = self._current is not None
+
+        def percentile(q: float) -> float:
+            return round(lags[min(len(lags) - 1, int(q * len(lags)))] * 1000, 2) if lags else 0.0
+
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "lag_ms": {"p50": percentile(0.5), "p99": percentile(0.99), "max": percentile(1.0), "samples": len(lags)},
+            "blocks": self.blocks,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "blocked_now": blocked_now,
+            "recent_blocks": recent[::-1]
+        }
+
+
+# Global instance
+loop_monitor = EventLoopMonitor()
@@ -0,0 +1,254 @@
+from sqlalchemy import text
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime, timedelta
+import asyncio
+import json
+import logging
+import os
+import re
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.message import Message, MessageType
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r"^messages_y(\d{4})m(\d{2})$")
+
+ARCHIVE_COLUMNS = [
+    "id", "session_id", "sender_id", "recipient_id", "message_type", "content",
+    "message_metadata", "timestamp", "is_suggestion", "human_approved", "learning_confidence"
+]
+JSON_COLUMNS = {"message_metadata", "learning_confidence"}
+UUID_COLUMNS = {"id", "session_id", "sender_id", "recipient_id"}
+
+EXPORT_BATCH_SIZE = 10_000
+
+
+def _month_start(year: int, month: int) -> datetime:
+    # Normalise month overflow/underflow, e.g. (2026, 13) -> 2027-01
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1)
+
+
+def _partition_name(month: datetime) -> str:
+    return f"messages_y{month.year:04d}m{month.month:02d}"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.dataset
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("Message archival requires pyarrow (pip install pyarrow)")
+
+
+class MessageArchiveService:
+    """Monthly partitions of the messages table and their cold Parquet archive
+
+    Hot messages live in monthly range partitions. Once a partition is older
+    than the retention window it is exported to a zstd-compressed Parquet
+    file and dropped; reads for archived sessions fall back to those files.
+    """
+
+    def __init__(self, archive_dir: str, retention_days: int):
+        self.archive_dir = archive_dir
+        self.retention_days = retention_days
+        self._warned_unpartitioned = False
+
+    @property
+    def partitioning_enabled(self) -> bool:
+        return engine.dialect.name == "postgresql"
+
+    async def _messages_partitioned(self, conn) -> bool:
+        """False when messages is a plain table, e.g. made by create_all before migration c81d4e6f2a90"""
+        partitioned = await conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('messages'))"
+        ))
+        if not partitioned and not self._warned_unpartitioned:
+            logger.warning("messages is not a partitioned table; run the migrations to enable retention")
+            self._warned_unpartitioned = True
+        return bool(partitioned)
+
+    def archive_cutoff(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Sessions created before this may have archived messages; None without retention"""
+        if self.retention_days <= 0:
+            return None
+        return (now or datetime.utcnow()) - timedelta(days=self.retention_days)
+
+    async def ensure_partitions(self, now: Optional[datetime] = None):
+        """Create the default partition and monthly partitions ahead of time
+
+        Each month is created in its own transaction, so one month cannot
+        hold back the others. A month whose rows already sit in the default
+        partition (written while its partition was missing) is split out by
+        moving those rows into it.
+        """
+        if not self.partitioning_enabled:
+            return
+
+        now = now or datetime.utcnow()
+        async with engine.begin() as conn:
+            if not await self._messages_partitioned(conn):
+                return
+            await conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS messages_default PARTITION OF messages DEFAULT"
+            ))
+        for offset in range(settings.MESSAGE_PARTITION_PREMAKE_MONTHS + 1):
+            await self._ensure_partition(_month_start(now.year, now.month + offset))
+
+    async def _ensure_partition(self, start: datetime):
+        name = _partition_name(start)
+        end = _month_start(start.year, start.month + 1)
+        bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        in_month = f"timestamp >= '{start.isoformat()}' AND timestamp < '{end.isoformat()}'"
+
+        async with engine.begin() as conn:
+            if await conn.scalar(text(f"SELECT to_regclass('{name}') IS NOT NULL")):
+                return
+            # Creating or attaching the month scans the default partition anyway;
+            # locking it first stops new rows for the month landing there meanwhile
+            await conn.execute(text("LOCK TABLE messages_default IN ACCESS EXCLUSIVE MODE"))
+            if not await conn.scalar(text(f"SELECT EXISTS (SELECT 1 FROM messages_default WHERE {in_month})")):
+                await conn.execute(text(f"CREATE TABLE {name} PARTITION OF messages {bounds}"))
+                return
+
+            await conn.execute(text(f"CREATE TABLE {name} (LIKE messages INCLUDING DEFAULTS)"))
+            moved = await conn.execute(text(
+                f"WITH moved AS (DELETE FROM messages_default WHERE {in_month} RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ))
+            await conn.execute(text(f"ALTER TABLE messages ATTACH PARTITION {name} {bounds}"))
+        logger.warning(f"Created message partition {name} late; moved {moved.rowcount} rows out of messages_default")
+
+    async def list_partitions(self) -> List[str]:
+        """Monthly partitions currently attached to messages, oldest first"""
+        async with engine.connect() as conn:
+            result = await conn.execute(text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = 'messages'"
+            ))
+            return sorted(name for (name,) in result if PARTITION_NAME.match(name))
+
+    async def archive_expired_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """Export and drop every partition that ends before the retention cutoff"""
+        if not self.partitioning_enabled or self.retention_days <= 0:
+            return []
+
+        now = now or datetime.utcnow()
+        cutoff = now.timestamp() - self.retention_days * 24 * 60 * 60
+        archived = []
+        for name in await self.list_partitions():
+            year, month = (int(part) for part in PARTITION_NAME.match(name).groups())
+            if _month_start(year, month + 1).timestamp() > cutoff:
+                continue
+            await self._export_partition(name)
+            async with engine.begin() as conn:
+                await conn.execute(text(f"ALTER TABLE messages DETACH PARTITION {name}"))
+                await conn.execute(text(f"DROP TABLE {name}"))
+            logger.info(f"Archived message partition {name}")
+            archived.append(name)
+        return archived
+
+    async def _export_partition(self, name: str):
+        """Stream a partition into a Parquet file, written atomically"""
+        pa = _require_pyarrow()
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{name}.parquet")
+        tmp_path = f"{path}.tmp"
+
+        writer = None
+        try:
+            async with engine.connect() as conn:
+                result = await conn.stream(text(
+                    f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM {name} ORDER BY session_id, timestamp"
+                ))
+                async for rows in result.partitions(EXPORT_BATCH_SIZE):
+                    # Building and compressing a batch is CPU-bound; keep it off the loop
+                    writer = await asyncio.to_thread(self._write_batch, pa, writer, tmp_path, rows)
+        finally:
+            if writer is not None:
+                await asyncio.to_thread(writer.close)
+        # Empty partitions leave nothing to archive
+        if writer is not None:
+            os.replace(tmp_path, path)
+
+    def _write_batch(self, pa, writer, path: str, rows):
+        table = pa.Table.from_pylist(
+            [self._to_archive_row(row._mapping) for row in rows],
+            schema=self._archive_schema(pa)
+        )
+        if writer is None:
+            writer = pa.parquet.ParquetWriter(path, table.schema, compression="zstd")
+        writer.write_table(table)
+        return writer
+
+    @staticmethod
+    def _archive_schema(pa):
+        return pa.schema([
+            (column, pa.timestamp("us") if column == "timestamp" else pa.string())
+            for column in ARCHIVE_COLUMNS
+        ])
+
+    @staticmethod
+    def _to_archive_row(mapping) -> dict:
+        row = {}
+        for column in ARCHIVE_COLUMNS:
+            value = mapping[column]
+            if column in JSON_COLUMNS:
+                value = json.dumps(value) if value is not None else None
+            elif column in UUID_COLUMNS:
+                value = str(value) if value is not None else None
+            row[column] = value
+        # Raw SQL returns the enum label, i.e. the member name
+        row["message_type"] = str(mapping["message_type"])
+        return row
+
+    def has_archive(self) -> bool:
+        return os.path.isdir(self.archive_dir) and any(
+            name.endswith(".parquet") for name in os.listdir(self.archive_dir)
+        )
+
+    async def read_session_messages(self, session_id: UUID) -> List[Message]:
+        """Load a session's archived messages as detached Message objects"""
+        if not self.has_archive():
+            return []
+        return await asyncio.to_thread(self._read_session_messages, str(session_id))
+
+    def _read_session_messages(self, session_id: str) -> List[Message]:
+        pa = _require_pyarrow()
+        dataset = pa.dataset.dataset(self.archive_dir, format="parquet")
+        table = dataset.to_table(filter=pa.dataset.field("session_id") == session_id)
+
+        messages = []
+        for row in table.to_pylist():
+            for column in JSON_COLUMNS:
+                row[column] = json.loads(row[column]) if row[column] is not None else {}
+            for column in UUID_COLUMNS:
+                row[column] = UUID(row[column]) if row[column] is not None else None
+            row["message_type"] = MessageType[row["message_type"]]
+            messages.append(Message(**row))
+        return sorted(messages, key=lambda message: message.timestamp)
+
+    async def run_forever(self):
+        """Keep partitions ahead of time and archive expired ones"""
+        while True:
+            try:
+                await self.ensure_partitions()
+                await self.archive_expired_partitions()
+            except Exception as e:
+                logger.error(f"Message retention run failed: {e}")
+            await asyncio.sleep(settings.MESSAGE_ARCHIVE_INTERVAL_SECONDS)
+
+
+# Global instance
+message_archive_service = MessageArchiveService(
+    archive_dir=settings.MESSAGE_ARCHIVE_DIR,
+    retention_days=settings.MESSAGE_RETENTION_DAYS
+)
@@ -0,0 +1,130 @@
+from pathlib import Path
+from string import Formatter
+from typing import Dict, Optional, Sequence, Tuple
+import functools
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+TEMPLATE_FIELDS = frozenset({"capabilities", "goals", "constraints"})
+DEFAULT_AGENT_TYPE = "triage_specialist"
+
+
+class PromptTemplate:
+    """One agent's system prompt template, identified by a content hash"""
+
+    __slots__ = ("agent_type", "text", "version", "mtime")
+
+    def __init__(self, agent_type: str, text: str, mtime: float):
+        self.agent_type = agent_type
+        self.text = text
+        self.version = f"{agent_type}@{hashlib.sha256(text.encode()).hexdigest()[:12]}"
+        self.mtime = mtime
+
+        unknown = {name for _, name, _, _ in Formatter().parse(text) if name} - TEMPLATE_FIELDS
+        if unknown:
+            raise ValueError(f"Prompt {agent_type} uses unknown placeholders: {sorted(unknown)}")
+
+
+class PromptRegistry:
+    """System prompt templates loaded from app/prompts/<agent_type>.txt
+
+    Templates are read once and reloaded when their files change; the check
+    runs at most every reload_interval seconds (0 disables it). Rendered
+    prompts are memoized by version, so an edited template never serves a
+    stale render.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        reload_interval: float,
+        cache_size: int,
+        suffix: str = ""
+    ):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.suffix = suffix
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._checked_at = 0.0
+        self._render = functools.lru_cache(maxsize=cache_size)(self._render_uncached)
+        self.reload()
+
+    def _scan(self) -> Dict[str, float]:
+        return {path.stem: path.stat().st_mtime for path in self.directory.glob("*.txt")}
+
+    def reload(self) -> Dict[str, str]:
+        """Load new or changed templates; returns agent type -> version"""
+        templates = {}
+        for agent_type, mtime in self._scan().items():
+            current = self._templates.get(agent_type)
+            if current is not None and current.mtime == mtime:
+                templates[agent_type] = current
+                continue
+            text = (self.directory / f"{agent_type}.txt").read_text(encoding="utf-8").rstrip()
+            try:
+                templates[agent_type] = PromptTemplate(agent_type, text, mtime)
+            except ValueError as e:
+                # Keep serving the last good version of a broken edit
+                logger.error(str(e))
+                if current is not None:
+                    templates[agent_type] = current
+                continue
+            if current is not None:
+                logger.info(f"Reloaded prompt {templates[agent_type].version} (was {current.version})")
+
+        if DEFAULT_AGENT_TYPE not in templates:
+            raise RuntimeError(f"No {DEFAULT_AGENT_TYPE} prompt in {self.directory}")
+        self._templates = templates
+        self._checked_at = time.monotonic()
+        return self.versions()
+
+    def _reload_if_due(self):
+        if self.reload_interval <= 0 or time.monotonic() - self._checked_at < self.reload_interval:
+            return
+        try:
+            self.reload()
+        except (OSError, RuntimeError) as e:
+            logger.error(f"Prompt reload failed, keeping loaded templates: {e}")
+            self._checked_at = time.monotonic()
+
+    def get(self, agent_type: str) -> PromptTemplate:
+        """Template for agent_type, falling back to the triage prompt"""
+        self._reload_if_due()
+        return self._templates.get(agent_type) or self._templates[DEFAULT_AGENT_TYPE]
+
+    def versions(self) -> Dict[str, str]:
+        return {agent_type: template.version for agent_type, template in sorted(self._templates.items())}
+
+    def render(
+        self,
+        agent_type: str,
+        capabilities: Sequence[str],
+        goals: Sequence[str],
+        constraints: Sequence[str]
+    ) -> Tuple[str, str]:
+        """Return (system prompt, prompt version)"""
+        template = self.get(agent_type)
+        prompt = self._render(template.version, tuple(capabilities), tuple(goals), tuple(constraints))
+        return prompt, template.version
+
+    def _render_uncached(
+        self,
+        version: str,
+        capabilities: Tuple[str, ...],
+        goals: Tuple[str, ...],
+        constraints: Tuple[str, ...]
+    ) -> str:
+        template = self._templates[version.split("@", 1)[0]]
+        return template.text.format(
+            capabilities=", ".join(capabilities),
+            goals="; ".join(goals),
+            constraints="; ".join(constraints)
+        ) + self.suffix
+
+    def cache_info(self) -> Dict[str, Optional[int]]:
+        info = self._render.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
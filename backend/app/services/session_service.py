@@ -1,19 +1,42 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete
 from sqlalchemy.orm import selectinload
 from typing import List, Optional, Dict, Any
+from datetime import datetime
 from uuid import UUID
 import logging
 
+from app.core.circuit_breaker import CircuitOpenError
 from app.models.session import Session, SessionStatus
 from app.models.team import Team
 from app.models.agent import Agent
 from app.models.message import Message, MessageType
-from app.schemas.session import SessionCreate, SessionUpdate
+from app.schemas.session import SessionCreate, SessionUpdate, SessionResponse, SessionStatusResponse
+from app.services.admission_service import admission_controller, is_critical
 from app.services.llm_service import llm_service, orchestrator
+from app.services.team_cache import team_composition_cache
+from app.services.message_archive_service import message_archive_service
+from app.services.event_service import event_publisher, ProgressCallback
+from app.services.fair_scheduler import tenant_scope
 
 logger = logging.getLogger(__name__)
 
+# Columns served by summary reads (everything SessionResponse needs)
+SESSION_SUMMARY_COLUMNS = (
+    Session.id,
+    Session.team_id,
+    Session.task_description,
+    Session.status,
+    Session.user_id,
+    Session.scenario_type,
+    Session.learning_phase,
+    Session.metrics,
+    Session.configuration,
+    Session.start_time,
+    Session.end_time,
+    Session.created_at,
+)
+
 
 class SessionService:
     def __init__(self, db: AsyncSession):
@@ -45,20 +68,46 @@ class SessionService:
         )
         return result.scalar_one_or_none()
 
-    async def list_sessions(self, skip: int = 0, limit: int = 100) -> List[Session]:
+    async def get_session_summary(self, session_id: UUID) -> Optional[SessionResponse]:
+        """Get session columns only, without loading the team graph
+
+        Returns a SessionResponse rather than a Session: the row is a column
+        projection, so it has no relationships to lazy-load by mistake.
+        """
+        result = await self.db.execute(
+            select(*SESSION_SUMMARY_COLUMNS).where(Session.id == session_id)
+        )
+        row = result.one_or_none()
+        return SessionResponse.model_validate(row) if row else None
+
+    async def get_session_status(self, session_id: UUID) -> Optional[SessionStatusResponse]:
+        """Get just the fields a status poll needs"""
+        result = await self.db.execute(
+            select(Session.id, Session.status, Session.start_time, Session.end_time)
+            .where(Session.id == session_id)
+        )
+        row = result.one_or_none()
+        return SessionStatusResponse.model_validate(row) if row else None
+
+    async def list_sessions(self, skip: int = 0, limit: int = 100) -> List[SessionResponse]:
         """List all sessions with pagination"""
         result = await self.db.execute(
-            select(Session)
-            .options(selectinload(Session.team))
+            select(*SESSION_SUMMARY_COLUMNS)
             .offset(skip)
             .limit(limit)
             .order_by(Session.created_at.desc())
         )
-        return result.scalars().all()
+        return [SessionResponse.model_validate(row) for row in result]
+
+    async def _get_session_for_update(self, session_id: UUID) -> Optional[Session]:
+        result = await self.db.execute(
+            select(Session).where(Session.id == session_id)
+        )
+        return result.scalar_one_or_none()
 
     async def update_session(self, session_id: UUID, session_data: SessionUpdate) -> Optional[Session]:
         """Update an existing session"""
-        session = await self.get_session(session_id)
+        session = await self._get_session_for_update(session_id)
         if not session:
             return None
 
@@ -70,26 +119,99 @@ class SessionService:
         await self.db.refresh(session)
         return session
 
+    async def delete_session(self, session_id: UUID) -> bool:
+        """Delete a session; its messages go with it via ON DELETE CASCADE"""
+        result = await self.db.execute(
+            delete(Session).where(Session.id == session_id).returning(Session.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def purge_sessions(
+        self,
+        session_ids: Optional[List[UUID]] = None,
+        older_than: Optional[datetime] = None,
+        statuses: Optional[List[SessionStatus]] = None,
+        chunk_size: int = 500
+    ) -> int:
+        """Delete matching sessions in chunks, committing after each chunk
+
+        Each chunk is one set-based DELETE, so locks and WAL stay bounded no
+        matter how many sessions or messages match.
+        """
+        conditions = []
+        if session_ids is not None:
+            conditions.append(Session.id.in_(session_ids))
+        if older_than is not None:
+            conditions.append(Session.created_at < older_than)
+        if statuses:
+            conditions.append(Session.status.in_(statuses))
+        if not conditions:
+            raise ValueError("Refusing to purge sessions without a filter")
+
+        purged = 0
+        while True:
+            chunk = (
+                select(Session.id)
+                .where(*conditions)
+                .limit(chunk_size)
+                .scalar_subquery()
+            )
+            result = await self.db.execute(
+                delete(Session)
+                .where(Session.id.in_(chunk))
+                .returning(Session.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted = len(result.all())
+            await self.db.commit()
+
+            purged += deleted
+            if deleted < chunk_size:
+                return purged
+
     async def start_session(self, session_id: UUID) -> Optional[Session]:
         """Start a session and begin processing"""
-        session = await self.get_session(session_id)
+        session = await self._get_session_for_update(session_id)
         if not session:
             return None
 
+        configuration = session.configuration or {}
+        customer_context = configuration.get("customer_context", {})
+        tenant = str(session.user_id) if session.user_id else None
+        with tenant_scope(tenant, configuration.get("traffic_class")):
+            async with admission_controller.slot(critical=is_critical(customer_context)):
+                return await self._run_session(session)
+
+    async def _run_session(self, session: Session) -> Session:
+        """Run the session's pipeline; the caller holds an admission slot"""
         session.status = SessionStatus.RUNNING
         await self.db.flush()
 
+        progress = event_publisher.for_session(session.id)
+        progress("pipeline_started", {
+            "session_id": str(session.id),
+            "scenario_type": session.scenario_type
+        })
+
         # If this is a customer support scenario, use the multi-agent orchestrator
         if session.scenario_type == "customer_support":
-            await self._process_customer_support_session(session)
+            await self._process_customer_support_session(session, progress)
         else:
             # For other scenarios, use individual agents
-            await self._process_generic_session(session)
+            await self._process_generic_session(session, progress)
 
+        # Persist the final status/metrics before reloading server-side values
+        await self.db.flush()
         await self.db.refresh(session)
+
+        progress("pipeline_done", {
+            "session_id": str(session.id),
+            "status": session.status.name,
+            "metrics": session.metrics
+        })
         return session
 
-    async def _process_customer_support_session(self, session: Session):
+    async def _process_customer_support_session(self, session: Session, progress: ProgressCallback):
         """Process a customer support session using the multi-agent orchestrator"""
         try:
             # Get customer context from session configuration
@@ -98,7 +220,8 @@ class SessionService:
             # Use the orchestrator to process the request
             results = await orchestrator.process_customer_support_request(
                 request=session.task_description,
-                customer_context=customer_context
+                customer_context=customer_context,
+                progress=progress
             )
 
             # Save each agent's response as a message
@@ -128,15 +251,32 @@ class SessionService:
                 session.status = SessionStatus.COMPLETED
                 session.metrics["requires_human_review"] = False
 
+        except CircuitOpenError as e:
+            # The agents are unavailable; hand the request to a human instead
+            await self._save_agent_message(
+                session_id=session.id,
+                agent_type="escalation",
+                content="Our AI agents are temporarily unavailable. This request has been routed to a human specialist.",
+                confidence=0.0,
+                reasoning="LLM circuit breaker is open; the pipeline was skipped",
+                escalation_needed=True
+            )
+            session.status = SessionStatus.COMPLETED
+            session.metrics = {
+                "circuit_open": True,
+                "retry_after_seconds": round(e.retry_after, 2),
+                "requires_human_review": True
+            }
+
         except Exception as e:
             logger.error(f"Error processing customer support session {session.id}: {e}")
             session.status = SessionStatus.FAILED
             session.metrics = {"error": str(e)}
 
-    async def _process_generic_session(self, session: Session):
+    async def _process_generic_session(self, session: Session, progress: ProgressCallback):
         """Process a generic session using team agents individually"""
         try:
-            team_agents = session.team.agents if session.team else []
+            team_agents = await team_composition_cache.get(self.db, session.team_id)
             
             if not team_agents:
                 session.status = SessionStatus.FAILED
@@ -145,6 +285,8 @@ class SessionService:
 
             agent_responses = []
             for agent in team_agents:
+                stage = {"stage": str(agent.id), "agent_type": agent.template_type}
+                progress("stage_started", stage)
                 try:
                     # Process task with individual agent
                     response = await llm_service.process_agent_request(
@@ -157,6 +299,7 @@ class SessionService:
                     )
 
                     agent_responses.append(response)
+                    progress("stage_finished", {**stage, "response": response.dict()})
                     
                     # Save agent message
                     await self._save_agent_message(
@@ -171,6 +314,7 @@ class SessionService:
 
                 except Exception as e:
                     logger.error(f"Error processing with agent {agent.id}: {e}")
+                    progress("stage_finished", {**stage, "error": str(e)})
                     await self._save_agent_message(
                         session_id=session.id,
                         agent_id=agent.id,
@@ -225,13 +369,29 @@ class SessionService:
         await self.db.flush()
 
     async def get_session_messages(self, session_id: UUID) -> List[Message]:
-        """Get all messages for a session"""
+        """Get all messages for a session, including any in the cold archive"""
         result = await self.db.execute(
             select(Message)
             .where(Message.session_id == session_id)
             .order_by(Message.timestamp)
         )
-        return result.scalars().all()
+        messages = result.scalars().all()
+
+        # Only sessions older than the retention window can have archived
+        # messages, and a session spanning the cutoff has both kinds
+        cutoff = message_archive_service.archive_cutoff()
+        if cutoff is None:
+            return messages
+        created_at = await self.db.scalar(select(Session.created_at).where(Session.id == session_id))
+        if created_at is None or created_at >= cutoff:
+            return messages
+        archived = await message_archive_service.read_session_messages(session_id)
+        # A partition archived but not yet dropped is in both; the hot row wins
+        hot_ids = {message.id for message in messages}
+        archived = [message for message in archived if message.id not in hot_ids]
+        if not archived:
+            return messages
+        return sorted([*archived, *messages], key=lambda message: message.timestamp)
 
     async def add_human_message(
         self,
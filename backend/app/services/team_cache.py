@@ -0,0 +1,134 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy import event, select
+from pydantic import BaseModel
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+import time
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.models.agent import Agent
+from app.models.team import team_members
+
+_cache_hits = CACHE_REQUESTS.labels("team_composition", "hit")
+_cache_misses = CACHE_REQUESTS.labels("team_composition", "miss")
+
+# Session.info key for the agents and teams that go stale when the session commits
+STALE_KEY = "team_cache_stale"
+
+
+class TeamAgentConfig(BaseModel):
+    """The slice of an agent needed to build its prompts"""
+    id: UUID
+    template_type: Optional[str] = None
+    capabilities: List[str] = []
+    goals: List[str] = []
+    constraints: List[str] = []
+
+
+class TeamCompositionCache:
+    """Read-through cache of team composition keyed by team id
+
+    Entries are process-local. Writes invalidate them only once their
+    transaction commits, which keeps this process exact; other workers are
+    not told and may serve a stale team for up to ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[UUID, Tuple[float, List[TeamAgentConfig]]] = {}
+        # Bumped by every invalidation, so a load that raced one is not stored
+        self._generation = 0
+
+    async def get(self, db: AsyncSession, team_id: UUID) -> List[TeamAgentConfig]:
+        """Return the team's agents, loading them with one query on a miss"""
+        entry = self._entries.get(team_id)
+        if entry and entry[0] > time.monotonic():
+            _cache_hits.inc()
+            return entry[1]
+
+        _cache_misses.inc()
+        generation = self._generation
+        agents = await self._load(db, team_id)
+        if generation == self._generation:
+            self._entries[team_id] = (time.monotonic() + self.ttl_seconds, agents)
+        return agents
+
+    async def _load(self, db: AsyncSession, team_id: UUID) -> List[TeamAgentConfig]:
+        result = await db.execute(
+            select(
+                Agent.id,
+                Agent.template_type,
+                Agent.capabilities,
+                Agent.goals,
+                Agent.constraints
+            )
+            .join(team_members, team_members.c.agent_id == Agent.id)
+            .where(team_members.c.team_id == team_id)
+        )
+        return [
+            TeamAgentConfig(
+                id=row.id,
+                template_type=row.template_type,
+                capabilities=row.capabilities or [],
+                goals=row.goals or [],
+                constraints=row.constraints or []
+            )
+            for row in result
+        ]
+
+    def invalidate_on_commit(
+        self,
+        db: AsyncSession,
+        agent_ids: Iterable[UUID] = (),
+        team_ids: Iterable[UUID] = ()
+    ):
+        """Drop the given teams, and every team holding the given agents, once db commits
+
+        Call this from every write to agents or team membership. Until the
+        commit other requests still read the old rows, so dropping entries
+        earlier would let them be cached again; a rollback drops nothing.
+        """
+        stale = db.sync_session.info.setdefault(STALE_KEY, {"agents": set(), "teams": set()})
+        stale["agents"].update(agent_ids)
+        stale["teams"].update(team_ids)
+
+    def invalidate_agent(self, agent_id: UUID):
+        """Drop every team that contains the given agent"""
+        self._generation += 1
+        stale = [
+            team_id for team_id, (_, agents) in self._entries.items()
+            if any(agent.id == agent_id for agent in agents)
+        ]
+        for team_id in stale:
+            del self._entries[team_id]
+
+    def invalidate_team(self, team_id: UUID):
+        """Drop one team, e.g. after its membership changed"""
+        self._generation += 1
+        self._entries.pop(team_id, None)
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+
+
+# Global instance
+team_composition_cache = TeamCompositionCache(ttl_seconds=settings.TEAM_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_committed_writes(session: OrmSession):
+    stale = session.info.pop(STALE_KEY, None)
+    if stale is None:
+        return
+    for agent_id in stale["agents"]:
+        team_composition_cache.invalidate_agent(agent_id)
+    for team_id in stale["teams"]:
+        team_composition_cache.invalidate_team(team_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_rolled_back_writes(session: OrmSession):
+    session.info.pop(STALE_KEY, None)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Database round-trip benchmark for GET endpoints
+Counts the statements and transaction boundaries each request sends to the
+database with the read-write (get_db) and read-only (get_read_db) dependencies.
+
+Usage (from backend/):
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.db_round_trips
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict
+
+import httpx
+from sqlalchemy import event
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import (
+    engine, read_only_engine, get_db, get_read_db, init_db, AsyncSessionLocal
+)
+from app.main import app
+from app.models.agent import Agent
+from app.models.message import Message, MessageType
+from app.models.session import Session, SessionStatus
+from app.models.team import Team
+
+REQUESTS_PER_ENDPOINT = 50
+
+counts: Counter = Counter()
+
+
+def _install_counters(async_engine, transactional: bool):
+    """Count every round trip an engine performs"""
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _statement(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"] += 1
+
+    if not transactional:
+        # AUTOCOMMIT connections never send BEGIN/COMMIT/ROLLBACK
+        return
+
+    @event.listens_for(sync_engine, "begin")
+    def _begin(conn):
+        counts["begin"] += 1
+
+    @event.listens_for(sync_engine, "commit")
+    def _commit(conn):
+        counts["commit"] += 1
+
+    @event.listens_for(sync_engine, "rollback")
+    def _rollback(conn):
+        counts["rollback"] += 1
+
+
+async def _seed() -> Dict[str, str]:
+    """Create one team, agent, session and a few messages to read back"""
+    async with AsyncSessionLocal() as db:
+        agent = Agent(name="Benchmark Agent", template_type="triage_specialist")
+        team = Team(name="Benchmark Team", coordination_pattern="sequential_pipeline", agents=[agent])
+        db.add(team)
+        await db.flush()
+        session = Session(
+            team_id=team.id,
+            task_description="Benchmark session",
+            status=SessionStatus.COMPLETED,
+            scenario_type="customer_support"
+        )
+        db.add(session)
+        await db.flush()
+        for i in range(5):
+            db.add(Message(
+                session_id=session.id,
+                message_type=MessageType.RESPONSE,
+                content=f"Benchmark message {i}",
+                message_metadata={"confidence": 0.9}
+            ))
+        await db.commit()
+        return {"agent_id": str(agent.id), "session_id": str(session.id)}
+
+
+async def _measure(client: httpx.AsyncClient, path: str) -> Dict[str, float]:
+    counts.clear()
+    started = time.perf_counter()
+    for _ in range(REQUESTS_PER_ENDPOINT):
+        response = await client.get(path)
+        response.raise_for_status()
+    elapsed = time.perf_counter() - started
+
+    result = {key: value / REQUESTS_PER_ENDPOINT for key, value in counts.items()}
+    result["round_trips"] = sum(result.values())
+    result["avg_ms"] = elapsed / REQUESTS_PER_ENDPOINT * 1000
+    return result
+
+
+async def main():
+    await init_db()
+    ids = await _seed()
+    _install_counters(engine, transactional=True)
+    _install_counters(read_only_engine, transactional=False)
+
+    endpoints = [
+        "/api/agents/",
+        f"/api/agents/{ids['agent_id']}",
+        "/api/sessions/",
+        f"/api/sessions/{ids['session_id']}",
+        f"/api/sessions/{ids['session_id']}/messages",
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Baseline: route every read through the read-write dependency
+        app.dependency_overrides[get_read_db] = get_db
+        baseline = {path: await _measure(client, path) for path in endpoints}
+        app.dependency_overrides.clear()
+        read_only = {path: await _measure(client, path) for path in endpoints}
+
+    print(f"{'endpoint':<58} {'get_db':>8} {'read':>8} {'saved':>8} {'ms before':>10} {'ms after':>10}")
+    print("-" * 108)
+    for path in endpoints:
+        before = baseline[path]["round_trips"]
+        after = read_only[path]["round_trips"]
+        print(
+            f"{path:<58} {before:>8.2f} {after:>8.2f} {before - after:>8.2f} "
+            f"{baseline[path]['avg_ms']:>10.2f} {read_only[path]['avg_ms']:>10.2f}"
+        )
+    print("\nRound trips = statements + BEGIN + COMMIT/ROLLBACK per request")
+
+    await engine.dispose()
+    await read_only_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
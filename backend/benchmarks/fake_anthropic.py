@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Anthropic Messages API
+Answers POST /v1/messages with scripted submit_agent_response input per
+agent type (recognised from the system prompt), as a plain or streamed
+response. Latency is drawn from a configurable distribution (time to first
+token plus output tokens at a fixed rate), usage is estimated from the
+request and reply, and 429/529/500/timeout faults are injected at
+configurable rates from a seeded RNG.
+
+Run it as a server and point the backend at it:
+    python -m benchmarks.fake_anthropic [--port 8787] [--config fake.json] [--rate-limit 0.05]
+    ANTHROPIC_BASE_URL=http://localhost:8787 ANTHROPIC_API_KEY=fake uvicorn app.main:app
+
+or in-process with fake_client(FakeAnthropic(...)). Streams are buffered by
+the in-process transport, so use the server when stream timing matters.
+in_memory_client() skips HTTP and the SDK entirely for overhead benchmarks.
+
+Control endpoints: GET /_fake/stats, DELETE /_fake/stats, PATCH /_fake/config.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import uuid
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.prompt_registry import PROMPTS_DIR
+
+CHARS_PER_TOKEN = 3.5
+STREAM_CHUNK_TOKENS = 8
+FILLER = (
+    "This section expands on the recommendation with the details, caveats and "
+    "follow-up steps a reviewer would expect to see. "
+)
+
+
+class LatencyModel(BaseModel):
+    """Time to first token from a distribution, then output at a fixed rate"""
+    distribution: Literal["fixed", "uniform", "normal", "lognormal"] = "lognormal"
+    median_ms: float = 600.0
+    spread: float = 0.4  # sigma for normal/lognormal, +/- fraction for uniform
+    tokens_per_second: float = 120.0
+
+
+class FaultRates(BaseModel):
+    """Probability of each injected fault per request"""
+    rate_limit: float = 0.0  # 429
+    overloaded: float = 0.0  # 529
+    server_error: float = 0.0  # 500
+    timeout: float = 0.0  # hang for timeout_seconds
+
+
+class AgentScript(BaseModel):
+    response: Dict[str, Any]
+    pad_to_tokens: int = 0  # lengthen content to a realistic answer size
+    latency: Optional[LatencyModel] = None
+    faults: Optional[FaultRates] = None
+
+
+class FakeAnthropicConfig(BaseModel):
+    seed: Optional[int] = 0
+    latency: LatencyModel = Field(default_factory=LatencyModel)
+    latency_scale: float = 1.0  # 0 answers instantly
+    faults: FaultRates = Field(default_factory=FaultRates)
+    timeout_seconds: float = 600.0
+    scripts: Dict[str, AgentScript] = {}
+
+
+def _script(content: str, confidence: float = 0.88, escalation_needed: bool = False) -> AgentScript:
+    return AgentScript(
+        response={
+            "escalation_needed": escalation_needed,
+            "confidence": confidence,
+            "content": content,
+            "reasoning": "Scripted response from the local fake Anthropic API.",
+            "suggestions": ["Review the scripted answer", "Adjust the fake's script to test other branches"]
+        },
+        pad_to_tokens=400
+    )
+
+
+DEFAULT_SCRIPTS: Dict[str, AgentScript] = {
+    "triage_specialist": _script("Category: technical. Urgency: medium. Route to solution research."),
+    "solution_researcher": _script("Known issue: reset the session token and clear cached credentials."),
+    "response_crafter": _script("Thanks for reaching out. Here is how to get you back up and running."),
+    "escalation_analyst": _script("Escalate to a tier-2 specialist with the triage notes attached.", 0.9, True),
+    "story_miner": _script("Three candidate narratives with a clear human protagonist."),
+    "structure_architect": _script("Problem, turning point, resolution, takeaway."),
+    "technical_translator": _script("The concept explained through an everyday analogy."),
+    "voice_crafter": _script("The draft rewritten in a warm, first-person voice.", 0.92),
+    "hook_designer": _script("An opening question, a mid-piece reveal and a closing callback.", 0.93),
+    "content_strategist": _script("Audience, positioning, three content pillars and success metrics."),
+    "content_producer": _script("A publish-ready draft following the strategy brief."),
+    "guest_experience_agent": _script("A relaxed evening: harbour walk, tasting menu, jazz bar."),
+    "concierge_coordinator": _script("Reservations confirmed with transport and a rain-day backup."),
+    "default": _script("Scripted answer for an unrecognised agent prompt.", 0.75),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def _agent_openings() -> List[Tuple[str, str]]:
+    """First line of each prompt template, which identifies the agent type"""
+    openings = []
+    for path in PROMPTS_DIR.glob("*.txt"):
+        first_line = path.read_text(encoding="utf-8").split("\n", 1)[0].strip()
+        openings.append((first_line, path.stem))
+    return openings
+
+
+def _error(status: int, error_type: str, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse(
+        {"type": "error", "error": {"type": error_type, "message": message}},
+        status_code=status,
+        headers=headers
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class FakeAnthropic:
+    """The fake API's state: configuration, seeded RNG and request statistics"""
+
+    def __init__(self, config: Optional[FakeAnthropicConfig] = None):
+        self.configure(config or FakeAnthropicConfig())
+        self.stats: Counter = Counter()
+        self._openings = _agent_openings()
+        self.app = self._build_app()
+
+    def configure(self, config: FakeAnthropicConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.scripts = {**DEFAULT_SCRIPTS, **config.scripts}
+
+    def agent_type(self, system: Any) -> str:
+        if isinstance(system, list):
+            system = "".join(block.get("text", "") for block in system)
+        for opening, agent_type in self._openings:
+            if system and system.startswith(opening):
+                return agent_type
+        return "default"
+
+    def _latency(self, script: AgentScript, output_tokens: int) -> Tuple[float, float]:
+        """(seconds to first token, seconds of generation) for one response"""
+        model = script.latency or self.config.latency
+        median = model.median_ms / 1000
+        if model.distribution == "fixed":
+            first_token = median
+        elif model.distribution == "uniform":
+            first_token = self.rng.uniform(median * (1 - model.spread), median * (1 + model.spread))
+        elif model.distribution == "normal":
+            first_token = max(0.0, self.rng.gauss(median, median * model.spread))
+        else:
+            first_token = median * math.exp(self.rng.gauss(0, model.spread))
+        generation = output_tokens / model.tokens_per_second if model.tokens_per_second > 0 else 0.0
+        scale = self.config.latency_scale
+        return first_token * scale, generation * scale
+
+    def _fault(self, script: AgentScript) -> Optional[str]:
+        rates = script.faults or self.config.faults
+        roll = self.rng.random()
+        for fault in ("timeout", "rate_limit", "overloaded", "server_error"):
+            roll -= getattr(rates, fault)
+            if roll < 0:
+                return fault
+        return None
+
+    def _answer(self, script: AgentScript) -> Dict[str, Any]:
+        answer = dict(script.response)
+        content = str(answer.get("content", ""))
+        missing = script.pad_to_tokens - estimate_tokens(content)
+        if missing > 0:
+            filler = FILLER * (math.ceil(missing * CHARS_PER_TOKEN / len(FILLER)))
+            answer["content"] = f"{content}\n\n{filler[:int(missing * CHARS_PER_TOKEN)].rstrip()}"
+        return answer
+
+    def reply(self, body: Dict[str, Any], script: AgentScript) -> Tuple[Dict[str, Any], str, int, int]:
+        """(answer, answer JSON, input tokens, output tokens) for a request"""
+        answer = self._answer(script)
+        output_text = json.dumps(answer)
+        input_tokens = estimate_tokens(
+            json.dumps(body.get("system", "")) + json.dumps(body.get("messages", [])) + json.dumps(body.get("tools") or [])
+        )
+        return answer, output_text, input_tokens, estimate_tokens(output_text)
+
+    async def messages(self, request: Request):
+        body = await request.json()
+        agent_type = self.agent_type(body.get("system"))
+        script = self.scripts.get(agent_type) or self.scripts["default"]
+
+        fault = self._fault(script)
+        if fault:
+            self.stats[f"{agent_type}.{fault}"] += 1
+            if fault == "timeout":
+                await asyncio.sleep(self.config.timeout_seconds)
+                return _error(504, "api_error", "Injected timeout")
+            if fault == "rate_limit":
+                return _error(429, "rate_limit_error", "Injected rate limit", {"retry-after": "1"})
+            if fault == "overloaded":
+                return _error(529, "overloaded_error", "Injected overload")
+            return _error(500, "api_error", "Injected server error")
+
+        tools = body.get("tools") or []
+        use_tool = bool(tools)
+        answer, output_text, input_tokens, output_tokens = self.reply(body, script)
+        first_token, generation = self._latency(script, output_tokens)
+
+        message = {
+            "id": f"msg_fake_{uuid.uuid4().hex[:16]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "stop_sequence": None
+        }
+        if use_tool:
+            block = {"type": "tool_use", "id": f"toolu_fake_{uuid.uuid4().hex[:16]}", "name": tools[0]["name"]}
+        else:
+            block = {"type": "text"}
+
+        if body.get("stream"):
+            self.stats[f"{agent_type}.streamed"] += 1
+            return StreamingResponse(
+                self._stream(agent_type, message, block, output_text, input_tokens, output_tokens, first_token, generation),
+                media_type="text/event-stream"
+            )
+
+        await asyncio.sleep(first_token + generation)
+        self.stats[f"{agent_type}.ok"] += 1
+        content = {**block, "input": answer} if use_tool else {**block, "text": output_text}
+        return JSONResponse({
+            **message,
+            "content": [content],
+            "stop_reason": "tool_use" if use_tool else "end_turn",
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens}
+        })
+
+    async def _stream(
+        self,
+        agent_type: str,
+        message: Dict[str, Any],
+        block: Dict[str, Any],
+        output_text: str,
+        input_tokens: int,
+        output_tokens: int,
+        first_token: float,
+        generation: float
+    ):
+        use_tool = block["type"] == "tool_use"
+        chunk_chars = int(STREAM_CHUNK_TOKENS * CHARS_PER_TOKEN)
+        chunks = [output_text[i:i + chunk_chars] for i in range(0, len(output_text), chunk_chars)]
+        delay = generation / max(len(chunks), 1)
+        finished = False
+        try:
+            await asyncio.sleep(first_token)
+            yield _sse("message_start", {"type": "message_start", "message": {
+                **message, "content": [], "stop_reason": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": 1}
+            }})
+            start_block = {**block, "input": {}} if use_tool else {**block, "text": ""}
+            yield _sse("content_block_start", {"type": "content_block_start", "index": 0, "content_block": start_block})
+            for chunk in chunks:
+                if delay:
+                    await asyncio.sleep(delay)
+                delta = (
+                    {"type": "input_json_delta", "partial_json": chunk} if use_tool
+                    else {"type": "text_delta", "text": chunk}
+                )
+                yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": delta})
+            yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield _sse("message_delta", {
+                "type": "message_delta",
+                "delta": {"stop_reason": "tool_use" if use_tool else "end_turn", "stop_sequence": None},
+                "usage": {"output_tokens": output_tokens}
+            })
+            yield _sse("message_stop", {"type": "message_stop"})
+            finished = True
+        finally:
+            if not finished:
+                # The client hung up early, e.g. an early-exit stop condition
+                self.stats[f"{agent_type}.abandoned"] += 1
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake Anthropic API")
+        app.add_api_route("/v1/messages", self.messages, methods=["POST"])
+
+        @app.get("/v1/models")
+        async def list_models(limit: int = 20):
+            models = [{"type": "model", "id": "claude-3-5-sonnet-20241022", "display_name": "Claude 3.5 Sonnet (fake)",
+                       "created_at": "2024-10-22T00:00:00Z"}]
+            return {"data": models[:limit], "has_more": False, "first_id": models[0]["id"], "last_id": models[0]["id"]}
+
+        @app.get("/_fake/stats")
+        async def get_stats():
+            return dict(sorted(self.stats.items()))
+
+        @app.delete("/_fake/stats")
+        async def reset_stats():
+            self.stats.clear()
+            return {}
+
+        @app.patch("/_fake/config")
+        async def update_config(update: Dict[str, Any]):
+            self.configure(FakeAnthropicConfig.model_validate({**self.config.model_dump(), **update}))
+            return self.config.model_dump()
+
+        return app
+
+
+class _InMemoryStream:
+    """Just enough of the SDK's AsyncMessageStream for LLMService"""
+
+    def __init__(self, message: SimpleNamespace, output_text: str):
+        self.current_message_snapshot = message
+        self._message = message
+        self._output_text = output_text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def __aiter__(self):
+        chunk_chars = int(STREAM_CHUNK_TOKENS * CHARS_PER_TOKEN)
+        for i in range(0, len(self._output_text), chunk_chars):
+            delta = SimpleNamespace(type="input_json_delta", partial_json=self._output_text[i:i + chunk_chars])
+            yield SimpleNamespace(type="content_block_delta", index=0, delta=delta)
+
+    async def get_final_message(self) -> SimpleNamespace:
+        return self._message
+
+
+class InMemoryMessages:
+    """SDK-shaped messages resource answering from the fake's scripts with no I/O
+
+    Latency and faults are skipped, so what remains is the backend's own
+    overhead around each call.
+    """
+
+    def __init__(self, fake: FakeAnthropic):
+        self.fake = fake
+
+    def _message(self, request: Dict[str, Any]) -> Tuple[SimpleNamespace, str]:
+        agent_type = self.fake.agent_type(request.get("system"))
+        script = self.fake.scripts.get(agent_type) or self.fake.scripts["default"]
+        answer, output_text, input_tokens, output_tokens = self.fake.reply(request, script)
+        tools = request.get("tools") or []
+        if tools:
+            block = SimpleNamespace(type="tool_use", id="toolu_fake", name=tools[0]["name"], input=answer)
+        else:
+            block = SimpleNamespace(type="text", text=output_text)
+        usage = SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
+        return SimpleNamespace(content=[block], usage=usage), output_text
+
+    async def create(self, **request) -> SimpleNamespace:
+        return self._message(request)[0]
+
+    def stream(self, **request) -> _InMemoryStream:
+        return _InMemoryStream(*self._message(request))
+
+
+def in_memory_client(fake: FakeAnthropic) -> SimpleNamespace:
+    """A zero-latency stand-in for AsyncAnthropic, for measuring framework overhead"""
+    return SimpleNamespace(messages=InMemoryMessages(fake))
+
+
+def fake_client(fake: FakeAnthropic, **client_kwargs):
+    """AsyncAnthropic served by the fake in-process, without a network hop"""
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+    return AsyncAnthropic(
+        api_key="fake",
+        base_url="http://fake-anthropic",
+        http_client=DefaultAsyncHttpxClient(transport=httpx.ASGITransport(app=fake.app)),
+        **client_kwargs
+    )
+
+
+def load_config(args) -> FakeAnthropicConfig:
+    data: Dict[str, Any] = {}
+    if args.config:
+        with open(args.config) as f:
+            data = json.load(f)
+    config = FakeAnthropicConfig.model_validate(data)
+
+    if args.seed is not None:
+        config.seed = args.seed
+    if args.latency_scale is not None:
+        config.latency_scale = args.latency_scale
+    if args.median_ms is not None:
+        config.latency.median_ms = args.median_ms
+    if args.tokens_per_second is not None:
+        config.latency.tokens_per_second = args.tokens_per_second
+    for fault in ("rate_limit", "overloaded", "server_error", "timeout"):
+        rate = getattr(args, fault)
+        if rate is not None:
+            setattr(config.faults, fault, rate)
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--config", help="JSON file matching FakeAnthropicConfig")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--latency-scale", type=float, help="multiply every delay; 0 answers instantly")
+    parser.add_argument("--median-ms", type=float, help="median time to first token")
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--rate-limit", type=float, help="fraction of requests answered 429")
+    parser.add_argument("--overloaded", type=float, help="fraction of requests answered 529")
+    parser.add_argument("--server-error", type=float, help="fraction of requests answered 500")
+    parser.add_argument("--timeout", type=float, help="fraction of requests that hang")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = load_config(args)
+    print(f"🤖 Fake Anthropic API on http://{args.host}:{args.port} (seed={config.seed}, "
+          f"latency x{config.latency_scale}, faults={config.faults.model_dump()})")
+    uvicorn.run(FakeAnthropic(config).app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
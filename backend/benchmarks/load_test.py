@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for the pipeline endpoints
+Drives closed-loop (fixed concurrency) or open-loop (Poisson arrivals at a
+fixed rate) traffic at a running backend and reports latency percentiles,
+throughput, error rates and a per-stage breakdown taken from the app's own
+/metrics histograms. Open-loop latency is measured from each request's
+scheduled send time, so a stalled server cannot hide its queueing delay.
+
+Run the backend against the fake LLM first:
+    python -m benchmarks.fake_anthropic --port 8787
+    ANTHROPIC_BASE_URL=http://localhost:8787 ANTHROPIC_API_KEY=fake uvicorn app.main:app
+
+Usage (from backend/):
+    python -m benchmarks.load_test [--target customer-support|session-start] [--mode closed|open]
+        [--concurrency 8] [--rate 5] [--duration 30] [--json report.json] [--csv report.csv]
+        [--baseline baseline.json] [--tolerance 0.15]
+
+session-start needs --team-id of an existing team. Any earlier --json report
+can serve as a baseline; the exit status is 1 when a regression is found.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+STAGE_METRIC = "kyoryoku_pipeline_stage_seconds"
+
+CUSTOMER_REQUESTS = [
+    "I can't log into my account after resetting my password.",
+    "I was charged twice for my subscription this month.",
+    "The export button does nothing when I click it.",
+    "How do I add another admin to our workspace?",
+    "Our integration started returning 401 errors this morning.",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = pct / 100 * (len(ordered) - 1)
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def histogram_quantile(q: float, buckets: List[Tuple[float, float]]) -> float:
+    """Prometheus-style quantile from cumulative (upper bound, count) buckets"""
+    if not buckets or buckets[-1][1] <= 0:
+        return 0.0
+    target = q * buckets[-1][1]
+    previous_bound, previous_count = 0.0, 0.0
+    for bound, count in buckets:
+        if count >= target:
+            if math.isinf(bound):
+                return previous_bound
+            width = count - previous_count
+            fraction = (target - previous_count) / width if width else 1.0
+            return previous_bound + (bound - previous_bound) * fraction
+        previous_bound, previous_count = bound, count
+    return previous_bound
+
+
+async def scrape_stage_histograms(client: httpx.AsyncClient) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Stage histograms keyed by "pipeline.stage", or None if /metrics is unavailable"""
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+
+    stages: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"buckets": {}, "count": 0.0, "sum": 0.0})
+    for family in text_string_to_metric_families(response.text):
+        if family.name != STAGE_METRIC:
+            continue
+        for sample in family.samples:
+            key = f"{sample.labels['pipeline']}.{sample.labels['stage']}"
+            if sample.name.endswith("_bucket"):
+                stages[key]["buckets"][float(sample.labels["le"])] = sample.value
+            elif sample.name.endswith("_count"):
+                stages[key]["count"] = sample.value
+            elif sample.name.endswith("_sum"):
+                stages[key]["sum"] = sample.value
+    return dict(stages)
+
+
+def stage_breakdown(before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Per-stage count, mean and percentiles of the observations made during the run"""
+    empty = {"buckets": {}, "count": 0.0, "sum": 0.0}
+    breakdown = {}
+    for key, end in sorted(after.items()):
+        start = before.get(key, empty)
+        count = end["count"] - start["count"]
+        if count <= 0:
+            continue
+        buckets = [
+            (bound, value - start["buckets"].get(bound, 0.0))
+            for bound, value in sorted(end["buckets"].items())
+        ]
+        breakdown[key] = {
+            "count": int(count),
+            "mean_ms": (end["sum"] - start["sum"]) / count * 1000,
+            "p50_ms": histogram_quantile(0.50, buckets) * 1000,
+            "p95_ms": histogram_quantile(0.95, buckets) * 1000,
+            "p99_ms": histogram_quantile(0.99, buckets) * 1000,
+        }
+    return breakdown
+
+
+def _headers(args, index: int) -> Dict[str, str]:
+    return {
+        "X-Tenant-ID": f"load-{index % args.tenants}",
+        "X-Traffic-Class": args.traffic_class,
+    }
+
+
+async def customer_support(client: httpx.AsyncClient, args, index: int) -> int:
+    response = await client.post(
+        "/api/llm/customer-support/process",
+        params={"fields": "triage,escalation"} if args.project else None,
+        json={
+            "request": CUSTOMER_REQUESTS[index % len(CUSTOMER_REQUESTS)],
+            "customer_context": {"customer_tier": "premium", "urgency": "high" if index % 5 == 0 else "medium"}
+        },
+        headers=_headers(args, index)
+    )
+    return response.status_code
+
+
+async def session_start(client: httpx.AsyncClient, args, index: int) -> int:
+    created = await client.post("/api/sessions/", json={
+        "team_id": args.team_id,
+        "task_description": CUSTOMER_REQUESTS[index % len(CUSTOMER_REQUESTS)],
+        "scenario_type": "customer_support",
+        "user_id": str(uuid.UUID(int=index % args.tenants)),
+        "configuration": {"customer_context": {"customer_tier": "premium"}, "traffic_class": args.traffic_class}
+    })
+    if created.status_code >= 400:
+        return created.status_code
+    response = await client.post(f"/api/sessions/{created.json()['id']}/start")
+    return response.status_code
+
+
+TARGETS: Dict[str, Callable[[httpx.AsyncClient, Any, int], Awaitable[int]]] = {
+    "customer-support": customer_support,
+    "session-start": session_start,
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+
+    async def measure(self, request: Awaitable[int], scheduled_at: float):
+        try:
+            status = str(await request)
+        except httpx.TimeoutException:
+            status = "timeout"
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        self.statuses[status] += 1
+        if status.isdigit() and int(status) < 400:
+            self.latencies.append(time.perf_counter() - scheduled_at)
+
+
+async def run_closed(client: httpx.AsyncClient, args, recorder: Recorder):
+    target = TARGETS[args.target]
+    deadline = time.perf_counter() + args.duration
+    counter = iter(range(sys.maxsize))
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            index = next(counter)
+            if args.requests and index >= args.requests:
+                return
+            await recorder.measure(target(client, args, index), time.perf_counter())
+            if args.think_ms:
+                await asyncio.sleep(args.think_ms / 1000)
+
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+
+
+async def run_open(client: httpx.AsyncClient, args, recorder: Recorder):
+    target = TARGETS[args.target]
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    scheduled_at = start
+    tasks = []
+    index = 0
+    while scheduled_at - start < args.duration and not (args.requests and index >= args.requests):
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(recorder.measure(target(client, args, index), scheduled_at)))
+        index += 1
+        scheduled_at += rng.expovariate(args.rate)
+    await asyncio.gather(*tasks)
+
+
+async def run(args) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        before = await scrape_stage_histograms(client)
+        recorder = Recorder()
+        start = time.perf_counter()
+        if args.mode == "closed":
+            await run_closed(client, args, recorder)
+        else:
+            await run_open(client, args, recorder)
+        elapsed = time.perf_counter() - start
+        after = await scrape_stage_histograms(client)
+
+    total = sum(recorder.statuses.values())
+    ok = len(recorder.latencies)
+    latencies_ms = [latency * 1000 for latency in recorder.latencies]
+    return {
+        "config": {
+            key: getattr(args, key)
+            for key in ("url", "target", "mode", "concurrency", "rate", "duration", "requests", "tenants", "traffic_class")
+        },
+        "summary": {
+            "requests": total,
+            "ok": ok,
+            "error_rate": (total - ok) / total if total else 0.0,
+            "throughput_rps": ok / elapsed if elapsed else 0.0,
+            "duration_s": elapsed,
+            "status_codes": dict(sorted(recorder.statuses.items())),
+            "mean_ms": sum(latencies_ms) / ok if ok else 0.0,
+            "p50_ms": percentile(latencies_ms, 50),
+            "p95_ms": percentile(latencies_ms, 95),
+            "p99_ms": percentile(latencies_ms, 99),
+            "max_ms": max(latencies_ms, default=0.0),
+        },
+        "stages": stage_breakdown(before, after) if before is not None and after is not None else {},
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, error_tolerance: float) -> List[str]:
+    """Regressions of this report against a baseline report"""
+    regressions = []
+    current, base = report["summary"], baseline["summary"]
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        if base[key] and current[key] > base[key] * (1 + tolerance):
+            regressions.append(f"{key} {base[key]:.0f} -> {current[key]:.0f} (+{current[key] / base[key] - 1:.0%})")
+    if base["throughput_rps"] and current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+        regressions.append(
+            f"throughput {base['throughput_rps']:.2f} -> {current['throughput_rps']:.2f} req/s"
+        )
+    if current["error_rate"] > base["error_rate"] + error_tolerance:
+        regressions.append(f"error rate {base['error_rate']:.1%} -> {current['error_rate']:.1%}")
+
+    for stage, stats in report["stages"].items():
+        base_stage = baseline.get("stages", {}).get(stage)
+        if base_stage and base_stage["p95_ms"] and stats["p95_ms"] > base_stage["p95_ms"] * (1 + tolerance):
+            regressions.append(f"stage {stage} p95 {base_stage['p95_ms']:.0f} -> {stats['p95_ms']:.0f} ms")
+    return regressions
+
+
+def write_csv(report: Dict[str, Any], path: str):
+    columns = ["scope", "name", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "error_rate", "throughput_rps"]
+    summary = report["summary"]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerow({
+            "scope": "endpoint", "name": report["config"]["target"], "count": summary["requests"],
+            **{key: round(summary[key], 3) for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "error_rate", "throughput_rps")}
+        })
+        for stage, stats in report["stages"].items():
+            writer.writerow({
+                "scope": "stage", "name": stage, "count": stats["count"],
+                **{key: round(stats[key], 3) for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms")}
+            })
+
+
+def print_report(report: Dict[str, Any]):
+    config, summary = report["config"], report["summary"]
+    load = f"{config['concurrency']} workers" if config["mode"] == "closed" else f"{config['rate']} req/s"
+    print(f"\n📈 {config['target']} ({config['mode']} loop, {load}, {summary['duration_s']:.1f} s)")
+    print(f"   {summary['requests']} requests, {summary['throughput_rps']:.2f} ok/s, "
+          f"error rate {summary['error_rate']:.1%}, status {summary['status_codes']}")
+    print(f"   latency ms: p50 {summary['p50_ms']:.0f}  p95 {summary['p95_ms']:.0f}  "
+          f"p99 {summary['p99_ms']:.0f}  max {summary['max_ms']:.0f}")
+    if report["stages"]:
+        print(f"\n{'stage':<36} {'count':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for stage, stats in report["stages"].items():
+            print(f"{stage:<36} {stats['count']:>7} {stats['mean_ms']:>9.0f} {stats['p50_ms']:>9.0f} "
+                  f"{stats['p95_ms']:>9.0f} {stats['p99_ms']:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="customer-support")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed loop: concurrent workers")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Closed loop: pause between a worker's requests")
+    parser.add_argument("--rate", type=float, default=5.0, help="Open loop: mean arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0 = no limit)")
+    parser.add_argument("--tenants", type=int, default=4, help="Distinct X-Tenant-ID values to spread load over")
+    parser.add_argument("--traffic-class", choices=["interactive", "batch"], default="interactive")
+    parser.add_argument("--team-id", help="Existing team for --target session-start")
+    parser.add_argument("--project", action="store_true", help="Ask for a fields= projection of the response")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the report as JSON")
+    parser.add_argument("--csv", help="Write endpoint and stage rows as CSV")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative latency/throughput regression")
+    parser.add_argument("--error-tolerance", type=float, default=0.01, help="Allowed absolute error-rate increase")
+    args = parser.parse_args()
+
+    if args.target == "session-start" and not args.team_id:
+        parser.error("--target session-start needs --team-id")
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 JSON report written to {args.json}")
+    if args.csv:
+        write_csv(report, args.csv)
+        print(f"💾 CSV report written to {args.csv}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.error_tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
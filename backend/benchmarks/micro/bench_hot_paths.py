@@ -0,0 +1,154 @@
+"""
+Micro-benchmarks for the backend's pure-Python hot paths
+Prompt building, response parsing, AgentResponse handling, message saving
+and whole orchestrator pipelines against a zero-latency fake LLM. Once LLM
+latency is cut by caching, this overhead is what remains.
+
+Usage (from backend/):
+    pytest benchmarks/micro [-k parse] [--benchmark-compare-fail=mean:15%]
+"""
+
+import json
+
+import pytest
+
+from app.core.json_stream import IncrementalJSONObjectParser
+from app.core.responses import dumps_json
+from app.services.context_builder import context_builder
+from app.services.llm_service import AgentResponse, llm_service, orchestrator
+from app.services.session_service import SessionService
+from benchmarks.fake_anthropic import DEFAULT_SCRIPTS, FakeAnthropic
+
+CAPABILITIES = ["categorize_issues", "identify_urgency", "route_appropriately"]
+GOALS = ["Categorize incoming requests accurately", "Identify urgent issues requiring immediate attention"]
+CONSTRAINTS = ["Must escalate if unsure about urgency", "Follow established routing rules"]
+CUSTOMER_CONTEXT = {
+    "customer_id": "cust_12345",
+    "customer_tier": "premium",
+    "account_type": "business",
+    "previous_tickets": 2,
+    "last_login": "2025-07-20T10:30:00Z"
+}
+
+# A full-length scripted answer, as the fake serves it
+TOOL_INPUT = FakeAnthropic()._answer(DEFAULT_SCRIPTS["solution_researcher"])
+TOOL_INPUT_JSON = json.dumps(TOOL_INPUT)
+PRIOR_RESULT = AgentResponse(**TOOL_INPUT).dict()
+
+RESPONSES = {
+    "tool_input": TOOL_INPUT,
+    "odd_shapes": {
+        **TOOL_INPUT,
+        "reasoning": ["Matched the error code", "Checked recent incidents"],
+        "suggestions": {"first": "Reset the token", "then": "Clear the cache"}
+    },
+    "json_in_prose": f"Here is my assessment:\n{TOOL_INPUT_JSON}\nLet me know if you need more.",
+    "malformed_json": TOOL_INPUT_JSON[:-40] + ', "confidence": }',
+    "natural_language": TOOL_INPUT["content"],
+}
+
+
+class NullSession:
+    """AsyncSession stand-in so only SessionService's own work is measured"""
+
+    def add(self, instance):
+        pass
+
+    async def flush(self):
+        pass
+
+
+def bench_system_prompt_cached(benchmark):
+    llm_service._build_agent_system_prompt("triage_specialist", CAPABILITIES, GOALS, CONSTRAINTS)
+    benchmark(llm_service._build_agent_system_prompt, "triage_specialist", CAPABILITIES, GOALS, CONSTRAINTS)
+
+
+def bench_system_prompt_uncached(benchmark):
+    prompts = llm_service.prompts
+    version = prompts.get("triage_specialist").version
+    benchmark(prompts._render_uncached, version, tuple(CAPABILITIES), tuple(GOALS), tuple(CONSTRAINTS))
+
+
+@pytest.mark.parametrize("context", ["customer", "pipeline"])
+def bench_user_prompt(benchmark, context):
+    if context == "customer":
+        payload = CUSTOMER_CONTEXT
+    else:
+        # Response crafting context: two full prior results, over the token budget
+        payload = {**CUSTOMER_CONTEXT, "triage_result": PRIOR_RESULT, "research_result": PRIOR_RESULT}
+    benchmark(llm_service._build_user_prompt, "Craft customer response for: login fails", payload, "response_crafter")
+
+
+def bench_context_builder_within_budget(benchmark):
+    benchmark(context_builder.build, "solution_researcher", {**CUSTOMER_CONTEXT, "triage_result": PRIOR_RESULT})
+
+
+@pytest.mark.parametrize("shape", sorted(RESPONSES))
+def bench_parse_agent_response(benchmark, shape):
+    benchmark(llm_service._parse_agent_response, RESPONSES[shape], "solution_researcher")
+
+
+def bench_stream_parser(benchmark):
+    chunks = [TOOL_INPUT_JSON[i:i + 28] for i in range(0, len(TOOL_INPUT_JSON), 28)]
+
+    def parse():
+        parser = IncrementalJSONObjectParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+        return parser.fields
+
+    assert benchmark(parse) == TOOL_INPUT
+
+
+def bench_agent_response_construct(benchmark):
+    benchmark(AgentResponse, **TOOL_INPUT)
+
+
+def bench_agent_response_serialize(benchmark):
+    results = {stage: AgentResponse(**TOOL_INPUT) for stage in ("triage", "research", "response")}
+    benchmark(dumps_json, results)
+
+
+def bench_save_agent_message(benchmark, run):
+    service = SessionService(NullSession())
+    response = AgentResponse(**TOOL_INPUT)
+
+    def save():
+        return run(service._save_agent_message(
+            session_id=None,
+            agent_type="solution_researcher",
+            content=response.content,
+            confidence=response.confidence,
+            reasoning=response.reasoning,
+            escalation_needed=response.escalation_needed
+        ))
+
+    benchmark(save)
+
+
+def bench_agent_request(benchmark, run, zero_latency_llm):
+    benchmark(lambda: run(zero_latency_llm.process_agent_request(
+        "triage_specialist", "Triage: login fails", CUSTOMER_CONTEXT, CAPABILITIES, GOALS, CONSTRAINTS
+    )))
+
+
+def bench_customer_support_pipeline(benchmark, run, zero_latency_llm):
+    results = benchmark(lambda: run(orchestrator.process_customer_support_request(
+        "I can't log into my account after resetting my password.", CUSTOMER_CONTEXT
+    )))
+    assert set(results) == {"triage", "research", "response"}
+
+
+def bench_content_creation_pipeline(benchmark, run, zero_latency_llm):
+    results = benchmark(lambda: run(orchestrator.process_content_creation_request(
+        "Notes from a customer interview about migrating to the cloud.", iterations=2
+    )))
+    assert results["total_iterations"] == 2
+
+
+def bench_content_marketing_pipeline(benchmark, run, zero_latency_llm):
+    benchmark(lambda: run(orchestrator.process_content_marketing_request("Launch post for the new analytics feature")))
+
+
+def bench_guest_concierge_pipeline(benchmark, run, zero_latency_llm):
+    benchmark(lambda: run(orchestrator.process_guest_concierge_request("A quiet dinner for two tonight")))
@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_service import llm_service
+from benchmarks.fake_anthropic import FakeAnthropic, in_memory_client
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine to completion on one loop shared by the whole session"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def fake():
+    return FakeAnthropic()
+
+
+@pytest.fixture
+def zero_latency_llm(fake):
+    """Answer LLMService calls from the fake's scripts with no I/O"""
+    client = llm_service.client
+    llm_service.client = in_memory_client(fake)
+    yield llm_service
+    llm_service.client = client
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Noisy-neighbour isolation harness for the LLM fair scheduler
+One tenant floods the LLM layer with a batch backfill while a few
+interactive tenants issue sequential calls. Interactive latency is compared
+across a plain FIFO semaphore and WeightedFairScheduler configurations.
+
+Usage (from backend/):
+    python -m benchmarks.noisy_neighbour [--capacity 4] [--flood 400] [--call-ms 40]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.fair_scheduler import WeightedFairScheduler, tenant_scope
+
+
+class FifoScheduler:
+    """Baseline: one shared FIFO queue, which is what a bare semaphore gives"""
+
+    def __init__(self, capacity: int):
+        self._semaphore = asyncio.Semaphore(capacity)
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._semaphore:
+            yield
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_scenario(scheduler, args, with_noise: bool) -> Dict[str, float]:
+    call_seconds = args.call_ms / 1000
+
+    async def llm_call(tenant: str, traffic_class: str) -> float:
+        with tenant_scope(tenant, traffic_class):
+            start = time.perf_counter()
+            async with scheduler.slot():
+                await asyncio.sleep(call_seconds)
+            return time.perf_counter() - start
+
+    async def interactive_user(tenant: str) -> List[float]:
+        latencies = []
+        for _ in range(args.calls_per_user):
+            latencies.append(await llm_call(tenant, "interactive"))
+            await asyncio.sleep(args.think_ms / 1000)
+        return latencies
+
+    start = time.perf_counter()
+    flood = []
+    if with_noise:
+        flood = [asyncio.create_task(llm_call("backfill", "batch")) for _ in range(args.flood)]
+        await asyncio.sleep(call_seconds)  # the flood is already queued when users arrive
+
+    users = await asyncio.gather(*[interactive_user(f"user-{i}") for i in range(args.users)])
+    interactive_done = time.perf_counter() - start
+    await asyncio.gather(*flood)
+
+    latencies = [latency * 1000 for user in users for latency in user]
+    return {
+        "mean": sum(latencies) / len(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "max": max(latencies),
+        "interactive_done_s": interactive_done,
+        "flood_done_s": time.perf_counter() - start if flood else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--capacity", type=int, default=4, help="Concurrent LLM call slots")
+    parser.add_argument("--flood", type=int, default=400, help="Batch calls submitted by the noisy tenant")
+    parser.add_argument("--users", type=int, default=8, help="Interactive tenants")
+    parser.add_argument("--calls-per-user", type=int, default=20)
+    parser.add_argument("--call-ms", type=float, default=40.0, help="Simulated LLM latency")
+    parser.add_argument("--think-ms", type=float, default=20.0, help="Pause between a user's calls")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("no noise (FIFO)", lambda: FifoScheduler(args.capacity), False),
+        ("FIFO semaphore", lambda: FifoScheduler(args.capacity), True),
+        ("fair, equal class weights", lambda: WeightedFairScheduler(
+            args.capacity, {"interactive": 1.0, "batch": 1.0}, {}), True),
+        ("fair, interactive 4 : batch 1", lambda: WeightedFairScheduler(
+            args.capacity, {"interactive": 4.0, "batch": 1.0}, {}), True),
+    ]
+
+    print("\n🔊 Noisy-neighbour isolation")
+    print(f"   capacity {args.capacity}, flood {args.flood} batch calls, {args.users} interactive users "
+          f"x {args.calls_per_user} calls, {args.call_ms:.0f} ms per call\n")
+    print(f"{'scheduler':<32} {'mean ms':>8} {'p95 ms':>8} {'max ms':>8} {'users done s':>13} {'flood done s':>13}")
+    for label, factory, with_noise in scenarios:
+        result = asyncio.run(run_scenario(factory(), args, with_noise))
+        print(f"{label:<32} {result['mean']:>8.0f} {result['p95']:>8.0f} {result['max']:>8.0f} "
+              f"{result['interactive_done_s']:>13.2f} {result['flood_done_s']:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for pipeline responses
+Compares FastAPI's default path (jsonable_encoder + JSONResponse) with
+FastJSONResponse on a content-creation sized payload, and reports payload
+sizes with gzip/brotli compression and with a fields= projection.
+
+Usage (from backend/):
+    python -m benchmarks.serialization [--iterations 3] [--content-chars 4000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.compression import brotli, compress
+from app.core.responses import FastJSONResponse, select_fields
+from app.services.llm_service import AgentResponse
+
+STAGES = ["story_mining", "structure", "translation", "voice", "hooks"]
+
+
+def build_content_creation_result(iterations: int, content_chars: int) -> Dict[str, Any]:
+    """Build a result shaped like process_content_creation_request output"""
+    paragraph = "Our platform turned a week of manual triage into an afternoon. "
+    content = (paragraph * (content_chars // len(paragraph) + 1))[:content_chars]
+
+    iteration_results = {}
+    for iteration in range(1, iterations + 1):
+        stages: Dict[str, Any] = {
+            stage: AgentResponse(
+                content=content,
+                confidence=0.82,
+                reasoning="Balanced narrative clarity against technical depth. " * 6,
+                suggestions=["Tighten the opening", "Add a concrete metric", "Close with a question"],
+                metadata={"agent_type": stage, "model": "claude-3-5-sonnet-20241022",
+                          "usage": {"input_tokens": 1800, "output_tokens": 900}}
+            )
+            for stage in STAGES
+        }
+        stages["overall_confidence"] = 0.82
+        stages["final_content"] = content
+        iteration_results[f"iteration_{iteration}"] = stages
+
+    return {
+        "iterations": iteration_results,
+        "final_content": content,
+        "content_type": "blog_post",
+        "target_audience": "business_professionals",
+        "total_iterations": iterations,
+        "platform_validation": {
+            "coordination_success": True,
+            "iterative_improvement": iterations > 1,
+            "agent_handoffs": iterations * len(STAGES)
+        }
+    }
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> float:
+    """Median wall time of fn in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=3, help="Pipeline iterations in the payload")
+    parser.add_argument("--content-chars", type=int, default=4000, help="Characters per agent output")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    result = build_content_creation_result(args.iterations, args.content_chars)
+
+    print("\n📦 Serialization benchmark")
+    print(f"   payload: {args.iterations} iterations x {len(STAGES)} stages, {args.content_chars} chars each\n")
+
+    default_ms = time_call(lambda: JSONResponse(jsonable_encoder(result)).body, args.repeat)
+    fast_ms = time_call(lambda: FastJSONResponse(result).body, args.repeat)
+    print(f"{'jsonable_encoder + JSONResponse':<42} {default_ms:>8.3f} ms")
+    print(f"{'FastJSONResponse':<42} {fast_ms:>8.3f} ms   ({default_ms / fast_ms:.1f}x faster)\n")
+
+    full = FastJSONResponse(result).body
+    projected = FastJSONResponse(select_fields(result, "final_content,platform_validation")).body
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+
+    print(f"{'payload':<42} {'raw':>10} " + " ".join(f"{e:>10}" for e in encodings))
+    for label, body in (("full result", full), ("fields=final_content,platform_validation", projected)):
+        sizes = [len(compress(body, e)) for e in encodings]
+        print(f"{label:<42} {len(body):>10,} " + " ".join(f"{s:>10,}" for s in sizes))
+
+    print()
+    for encoding in encodings:
+        ms = time_call(lambda: compress(full, encoding), max(args.repeat // 10, 5))
+        print(f"{encoding + ' compress (full result)':<42} {ms:>8.3f} ms")
+    if brotli is None:
+        print("   (brotli not installed; br results skipped)")
+
+
+if __name__ == "__main__":
+    main()
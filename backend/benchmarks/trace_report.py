@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Stage latency report from a trace file
+Reads spans written with TRACING_EXPORTER=file and prints, per pipeline,
+p50/p99 of each stage and its share of the slowest 1% of pipelines, so the
+stage that dominates tail latency stands out.
+
+Usage (from backend/):
+    python -m benchmarks.trace_report [traces/spans.jsonl]
+"""
+
+import json
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+
+def _duration_ms(span: Dict) -> float:
+    start = datetime.fromisoformat(span["start_time"].rstrip("Z"))
+    end = datetime.fromisoformat(span["end_time"].rstrip("Z"))
+    return (end - start).total_seconds() * 1000
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "traces/spans.jsonl"
+    with open(path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f if line.strip()]
+
+    pipelines = {}  # span_id -> (pipeline, duration)
+    stages_by_parent: Dict[str, List[Dict]] = defaultdict(list)
+    for span in spans:
+        attributes = span.get("attributes", {})
+        if span["name"].startswith("pipeline "):
+            pipelines[span["context"]["span_id"]] = (attributes["kyoryoku.pipeline"], _duration_ms(span))
+        elif span["name"].startswith("stage ") and span.get("parent_id"):
+            # Fold iterations together: "iteration_2.voice" -> "voice"
+            stage = attributes["kyoryoku.stage"].rsplit(".", 1)[-1]
+            stages_by_parent[span["parent_id"]].append({"stage": stage, "ms": _duration_ms(span)})
+
+    by_pipeline: Dict[str, List[str]] = defaultdict(list)
+    for span_id, (pipeline, _) in pipelines.items():
+        by_pipeline[pipeline].append(span_id)
+
+    for pipeline, span_ids in sorted(by_pipeline.items()):
+        totals = [pipelines[span_id][1] for span_id in span_ids]
+        p99 = percentile(totals, 99)
+        tail_ids = [span_id for span_id in span_ids if pipelines[span_id][1] >= p99]
+
+        print(f"\n🔎 {pipeline}: {len(span_ids)} runs, p50 {percentile(totals, 50):.0f} ms, p99 {p99:.0f} ms")
+        stage_ms: Dict[str, List[float]] = defaultdict(list)
+        tail_ms: Dict[str, float] = defaultdict(float)
+        for span_id in span_ids:
+            for stage in stages_by_parent[span_id]:
+                stage_ms[stage["stage"]].append(stage["ms"])
+                if span_id in tail_ids:
+                    tail_ms[stage["stage"]] += stage["ms"]
+
+        tail_total = sum(pipelines[span_id][1] for span_id in tail_ids) or 1.0
+        print(f"   {'stage':<22} {'p50 ms':>9} {'p99 ms':>9} {'share of p99 runs':>18}")
+        for stage, values in sorted(stage_ms.items(), key=lambda item: -tail_ms[item[0]]):
+            print(f"   {stage:<22} {percentile(values, 50):>9.0f} {percentile(values, 99):>9.0f} "
+                  f"{tail_ms[stage] / tail_total:>17.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
 Test script for Customer Support multi-agent workflow
-This demonstrates the complete flow without requiring actual API keys
+This demonstrates the complete flow without requiring actual API keys;
+pass --fake to run it against the local fake Anthropic API instead, and set
+LLM_CASSETTE_MODE=record (then replay) to capture and re-serve the LLM calls
 """
 
 import asyncio
@@ -13,6 +15,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.services.llm_service import llm_service, orchestrator
 
+if "--fake" in sys.argv:
+    from benchmarks.fake_anthropic import FakeAnthropic, FakeAnthropicConfig, fake_client
+
+    llm_service.client = fake_client(FakeAnthropic(FakeAnthropicConfig(latency_scale=0)))
+
 
 async def test_individual_agents():
     """Test individual agent responses (will fail without API key but shows structure)"""
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+import pytest_asyncio
+
+# Database tests run against a throwaway PostgreSQL database named by
+# TEST_DATABASE_URL; its tables are dropped and recreated for every test.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # The app builds its engines from settings on import, so point them here first
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+
+@pytest_asyncio.fixture
+async def database():
+    """A freshly created schema, with this month's message partitions"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("set TEST_DATABASE_URL to run database tests")
+
+    import app.models  # noqa: F401  registers every table on Base
+    from app.core.database import Base, engine, init_db, read_only_engine
+    from app.services.message_archive_service import message_archive_service
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+    await message_archive_service.ensure_partitions()
+    yield engine
+    # Pools are bound to this test's event loop
+    await engine.dispose()
+    await read_only_engine.dispose()
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Answer LLMService calls in-process from the fake Anthropic API's scripts"""
+    from app.services.llm_service import llm_service
+    from benchmarks.fake_anthropic import FakeAnthropic, FakeAnthropicConfig, in_memory_client
+
+    def install(**scripts) -> FakeAnthropic:
+        fake = FakeAnthropic(FakeAnthropicConfig(latency_scale=0, scripts=scripts))
+        monkeypatch.setattr(llm_service, "client", in_memory_client(fake))
+        return fake
+    return install
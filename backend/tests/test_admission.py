@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.api import llm as llm_api
+from app.main import app
+from app.services.admission_service import AdmissionController, AdmissionRejected, is_critical
+
+
+async def hold(controller: AdmissionController, release: asyncio.Event, log: list, name: str, critical: bool = False):
+    async with controller.slot(critical=critical):
+        log.append(name)
+        await release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_only_urgency_critical_takes_the_priority_lane():
+    assert is_critical({"urgency": "Critical"})
+    assert not is_critical({"urgency": "high"})
+    assert not is_critical(None)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_normal_work_but_queues_critical_work_first():
+    controller = AdmissionController(limit=1, max_queue=1, max_critical_queue=1, queue_timeout=5)
+    release = asyncio.Event()
+    started = []
+    running = asyncio.create_task(hold(controller, release, started, "running"))
+    queued = asyncio.create_task(hold(controller, release, started, "queued"))
+    await settle()
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        async with controller.slot():
+            pass
+    assert excinfo.value.reason == "Pipeline capacity exhausted (queue_full)"
+    assert excinfo.value.retry_after >= 1
+
+    critical = asyncio.create_task(hold(controller, release, started, "critical", critical=True))
+    await settle()
+    assert controller.snapshot()["critical_queued"] == 1
+
+    release.set()
+    await asyncio.gather(running, queued, critical)
+    assert started == ["running", "critical", "queued"]
+    snapshot = controller.snapshot()
+    assert (snapshot["in_flight"], snapshot["queued"], snapshot["critical_queued"]) == (0, 0, 0)
+    assert (snapshot["admitted"], snapshot["waited"], snapshot["rejected"]) == (3, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_waiting_past_the_queue_timeout_is_rejected():
+    controller = AdmissionController(limit=1, max_queue=5, max_critical_queue=5, queue_timeout=0.02)
+    release = asyncio.Event()
+    running = asyncio.create_task(hold(controller, release, [], "running"))
+    await settle()
+
+    with pytest.raises(AdmissionRejected, match="queue_timeout"):
+        async with controller.slot():
+            pass
+
+    release.set()
+    await running
+    assert controller.stats["timed_out"] == 1
+    assert controller.snapshot()["queued"] == 0
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_up_its_place():
+    controller = AdmissionController(limit=1, max_queue=5, max_critical_queue=5, queue_timeout=5)
+    release = asyncio.Event()
+    started = []
+    running = asyncio.create_task(hold(controller, release, started, "running"))
+    abandoned = asyncio.create_task(hold(controller, release, started, "abandoned"))
+    later = asyncio.create_task(hold(controller, release, started, "later"))
+    await settle()
+
+    abandoned.cancel()
+    await settle()
+    release.set()
+    await asyncio.gather(running, later)
+
+    assert started == ["running", "later"]
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_route_answers_503_with_retry_after_at_capacity(monkeypatch):
+    controller = AdmissionController(limit=1, max_queue=0, max_critical_queue=0, queue_timeout=1)
+    controller.in_flight = 1  # another pipeline holds the only slot
+    monkeypatch.setattr(llm_api, "admission_controller", controller)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/llm/customer-support/process", json={"request": "I can't log in"})
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Pipeline capacity exhausted (queue_full)"}
+    assert int(response.headers["retry-after"]) >= 1
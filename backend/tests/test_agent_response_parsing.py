@@ -0,0 +1,86 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services.llm_service import AGENT_RESPONSE_TOOL, llm_service
+
+
+def parse_results(result: str) -> float:
+    return REGISTRY.get_sample_value(
+        "kyoryoku_agent_parse_results_total", {"agent_type": "triage_specialist", "result": result}
+    ) or 0.0
+
+
+def parse(response):
+    """(parsed response, the parse path it was counted under)"""
+    before = {result: parse_results(result) for result in ("structured", "text", "failed")}
+    parsed = llm_service._parse_agent_response(response, "triage_specialist")
+    paths = [result for result, count in before.items() if parse_results(result) > count]
+    assert len(paths) == 1
+    return parsed, paths[0]
+
+
+@pytest.mark.asyncio
+async def test_agent_calls_force_the_response_tool_and_parse_its_input(fake_llm, monkeypatch):
+    fake_llm()
+    sent = []
+    stream_message = llm_service._stream_message
+
+    async def recording(stop_when, **request):
+        sent.append(request)
+        return await stream_message(stop_when, **request)
+
+    monkeypatch.setattr(llm_service, "_stream_message", recording)
+    before = parse_results("structured")
+
+    response = await llm_service.process_agent_request(
+        agent_type="triage_specialist", task="I can't log in", context={}, capabilities=[], goals=[], constraints=[]
+    )
+
+    assert sent[0]["tools"] == [AGENT_RESPONSE_TOOL]
+    assert sent[0]["tool_choice"] == {"type": "tool", "name": "submit_agent_response"}
+    assert response.content.startswith("Category: technical")
+    assert response.confidence == 0.88
+    assert "parse_error" not in response.metadata
+    assert parse_results("structured") - before == 1
+
+
+def test_tool_input_is_validated_and_coerced_without_json_parsing():
+    parsed, path = parse({
+        "escalation_needed": False,
+        "confidence": 0.9,
+        "content": {"category": "billing"},
+        "reasoning": ["Mentions an invoice", "No outage reported"],
+        "suggestions": {"next": "Route to billing"}
+    })
+
+    assert path == "structured"
+    assert parsed.content == '{\n  "category": "billing"\n}'
+    assert parsed.reasoning == "Mentions an invoice. No outage reported"
+    assert parsed.suggestions == ["next: Route to billing"]
+
+
+def test_text_answer_falls_back_to_the_outermost_json_object():
+    parsed, path = parse('Here you go: {"confidence": 0.7, "content": "Route to billing", "reasoning": "Invoice"} Thanks!')
+
+    assert path == "text"
+    assert (parsed.content, parsed.confidence) == ("Route to billing", 0.7)
+
+
+def test_prose_without_json_is_kept_as_content():
+    parsed, path = parse("Route this to billing.")
+
+    assert path == "text"
+    assert parsed.content == "Route this to billing."
+    assert parsed.confidence == 0.7
+
+
+@pytest.mark.parametrize("response", [
+    {"escalation_needed": False, "confidence": "very", "content": "Route to billing", "reasoning": "Invoice"},
+    'Here you go: {"confidence": 0.7, "content": "unterminated}',
+])
+def test_unusable_answers_are_counted_as_failed_and_escalated(response):
+    parsed, path = parse(response)
+
+    assert path == "failed"
+    assert parsed.escalation_needed
+    assert "parse_error" in parsed.metadata
@@ -0,0 +1,81 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.core.database import AsyncSessionLocal
+from app.models import Agent, Team
+from app.models.team import team_members
+from app.schemas.agent import AgentBulkUpdate, AgentCreate
+from app.services.agent_service import AgentService
+
+
+@contextmanager
+def statements(engine):
+    """SQL statements sent while the block runs"""
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield sent
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def create_agents(db, *names):
+    return await AgentService(db).create_agents([AgentCreate(name=name) for name in names])
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_one_statement_with_per_row_fields(database):
+    async with AsyncSessionLocal() as db:
+        triage, research = await create_agents(db, "Triage", "Research")
+        await db.commit()
+
+        with statements(database) as sent:
+            updated = await AgentService(db).update_agents([
+                AgentBulkUpdate(id=research.id, goals=["Cite sources"]),
+                AgentBulkUpdate(id=triage.id, name="Triage v2", description=None),
+                AgentBulkUpdate(id=uuid.uuid4(), name="Missing")
+            ])
+        await db.commit()
+
+        assert len(sent) == 1
+        assert [agent.id for agent in updated] == [research.id, triage.id]
+
+        research_row, triage_row = updated
+        assert research_row.name == "Research"
+        assert research_row.goals == ["Cite sources"]
+        assert triage_row.name == "Triage v2"
+        assert triage_row.goals == []
+        assert triage_row.description is None
+        assert triage_row.updated_at > triage_row.created_at
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_of_unknown_agents_returns_nothing(database):
+    async with AsyncSessionLocal() as db:
+        assert await AgentService(db).update_agents([AgentBulkUpdate(id=uuid.uuid4(), name="Ghost")]) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_removes_team_memberships_in_the_same_statement(database):
+    async with AsyncSessionLocal() as db:
+        triage, research, crafter = Agent(name="Triage"), Agent(name="Research"), Agent(name="Crafter")
+        team = Team(name="Support", agents=[triage, research, crafter])
+        db.add(team)
+        await db.commit()
+
+        with statements(database) as sent:
+            deleted = await AgentService(db).delete_agents([triage.id, research.id, uuid.uuid4()])
+        await db.commit()
+
+        assert len(sent) == 1
+        assert set(deleted) == {triage.id, research.id}
+        remaining = await db.scalars(select(team_members.c.agent_id).where(team_members.c.team_id == team.id))
+        assert remaining.all() == [crafter.id]
+        assert await db.scalar(select(func.count()).select_from(Agent)) == 1
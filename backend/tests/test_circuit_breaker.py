@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from app.core.circuit_breaker import BreakerState, CircuitBreaker, CircuitOpenError
+
+
+class Overloaded(Exception):
+    pass
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise Overloaded()
+
+
+def make_breaker(**overrides) -> CircuitBreaker:
+    options = dict(minimum_calls=4, failure_rate_threshold=0.5, open_seconds=30.0, half_open_calls=2)
+    options.update(overrides)
+    return CircuitBreaker("test", **options)
+
+
+async def record(breaker: CircuitBreaker, *outcomes: bool):
+    for ok in outcomes:
+        try:
+            await breaker.call(succeed if ok else fail)
+        except Overloaded:
+            pass
+
+
+def cool_down(breaker: CircuitBreaker):
+    breaker.opened_at -= breaker.open_seconds
+
+
+@pytest.mark.asyncio
+async def test_stays_closed_below_minimum_calls():
+    breaker = make_breaker()
+    await record(breaker, False, False, False)
+    assert breaker.state == BreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_opens_at_failure_rate_and_short_circuits():
+    breaker = make_breaker()
+    await record(breaker, True, False, True, False)
+    assert breaker.state == BreakerState.OPEN
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        await breaker.call(succeed)
+    assert excinfo.value.retry_after > 0
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    assert breaker.short_circuited == 2
+
+
+@pytest.mark.asyncio
+async def test_opens_on_slow_calls():
+    breaker = make_breaker(slow_call_seconds=0.0, slow_call_rate_threshold=1.0)
+    await record(breaker, True, True, True, True)
+    assert breaker.state == BreakerState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_probes_close_the_breaker():
+    breaker = make_breaker()
+    await record(breaker, False, False, False, False)
+    cool_down(breaker)
+    assert breaker.allows_requests()
+
+    await record(breaker, True)
+    assert breaker.state == BreakerState.HALF_OPEN
+    await record(breaker, True)
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.snapshot()["window_calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_half_open_failure_reopens():
+    breaker = make_breaker()
+    await record(breaker, False, False, False, False)
+    cool_down(breaker)
+
+    await record(breaker, True, False)
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.open_count == 2
+    assert not breaker.allows_requests()
+
+
+@pytest.mark.asyncio
+async def test_half_open_limits_concurrent_probes():
+    breaker = make_breaker(half_open_calls=1)
+    await record(breaker, False, False, False, False)
+    cool_down(breaker)
+    release = asyncio.Event()
+
+    async def slow_probe():
+        await release.wait()
+
+    probe = asyncio.create_task(breaker.call(slow_probe))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(succeed)
+    release.set()
+    await probe
+    assert breaker.state == BreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_ignores_non_failures_and_cancellation():
+    breaker = make_breaker(is_failure=lambda e: not isinstance(e, Overloaded))
+    await record(breaker, False, False, False, False)
+    assert breaker.state == BreakerState.CLOSED
+
+    task = asyncio.create_task(breaker.call(asyncio.sleep, 10))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert breaker.snapshot()["window_calls"] == 4
+
+
+@pytest.mark.asyncio
+async def test_call_started_before_the_trip_is_not_counted_as_a_probe():
+    breaker = make_breaker(half_open_calls=1)
+    release_straggler, release_probe = asyncio.Event(), asyncio.Event()
+    straggler = asyncio.create_task(breaker.call(release_straggler.wait))
+    await asyncio.sleep(0)
+
+    await record(breaker, False, False, False, False)
+    assert breaker.state == BreakerState.OPEN
+    cool_down(breaker)
+    probe = asyncio.create_task(breaker.call(release_probe.wait))
+    await asyncio.sleep(0)
+    assert breaker.state == BreakerState.HALF_OPEN
+
+    # The straggler finishing neither frees the probe slot nor closes the breaker
+    release_straggler.set()
+    await straggler
+    assert breaker.state == BreakerState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(succeed)
+
+    release_probe.set()
+    await probe
+    assert breaker.state == BreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failure_started_before_the_trip_does_not_reopen_a_half_open_breaker():
+    breaker = make_breaker()
+    release = asyncio.Event()
+
+    async def late_failure():
+        await release.wait()
+        raise Overloaded()
+
+    straggler = asyncio.create_task(breaker.call(late_failure))
+    await asyncio.sleep(0)
+    await record(breaker, False, False, False, False)
+    cool_down(breaker)
+    await record(breaker, True)
+
+    release.set()
+    with pytest.raises(Overloaded):
+        await straggler
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert breaker.open_count == 1
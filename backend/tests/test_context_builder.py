@@ -0,0 +1,72 @@
+import json
+
+from app.services.context_builder import TRUNCATION_MARKER, ContextBuilder
+
+TRIAGE_RESULT = {
+    "content": "Category: billing. " * 30,
+    "confidence": 0.8,
+    "escalation_needed": False,
+    "reasoning": "Mentions an invoice and a duplicate charge. " * 8,
+    "suggestions": ["Check the payment provider"] * 10
+}
+# Lowest priority first for solution_researcher: unlisted keys in reverse
+# insertion order (account, customer_notes, urgency), then triage_result
+CONTEXT = {
+    "urgency": "high",
+    "customer_notes": "Customer has written in three times this week. " * 20,
+    "account": {"plan": "pro", "seat_ids": list(range(60))},
+    "triage_result": TRIAGE_RESULT
+}
+
+builder = ContextBuilder(budget=2000)
+
+
+def build(budget: int):
+    text, tokens, trimmed = builder.build("solution_researcher", CONTEXT, budget)
+    assert tokens <= budget
+    return json.loads(text), trimmed
+
+
+def test_context_within_budget_is_sent_whole():
+    text, _, trimmed = builder.build("solution_researcher", CONTEXT)
+    assert json.loads(text) == CONTEXT
+    assert trimmed == []
+
+
+def test_lowest_priority_field_is_dropped_before_higher_ones_are_degraded():
+    context, trimmed = build(500)
+
+    # The prior agent response is left whole, although summarizing it would have fit too
+    assert context["triage_result"] == TRIAGE_RESULT
+    assert "account" not in context
+    assert context["customer_notes"].endswith(TRUNCATION_MARKER)
+    assert trimmed == [
+        {"field": "account", "action": "dropped"},
+        {"field": "customer_notes", "action": "truncated", "chars_removed": 559}
+    ]
+
+
+def test_high_priority_response_is_only_summarized_once_everything_below_it_is_gone():
+    context, trimmed = build(200)
+
+    assert context == {"triage_result": {"content": TRIAGE_RESULT["content"], "confidence": 0.8, "escalation_needed": False}}
+    assert trimmed == [
+        {"field": "account", "action": "dropped"},
+        {"field": "customer_notes", "action": "dropped"},
+        {"field": "urgency", "action": "dropped"},
+        {"field": "triage_result", "action": "summarized"}
+    ]
+
+
+def test_each_field_is_reported_once_with_its_final_action():
+    context, trimmed = build(100)
+
+    assert context["triage_result"]["content"].endswith(TRUNCATION_MARKER)
+    assert [entry["field"] for entry in trimmed] == ["account", "customer_notes", "urgency", "triage_result"]
+    assert trimmed[-1]["action"] == "truncated"
+
+    context, trimmed = build(5)
+    assert context == {}
+    assert [(entry["field"], entry["action"]) for entry in trimmed] == [
+        ("account", "dropped"), ("customer_notes", "dropped"), ("urgency", "dropped"), ("triage_result", "dropped")
+    ]
@@ -0,0 +1,56 @@
+import pytest
+
+from app.services.llm_service import MultiAgentOrchestrator, llm_service
+from benchmarks.fake_anthropic import AgentScript, FakeAnthropic, FakeAnthropicConfig, in_memory_client
+
+
+def triage_fake(**response) -> FakeAnthropic:
+    # Decision fields first, as the prompts ask
+    script = AgentScript(response={
+        **response,
+        "content": "Route to a specialist.",
+        "reasoning": "Scripted triage.",
+        "suggestions": []
+    }, pad_to_tokens=400)
+    return FakeAnthropic(FakeAnthropicConfig(latency_scale=0, scripts={"triage_specialist": script}))
+
+
+@pytest.fixture
+def use_fake(monkeypatch):
+    def install(fake: FakeAnthropic):
+        monkeypatch.setattr(llm_service, "client", in_memory_client(fake))
+    return install
+
+
+async def triage():
+    return await llm_service.process_agent_request(
+        "triage_specialist", "Triage: login fails", {}, [], [], [],
+        stop_when=MultiAgentOrchestrator._triage_escalates
+    )
+
+
+@pytest.mark.asyncio
+async def test_escalation_waits_for_confidence(use_fake):
+    use_fake(triage_fake(escalation_needed=True, confidence=0.35))
+    response = await triage()
+
+    assert response.metadata["early_exit"]
+    assert set(response.metadata["fields_received"]) == {"escalation_needed", "confidence"}
+    assert response.escalation_needed
+    assert response.confidence == 0.35
+    assert "escalation_needed=True" in response.content
+
+
+@pytest.mark.asyncio
+async def test_confident_triage_streams_to_the_end(use_fake):
+    use_fake(triage_fake(escalation_needed=False, confidence=0.9))
+    response = await triage()
+
+    assert "early_exit" not in response.metadata
+    assert response.confidence == 0.9
+    assert response.content.startswith("Route to a specialist.")
+
+
+def test_early_exit_without_confidence_is_rejected():
+    with pytest.raises(ValueError):
+        llm_service._agent_response_from_data({"escalation_needed": True, "metadata": {"early_exit": True}})
@@ -0,0 +1,128 @@
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.api.llm import tenant_context
+from app.services.fair_scheduler import (
+    BATCH, INTERACTIVE, WeightedFairScheduler, current_tenant, current_traffic_class, tenant_scope
+)
+
+
+def make_scheduler() -> WeightedFairScheduler:
+    return WeightedFairScheduler(
+        capacity=1,
+        class_weights={INTERACTIVE: 4.0, BATCH: 1.0},
+        tenant_weights={"acme": 3.0}
+    )
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def serve_in_order(scheduler: WeightedFairScheduler, calls) -> list:
+    """Queue every (tenant, class) call behind a held slot and return the order they ran in"""
+    order = []
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async def call(tenant, traffic_class, index):
+        with tenant_scope(tenant, traffic_class):
+            async with scheduler.slot():
+                order.append((tenant, traffic_class, index))
+
+    held = asyncio.create_task(blocker())
+    await settle()
+    tasks = [asyncio.create_task(call(tenant, traffic_class, i)) for i, (tenant, traffic_class) in enumerate(calls)]
+    await settle()
+    assert scheduler.snapshot()["queued"] == len(calls)
+
+    release.set()
+    await asyncio.gather(held, *tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_slots_are_shared_by_tenant_weight():
+    scheduler = make_scheduler()
+    # The flooding tenant queues first and still only gets its share
+    calls = [("globex", BATCH)] * 12 + [("acme", BATCH)] * 12
+
+    order = await serve_in_order(scheduler, calls)
+
+    first_eight = Counter(tenant for tenant, _, _ in order[:8])
+    assert first_eight == {"acme": 6, "globex": 2}
+    assert scheduler.snapshot() == {"capacity": 1, "in_flight": 0, "queued": 0, "flows": []}
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_outweigh_batch_calls_of_the_same_tenant():
+    scheduler = make_scheduler()
+    calls = [("globex", BATCH)] * 10 + [("globex", INTERACTIVE)] * 10
+
+    order = await serve_in_order(scheduler, calls)
+
+    assert Counter(traffic_class for _, traffic_class, _ in order[:10]) == {INTERACTIVE: 8, BATCH: 2}
+
+
+@pytest.mark.asyncio
+async def test_calls_within_a_flow_run_first_in_first_out():
+    scheduler = make_scheduler()
+    calls = [("acme", BATCH), ("globex", INTERACTIVE), ("globex", BATCH)] * 5
+
+    order = await serve_in_order(scheduler, calls)
+
+    for flow in set(calls):
+        indexes = [index for tenant, traffic_class, index in order if (tenant, traffic_class) == flow]
+        assert indexes == sorted(indexes)
+        assert len(indexes) == 5
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_skipped():
+    scheduler = make_scheduler()
+    release = asyncio.Event()
+    ran = []
+
+    async def call(name, wait=False):
+        async with scheduler.slot():
+            ran.append(name)
+            if wait:
+                await release.wait()
+
+    first = asyncio.create_task(call("first", wait=True))
+    await settle()
+    abandoned, last = asyncio.create_task(call("abandoned")), asyncio.create_task(call("last"))
+    await settle()
+    abandoned.cancel()
+    await settle()
+    release.set()
+    await asyncio.gather(first, last)
+
+    assert ran == ["first", "last"]
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers, expected", [
+    ({}, ("anonymous", BATCH)),
+    ({"X-Tenant-ID": "acme", "X-Traffic-Class": "interactive"}, ("acme", INTERACTIVE)),
+])
+async def test_request_headers_pick_the_tenant_and_class(headers, expected):
+    app = FastAPI(dependencies=[Depends(tenant_context)])
+
+    @app.get("/whoami")
+    async def whoami():
+        return [current_tenant.get(), current_traffic_class.get()]
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/whoami", headers=headers)
+
+    assert tuple(response.json()) == expected
@@ -0,0 +1,102 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.api import health as health_api
+from app.core.config import settings
+from app.main import app
+from app.services.health_service import HealthMonitor
+
+
+async def ok():
+    pass
+
+
+async def down():
+    raise ConnectionError("connection refused")
+
+
+async def hangs():
+    await asyncio.sleep(10)
+
+
+def monitor_with(monkeypatch, database=ok, redis=ok, llm=ok, llm_key="sk-test") -> HealthMonitor:
+    monitor = HealthMonitor(interval=60, llm_interval=60, timeout=0.05)
+    monkeypatch.setattr(monitor, "_check_database", database)
+    monkeypatch.setattr(monitor, "_check_redis", redis)
+    monkeypatch.setattr(monitor, "_check_llm", llm)
+    monkeypatch.setattr(monitor, "_refresh_session_gauges", ok)
+    monkeypatch.setattr(settings, "ANTHROPIC_API_KEY", llm_key)
+    monkeypatch.setattr(health_api, "health_monitor", monitor)
+    return monitor
+
+
+@pytest.fixture
+def client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_ready_is_503_while_the_database_is_down(monkeypatch, client):
+    monitor = monitor_with(monkeypatch, database=down)
+    await monitor.refresh()
+
+    async with client:
+        response = await client.get("/api/health/ready")
+
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "unhealthy"
+    assert body["services"]["database"]["status"] == "unhealthy"
+    assert body["services"]["database"]["error"] == "connection refused"
+
+
+@pytest.mark.asyncio
+async def test_ready_stays_200_with_redis_down_but_reports_degraded(monkeypatch, client):
+    monitor = monitor_with(monkeypatch, redis=hangs)
+    await monitor.refresh()
+
+    async with client:
+        response = await client.get("/api/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+    assert response.json()["services"]["redis"]["error"] == "TimeoutError"
+
+
+@pytest.mark.asyncio
+async def test_missing_llm_key_is_not_applicable_rather_than_degraded(monkeypatch):
+    monitor = monitor_with(monkeypatch, llm=down, llm_key="")
+    await monitor.refresh(include_llm=True)
+
+    snapshot = monitor.snapshot()
+    assert snapshot["services"]["llm"]["status"] == "not applicable"
+    assert snapshot["status"] == "healthy"
+
+
+@pytest.mark.asyncio
+async def test_llm_is_checked_only_on_its_own_interval(monkeypatch):
+    calls = []
+
+    async def llm():
+        calls.append(1)
+
+    monitor = monitor_with(monkeypatch, llm=llm)
+    await monitor.refresh()
+    await monitor.refresh()
+
+    assert len(calls) == 1
+    assert monitor.snapshot()["status"] == "healthy"
+
+
+@pytest.mark.asyncio
+async def test_live_tracks_the_background_loop(monkeypatch, client):
+    monitor = monitor_with(monkeypatch)
+    async with client:
+        assert (await client.get("/api/health/live")).status_code == 503
+        monitor.start()
+        try:
+            assert (await client.get("/api/health/live")).json() == {"status": "alive"}
+        finally:
+            await monitor.stop()
@@ -0,0 +1,102 @@
+import fakeredis
+import pytest
+from pydantic import BaseModel
+
+from app.api.llm import _completed_normally
+from app.services import idempotency_service as idempotency_module
+from app.services.idempotency_service import IdempotencyService
+from app.services.llm_service import AgentResponse, orchestrator
+from benchmarks.fake_anthropic import AgentScript
+
+
+class Payload(BaseModel):
+    request: str
+
+
+def stage(**metadata) -> AgentResponse:
+    return AgentResponse(content="Done", confidence=0.9, reasoning="Checked", metadata=metadata)
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis()
+    monkeypatch.setattr(idempotency_module, "get_redis", lambda: client)
+    return client
+
+
+@pytest.mark.parametrize("results", [
+    {"triage": stage(error="overloaded"), "research": stage(), "response": stage()},
+    {"triage": stage(), "research": stage(circuit_open=True)},
+    {"triage": stage(circuit_open=True), "escalation": stage()},
+    {"strategy": stage(), "production": stage(error="rate limited"), "final_content": ""},
+    {"experience_analysis": stage(circuit_open=True), "coordination_plan": stage()},
+    {"triage": stage(), "research": stage(parse_error="Expecting value: line 1 column 1 (char 0)")},
+    {"iterations": {"iteration_1": {"voice": stage()}, "iteration_2": {"hooks": stage(error="timed out")}}},
+])
+def test_failed_stage_anywhere_is_not_storable(results):
+    assert not _completed_normally(results)
+
+
+def test_successful_stages_are_storable():
+    results = {
+        "triage": stage(),
+        "iterations": {"iteration_1": {"voice": stage(), "overall_confidence": 0.9}},
+        "final_content": "Done"
+    }
+    assert _completed_normally(results)
+
+
+@pytest.mark.asyncio
+async def test_errored_stage_is_neither_stored_nor_replayed(redis_client):
+    service = IdempotencyService(poll_interval=0.01)
+    runs = []
+
+    async def run():
+        runs.append(1)
+        return {"triage": stage(error="overloaded")}
+
+    for _ in range(2):
+        result, replayed = await service.run("key-1", "customer-support", Payload(request="help"), run, _completed_normally)
+        assert not replayed
+        assert result["triage"].metadata["error"] == "overloaded"
+
+    assert len(runs) == 2
+    assert await redis_client.get("idempotency:customer-support:key-1") is None
+
+
+@pytest.mark.asyncio
+async def test_completed_pipeline_is_replayed(redis_client):
+    service = IdempotencyService(poll_interval=0.01)
+    runs = []
+
+    async def run():
+        runs.append(1)
+        return {"triage": stage()}
+
+    await service.run("key-2", "customer-support", Payload(request="help"), run, _completed_normally)
+    result, replayed = await service.run("key-2", "customer-support", Payload(request="help"), run, _completed_normally)
+
+    assert replayed
+    assert result["triage"]["content"] == "Done"
+    assert len(runs) == 1
+
+
+@pytest.mark.asyncio
+async def test_unparsable_stage_is_rerun_rather_than_replayed(redis_client, fake_llm):
+    fake_llm(solution_researcher=AgentScript(response={
+        "content": "Reset the token", "confidence": "fairly sure", "reasoning": "Known issue"
+    }))
+    service = IdempotencyService(poll_interval=0.01)
+    runs = []
+
+    async def run():
+        runs.append(1)
+        return await orchestrator.process_customer_support_request("I can't log in")
+
+    for _ in range(2):
+        result, replayed = await service.run("key-3", "customer-support", Payload(request="help"), run, _completed_normally)
+        assert not replayed
+        assert "parse_error" in result["research"].metadata
+
+    assert len(runs) == 2
+    assert await redis_client.get("idempotency:customer-support:key-3") is None
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from app.core.json_stream import IncrementalJSONObjectParser
+
+DOCUMENT = json.dumps({
+    "escalation_needed": False,
+    "confidence": 0.82,
+    "content": 'Reset the token, then retry: "login}" {fails}, ok?',
+    "reasoning": "Path C:\\temp\\x; caf\u00e9 \u2014 quote \\\" and brace ]",
+    "suggestions": ["a, b", {"nested": [1, {"deep": "}"}]}, []],
+    "metadata": {"tags": ["x", "y"], "empty": {}},
+    "note": None
+}, ensure_ascii=True)
+
+
+def feed_chunks(chunks):
+    parser = IncrementalJSONObjectParser()
+    completed = []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return parser, completed
+
+
+@pytest.mark.parametrize("split", range(1, len(DOCUMENT)))
+def test_any_two_way_split(split):
+    parser, completed = feed_chunks([DOCUMENT[:split], DOCUMENT[split:]])
+    assert parser.complete
+    assert parser.fields == json.loads(DOCUMENT)
+    assert [key for key, _ in completed] == list(json.loads(DOCUMENT))
+
+
+def test_one_character_at_a_time():
+    parser, completed = feed_chunks(DOCUMENT)
+    assert dict(completed) == json.loads(DOCUMENT)
+    assert parser.complete
+
+
+def test_escape_split_across_chunks():
+    parser, _ = feed_chunks(['{"content": "a\\', '"b\\', '\\c\\u00', 'e9", "confidence": 1}'])
+    assert parser.fields == {"content": 'a"b\\c\u00e9', "confidence": 1}
+
+
+def test_field_completes_when_its_terminator_arrives():
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"escalation_needed": true') == []
+    assert parser.feed(', "confidence": 0.4') == [("escalation_needed", True)]
+    assert parser.feed(', "content": "x, y"') == [("confidence", 0.4)]
+    assert "content" not in parser.fields
+    assert parser.feed("}") == [("content", "x, y")]
+
+
+def test_nested_value_completes_once_whole():
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"suggestions": [{"a": "],"}, ') == []
+    assert parser.feed('[1, 2]], "confidence": 0.9}') == [
+        ("suggestions", [{"a": "],"}, [1, 2]]),
+        ("confidence", 0.9)
+    ]
+
+
+def test_ignores_text_after_the_object():
+    parser, completed = feed_chunks(['{"a": 1}', ' trailing {"b": 2}'])
+    assert parser.complete
+    assert parser.fields == {"a": 1}
+    assert completed == [("a", 1)]
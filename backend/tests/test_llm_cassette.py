@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from app.services.llm_cassette import CassetteMiss, LLMCassette
+from app.services.llm_service import MultiAgentOrchestrator, llm_service, orchestrator
+from benchmarks.fake_anthropic import DEFAULT_SCRIPTS, AgentScript
+
+ESCALATING_TRIAGE = AgentScript(response={
+    **DEFAULT_SCRIPTS["triage_specialist"].response,
+    "escalation_needed": True,
+    "confidence": 0.3
+})
+
+
+@pytest.fixture
+def use_cassette(monkeypatch, tmp_path):
+    path = tmp_path / "llm.jsonl"
+
+    def install(mode: str) -> LLMCassette:
+        cassette = LLMCassette(path, mode)
+        monkeypatch.setattr(llm_service, "cassette", cassette)
+        return cassette
+    return install
+
+
+async def ask(agent_type: str, **kwargs):
+    return await llm_service.process_agent_request(agent_type, "Help: login fails", {}, [], [], [], **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_records_then_replays_by_fingerprint(fake_llm, use_cassette):
+    fake_llm()
+    use_cassette("record")
+    recorded = await ask("solution_researcher")
+
+    fake_llm(solution_researcher=ESCALATING_TRIAGE)  # a live call would now answer differently
+    use_cassette("replay")
+    replayed = await ask("solution_researcher")
+
+    assert replayed.content == recorded.content
+    assert replayed.confidence == recorded.confidence
+
+
+@pytest.mark.asyncio
+async def test_recording_drains_an_early_exit_stream(fake_llm, use_cassette):
+    fake_llm(triage_specialist=ESCALATING_TRIAGE)
+    cassette = use_cassette("record")
+    response = await ask("triage_specialist", stop_when=MultiAgentOrchestrator._triage_escalates)
+
+    assert "early_exit" not in response.metadata
+    recorded = json.loads(cassette.path.read_text())
+    assert recorded["response"]["content"] == response.content
+    assert recorded["response"]["escalation_needed"] is True
+
+
+@pytest.mark.asyncio
+async def test_pipeline_with_an_early_exit_replays_end_to_end(fake_llm, use_cassette):
+    fake_llm(triage_specialist=ESCALATING_TRIAGE)
+    use_cassette("record")
+    recorded = await orchestrator.process_customer_support_request("I can't log in", {"customer_tier": "premium"})
+    assert "escalation" in recorded
+
+    fake_llm()  # live calls would no longer escalate
+    use_cassette("replay")
+    replayed = await orchestrator.process_customer_support_request("I can't log in", {"customer_tier": "premium"})
+
+    assert list(replayed) == list(recorded)
+    for stage, response in recorded.items():
+        assert replayed[stage].content == response.content
+        assert replayed[stage].escalation_needed == response.escalation_needed
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_raises(use_cassette):
+    cassette = use_cassette("replay")
+    with pytest.raises(CassetteMiss):
+        await cassette.replay({"model": "m", "messages": []})
@@ -0,0 +1,85 @@
+import argparse
+import functools
+
+import httpx
+import pytest
+
+from app.main import app
+from benchmarks import load_test
+from benchmarks.load_test import compare, histogram_quantile, percentile, stage_breakdown
+
+
+def load_args(**overrides) -> argparse.Namespace:
+    options = dict(
+        url="http://test", target="customer-support", mode="closed", concurrency=2, think_ms=0.0, rate=50.0,
+        duration=30.0, requests=6, tenants=2, traffic_class="interactive", team_id=None, project=True,
+        timeout=30.0, max_connections=10, seed=0
+    )
+    options.update(overrides)
+    return argparse.Namespace(**options)
+
+
+def report(p95_ms=100.0, throughput_rps=10.0, error_rate=0.0, stage_p95_ms=50.0):
+    return {
+        "summary": {"p50_ms": 50.0, "p95_ms": p95_ms, "p99_ms": 150.0, "throughput_rps": throughput_rps, "error_rate": error_rate},
+        "stages": {"customer_support.triage": {"p95_ms": stage_p95_ms}}
+    }
+
+
+def test_percentile_interpolates_between_samples():
+    assert percentile([], 95) == 0.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 95) == pytest.approx(4.8)
+
+
+def test_histogram_quantile_interpolates_within_the_bucket():
+    buckets = [(0.5, 0.0), (1.0, 50.0), (2.0, 100.0), (float("inf"), 100.0)]
+    assert histogram_quantile(0.5, buckets) == 1.0
+    assert histogram_quantile(0.75, buckets) == 1.5
+    assert histogram_quantile(0.5, []) == 0.0
+
+
+def test_stage_breakdown_only_counts_observations_made_during_the_run():
+    before = {"support.triage": {"buckets": {1.0: 10.0, float("inf"): 10.0}, "count": 10.0, "sum": 5.0}}
+    after = {
+        "support.triage": {"buckets": {1.0: 10.0, 2.0: 14.0, float("inf"): 14.0}, "count": 14.0, "sum": 11.0},
+        "support.research": {"buckets": {1.0: 2.0, float("inf"): 2.0}, "count": 2.0, "sum": 1.0}
+    }
+
+    breakdown = stage_breakdown(before, after)
+
+    assert breakdown["support.triage"]["count"] == 4
+    assert breakdown["support.triage"]["mean_ms"] == 1500.0
+    assert 1000.0 < breakdown["support.triage"]["p50_ms"] <= 2000.0
+    assert breakdown["support.research"]["count"] == 2
+
+
+def test_compare_flags_latency_throughput_error_and_stage_regressions():
+    baseline = report()
+    assert compare(report(p95_ms=110.0), baseline, tolerance=0.15, error_tolerance=0.01) == []
+
+    regressions = compare(
+        report(p95_ms=130.0, throughput_rps=8.0, error_rate=0.05, stage_p95_ms=80.0),
+        baseline, tolerance=0.15, error_tolerance=0.01
+    )
+    assert [regression.split(" ")[0] for regression in regressions] == ["p95_ms", "throughput", "error", "stage"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["closed", "open"])
+async def test_run_reports_latency_and_stage_breakdown_against_the_app(mode, fake_llm, monkeypatch):
+    fake_llm()
+    monkeypatch.setattr(
+        load_test.httpx, "AsyncClient",
+        functools.partial(httpx.AsyncClient, transport=httpx.ASGITransport(app=app))
+    )
+
+    result = await load_test.run(load_args(mode=mode))
+
+    summary = result["summary"]
+    assert summary["requests"] == summary["ok"] == 6
+    assert summary["status_codes"] == {"200": 6}
+    assert summary["error_rate"] == 0.0
+    assert 0 < summary["p50_ms"] <= summary["p95_ms"] <= summary["max_ms"]
+    assert result["stages"]["customer_support.triage"]["count"] == 6
+    assert compare(result, result, tolerance=0.0, error_tolerance=0.0) == []
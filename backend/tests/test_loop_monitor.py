@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.loop_monitor import EventLoopMonitor
+
+
+def block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_block_is_measured_and_its_stack_captured():
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.05, recent_blocks=5)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        window = monitor.open_window()
+        block_the_loop(0.2)
+        await asyncio.sleep(0.05)
+        lag = monitor.close_window(window)
+        snapshot = monitor.snapshot()
+    finally:
+        await monitor.stop()
+
+    assert lag["monitored"]
+    assert lag["stalls"] == 1
+    assert lag["blocked_ms"] >= 150
+    assert snapshot["blocks"] == 1
+    block = snapshot["recent_blocks"][0]
+    assert block["duration_ms"] >= 150
+    assert any("block_the_loop" in line for line in block["stack"])
+    assert not monitor.running
+
+
+@pytest.mark.asyncio
+async def test_window_without_a_running_monitor():
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+    window = monitor.open_window()
+    await asyncio.sleep(0.03)
+    assert monitor.close_window(window) == {
+        "ticks": 0, "max_lag_ms": 0.0, "blocked_ms": 0.0, "stalls": 0, "monitored": False
+    }
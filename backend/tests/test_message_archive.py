@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.core.database import AsyncSessionLocal
+from app.models import Message, Session, Team
+from app.models.message import MessageType
+from app.services import session_service as session_service_module
+from app.services.message_archive_service import MessageArchiveService
+from app.services.session_service import SessionService
+
+NOW = datetime.utcnow()
+
+
+async def seed_session(db, created_at: datetime, *timestamps: datetime):
+    team = Team(name="Support")
+    db.add(team)
+    await db.flush()
+    session = Session(team_id=team.id, task_description="Help", created_at=created_at)
+    db.add(session)
+    await db.flush()
+    db.add_all([
+        Message(session_id=session.id, message_type=MessageType.RESPONSE, content=f"Message {i}", timestamp=timestamp)
+        for i, timestamp in enumerate(timestamps)
+    ])
+    await db.commit()
+    return session.id
+
+
+async def rows_in(db, table: str) -> int:
+    return await db.scalar(text(f"SELECT count(*) FROM {table}"))
+
+
+@pytest.mark.asyncio
+async def test_late_partition_takes_its_rows_from_the_default_partition(database, tmp_path):
+    service = MessageArchiveService(str(tmp_path), retention_days=0)
+    far_future = NOW + timedelta(days=200)
+    async with AsyncSessionLocal() as db:
+        session_id = await seed_session(db, NOW, far_future, far_future + timedelta(hours=1))
+        assert await rows_in(db, "messages_default") == 2
+
+    await service.ensure_partitions(now=far_future)
+    await service.ensure_partitions(now=far_future)  # later runs find nothing to do
+
+    async with AsyncSessionLocal() as db:
+        partition = f"messages_y{far_future.year:04d}m{far_future.month:02d}"
+        assert await rows_in(db, "messages_default") == 0
+        assert await rows_in(db, partition) == 2
+        assert await db.scalar(select(func.count()).where(Message.session_id == session_id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_session_spanning_the_cutoff_reads_archived_and_hot_messages(database, tmp_path, monkeypatch):
+    service = MessageArchiveService(str(tmp_path), retention_days=30)
+    monkeypatch.setattr(session_service_module, "message_archive_service", service)
+    long_ago = NOW - timedelta(days=120)
+    await service.ensure_partitions(now=long_ago)
+    async with AsyncSessionLocal() as db:
+        session_id = await seed_session(db, long_ago, NOW, long_ago, long_ago + timedelta(minutes=5))
+
+    archived = await service.archive_expired_partitions()
+    assert f"messages_y{long_ago.year:04d}m{long_ago.month:02d}" in archived
+
+    async with AsyncSessionLocal() as db:
+        messages = await SessionService(db).get_session_messages(session_id)
+    assert [message.content for message in messages] == ["Message 1", "Message 2", "Message 0"]
@@ -0,0 +1,76 @@
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.metrics import OTHER, bounded_label
+from app.main import app
+from app.services.llm_service import AGENT_MODEL, llm_service, orchestrator
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_unknown_label_values_collapse_to_other():
+    assert bounded_label("triage_specialist", {"triage_specialist"}) == "triage_specialist"
+    assert bounded_label("made_up_agent", {"triage_specialist"}) == OTHER
+    assert bounded_label(None, {"triage_specialist"}) == OTHER
+
+
+@pytest.mark.asyncio
+async def test_pipeline_run_records_llm_stage_and_pipeline_metrics(fake_llm):
+    fake_llm()
+    llm_calls = dict(name="kyoryoku_llm_call_seconds_count", agent_type="triage_specialist", model=AGENT_MODEL, outcome="ok")
+    input_tokens = dict(name="kyoryoku_llm_tokens_total", agent_type="triage_specialist", model=AGENT_MODEL, direction="input")
+    stages = dict(name="kyoryoku_pipeline_stage_seconds_count", pipeline="customer_support", stage="triage")
+    pipelines = dict(name="kyoryoku_pipeline_seconds_count", pipeline="customer_support", outcome="ok")
+    parsed = dict(name="kyoryoku_agent_parse_results_total", agent_type="triage_specialist", result="structured")
+    watched = [llm_calls, input_tokens, stages, pipelines, parsed]
+    before = [sample(**labels) for labels in watched]
+
+    await orchestrator.process_customer_support_request("I can't log in")
+
+    llm_delta, token_delta, stage_delta, pipeline_delta, parse_delta = (
+        sample(**labels) - previous for labels, previous in zip(watched, before)
+    )
+    assert llm_delta == 1
+    assert token_delta > 0
+    assert stage_delta == 1
+    assert pipeline_delta == 1
+    assert parse_delta == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_llm_call_is_labelled_error(fake_llm, monkeypatch):
+    fake_llm()
+
+    async def overloaded(*args, **kwargs):
+        raise RuntimeError("overloaded")
+
+    monkeypatch.setattr(llm_service, "_stream_message", overloaded)
+    # Keep the failure out of the shared breaker's window
+    monkeypatch.setattr(llm_service, "breaker", CircuitBreaker("anthropic"))
+    errors = dict(name="kyoryoku_llm_call_seconds_count", agent_type="other", model=AGENT_MODEL, outcome="error")
+    before = sample(**errors)
+
+    response = await llm_service.process_agent_request(
+        agent_type="made_up_agent", task="Help", context={}, capabilities=[], goals=[], constraints=[]
+    )
+
+    assert response.metadata["error"] == "overloaded"
+    assert sample(**errors) - before == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_app_and_pool_metrics():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE kyoryoku_llm_call_seconds histogram" in body
+    assert "# TYPE kyoryoku_admission_in_flight gauge" in body
+    assert 'kyoryoku_db_pool_size{engine="read_write"}' in body
+    assert 'kyoryoku_db_pool_checked_out{engine="read_only"}' in body
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from app.services.event_service import PipelineEventPublisher, session_room
+from app.services.llm_service import orchestrator
+
+
+class RecordingServer:
+    def __init__(self):
+        self.emits = []
+
+    async def emit(self, event, data, room=None):
+        self.emits.append((event, room, [item["event"] for item in data["events"]]))
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_into_one_emit_per_room():
+    server = RecordingServer()
+    publisher = PipelineEventPublisher(max_buffer=100, flush_interval=0.01, max_batch=100)
+    publisher.start(server)
+    try:
+        for event in ("pipeline_started", "stage_started", "stage_finished"):
+            publisher.publish("session:a", event, {})
+        publisher.publish("session:b", "pipeline_started", {})
+        await asyncio.sleep(0.05)
+    finally:
+        await publisher.stop()
+
+    assert sorted(server.emits) == [
+        ("pipeline_events", "session:a", ["pipeline_started", "stage_started", "stage_finished"]),
+        ("pipeline_events", "session:b", ["pipeline_started"])
+    ]
+    assert publisher.stats == {"published": 4, "emitted": 4, "dropped": 0, "batches": 1}
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops_the_oldest_event():
+    server = RecordingServer()
+    publisher = PipelineEventPublisher(max_buffer=2, flush_interval=10, max_batch=100)
+    publisher.start(server)
+    for event in ("first", "second", "third"):
+        publisher.publish("session:a", event, {})
+    await publisher.stop()
+
+    assert server.emits == [("pipeline_events", "session:a", ["second", "third"])]
+    assert publisher.stats["dropped"] == 1
+
+
+def test_publishing_without_a_running_publisher_is_a_no_op():
+    publisher = PipelineEventPublisher(max_buffer=10, flush_interval=0.01, max_batch=10)
+    publisher.for_session("abc")("stage_started", {})
+    assert publisher.stats["published"] == 0
+    assert session_room("abc") == "session:abc"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reports_each_stage_start_and_result(fake_llm):
+    fake_llm()
+    events = []
+    await orchestrator.process_guest_concierge_request(
+        "Plan an evening out", progress=lambda event, data: events.append((event, data))
+    )
+
+    assert [(event, data["stage"]) for event, data in events] == [
+        ("stage_started", "experience_analysis"),
+        ("stage_finished", "experience_analysis"),
+        ("stage_started", "coordination_plan"),
+        ("stage_finished", "coordination_plan")
+    ]
+    finished = events[-1][1]
+    assert finished["agent_type"] == "concierge_coordinator"
+    assert finished["response"]["content"].startswith("Reservations confirmed")
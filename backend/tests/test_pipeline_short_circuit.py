@@ -0,0 +1,94 @@
+import time
+
+import httpx
+import pytest
+
+from app.core.circuit_breaker import BreakerState, CircuitBreaker, CircuitOpenError
+from app.core.database import AsyncSessionLocal
+from app.main import app
+from app.models import Session, Team
+from app.models.session import SessionStatus
+from app.services.llm_service import llm_service, orchestrator
+from app.services.session_service import SessionService
+
+PIPELINES = {
+    "customer_support": lambda progress: orchestrator.process_customer_support_request(
+        "I can't log in", progress=progress
+    ),
+    "content_creation": lambda progress: orchestrator.process_content_creation_request(
+        "Notes from the onboarding interviews", iterations=1, progress=progress
+    ),
+    "content_marketing": lambda progress: orchestrator.process_content_marketing_request(
+        "Launch post for the new analytics feature", progress=progress
+    ),
+    "guest_concierge": lambda progress: orchestrator.process_guest_concierge_request(
+        "A quiet dinner for two tonight", progress=progress
+    ),
+}
+
+
+@pytest.fixture
+def breaker(monkeypatch) -> CircuitBreaker:
+    breaker = CircuitBreaker("anthropic", open_seconds=30.0)
+    monkeypatch.setattr(llm_service, "breaker", breaker)
+    return breaker
+
+
+def trip(breaker: CircuitBreaker):
+    breaker.state = BreakerState.OPEN
+    breaker.opened_at = time.monotonic()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pipeline", PIPELINES)
+async def test_breaker_opening_mid_pipeline_stops_it_with_circuit_open_error(pipeline, breaker, fake_llm):
+    fake_llm()
+    events = []
+
+    def progress(event, data):
+        events.append(event)
+        if event == "stage_finished":
+            trip(breaker)
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        await PIPELINES[pipeline](progress)
+
+    assert excinfo.value.retry_after > 0
+    assert events == ["stage_started", "stage_finished", "pipeline_short_circuited"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, body", [
+    ("/api/llm/customer-support/process", {"request": "I can't log in"}),
+    ("/api/llm/content-creation/process", {"source_material": "Interview notes"}),
+    ("/api/llm/content-marketing/process", {"request": "Launch post"}),
+    ("/api/llm/guest-concierge/process", {"guest_request": "Dinner for two"}),
+])
+async def test_open_breaker_is_503_with_retry_after(path, body, breaker):
+    trip(breaker)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(path, json=body)
+
+    assert response.status_code == 503
+    assert 1 <= int(response.headers["retry-after"]) <= 30
+
+
+@pytest.mark.asyncio
+async def test_session_is_routed_to_a_human_while_the_breaker_is_open(database, breaker):
+    trip(breaker)
+    async with AsyncSessionLocal() as db:
+        team = Team(name="Support")
+        db.add(team)
+        await db.flush()
+        session = Session(team_id=team.id, task_description="I can't log in", scenario_type="customer_support")
+        db.add(session)
+        await db.commit()
+
+        session = await SessionService(db).start_session(session.id)
+        await db.commit()
+        messages = await SessionService(db).get_session_messages(session.id)
+
+    assert session.status == SessionStatus.COMPLETED
+    assert session.metrics["circuit_open"] is True
+    assert session.metrics["requires_human_review"] is True
+    assert [message.message_metadata["agent_type"] for message in messages] == ["escalation"]
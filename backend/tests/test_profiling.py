@@ -0,0 +1,58 @@
+import json
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app.core.profiling import PROFILE_ID_HEADER, ProfileStore, ProfilingMiddleware
+from app.services.loop_monitor import EventLoopMonitor
+
+
+@pytest.fixture
+def store(tmp_path) -> ProfileStore:
+    return ProfileStore(str(tmp_path / "profiles"), max_profiles=2)
+
+
+@pytest_asyncio.fixture
+async def client(store):
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        time.sleep(0.1)  # blocks the event loop on purpose
+        return {"ok": True}
+
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.02)
+    monitor.start()
+    profiled = ProfilingMiddleware(app, store=store, monitor=monitor)
+    yield httpx.AsyncClient(transport=httpx.ASGITransport(app=profiled), base_url="http://test")
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_profiled_request_stores_a_speedscope_file_and_loop_lag(client, store):
+    async with client:
+        response = await client.get("/slow", params={"profile": "1"}, headers={"X-Request-ID": "req-1"})
+
+    assert response.headers[PROFILE_ID_HEADER] == "req-1"
+    assert json.loads(store.profile_path("req-1").read_text())["$schema"].startswith("https://www.speedscope.app")
+    summary, = store.summaries()
+    assert (summary["request_id"], summary["path"], summary["status"]) == ("req-1", "/slow", 200)
+    assert summary["duration_ms"] >= 100
+    assert summary["loop"]["monitored"]
+    assert summary["loop"]["stalls"] >= 1
+    assert summary["loop"]["blocked_ms"] >= 80
+
+
+@pytest.mark.asyncio
+async def test_requests_are_only_profiled_on_request_and_old_profiles_are_pruned(client, store):
+    async with client:
+        assert PROFILE_ID_HEADER not in (await client.get("/slow")).headers
+        for _ in range(3):
+            response = await client.get("/slow", headers={"X-Profile": "true", "X-Request-ID": "../etc/passwd"})
+            assert response.headers[PROFILE_ID_HEADER] != "../etc/passwd"
+
+    assert len(store.summaries()) == 2
+    assert store.profile_path("../etc/passwd") is None
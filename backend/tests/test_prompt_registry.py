@@ -0,0 +1,113 @@
+import os
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services.llm_service import llm_service
+from app.services.prompt_registry import PromptRegistry
+
+TRIAGE = "You are a triage specialist. Capabilities: {capabilities}. Goals: {goals}. Constraints: {constraints}."
+
+
+def write(path, text: str, mtime: float):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def prompts(tmp_path):
+    write(tmp_path / "triage_specialist.txt", TRIAGE, 1_000)
+    write(tmp_path / "story_miner.txt", "You find stories. Goals: {goals}.", 1_000)
+    return tmp_path
+
+
+def render(registry: PromptRegistry, agent_type: str = "triage_specialist", goals=("Route fast",)):
+    return registry.render(agent_type, ["Classify"], list(goals), ["Be brief"])
+
+
+def test_renders_templates_with_a_content_hash_version(prompts):
+    registry = PromptRegistry(prompts, reload_interval=0, cache_size=8, suffix="\n\nUse the tool.")
+
+    prompt, version = render(registry)
+
+    assert prompt == (
+        "You are a triage specialist. Capabilities: Classify. Goals: Route fast. Constraints: Be brief."
+        "\n\nUse the tool."
+    )
+    assert version.startswith("triage_specialist@") and len(version) == len("triage_specialist@") + 12
+    assert render(registry, "unknown_agent")[1] == version
+
+
+def test_edited_template_is_picked_up_on_the_next_due_check(prompts, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.services.prompt_registry.time.monotonic", lambda: clock[0])
+    registry = PromptRegistry(prompts, reload_interval=5, cache_size=8)
+    before, old_version = render(registry)
+
+    write(prompts / "triage_specialist.txt", TRIAGE.replace("triage specialist", "triage lead"), 2_000)
+    clock[0] += 1
+    assert render(registry) == (before, old_version)
+
+    clock[0] += 5
+    after, new_version = render(registry)
+    assert new_version != old_version
+    assert after.startswith("You are a triage lead.")
+
+
+def test_reload_interval_zero_only_reloads_on_request(prompts):
+    registry = PromptRegistry(prompts, reload_interval=0, cache_size=8)
+    old_version = render(registry)[1]
+
+    write(prompts / "triage_specialist.txt", TRIAGE + " Reply in English.", 2_000)
+    assert render(registry)[1] == old_version
+
+    versions = registry.reload()
+    assert versions["triage_specialist"] == render(registry)[1] != old_version
+    assert set(versions) == {"story_miner", "triage_specialist"}
+
+
+def test_broken_edit_keeps_serving_the_last_good_version(prompts):
+    registry = PromptRegistry(prompts, reload_interval=0, cache_size=8)
+    good = render(registry)
+
+    write(prompts / "triage_specialist.txt", TRIAGE + " Customer: {customer_name}.", 2_000)
+    registry.reload()
+
+    assert render(registry) == good
+
+
+def test_missing_triage_prompt_is_refused(tmp_path):
+    write(tmp_path / "story_miner.txt", "You find stories.", 1_000)
+    with pytest.raises(RuntimeError, match="No triage_specialist prompt"):
+        PromptRegistry(tmp_path, reload_interval=0, cache_size=8)
+
+
+def test_render_cache_is_a_bounded_lru_keyed_by_version(prompts):
+    registry = PromptRegistry(prompts, reload_interval=0, cache_size=2)
+
+    render(registry, goals=("a",))
+    render(registry, goals=("b",))
+    render(registry, goals=("a",))  # hit; "b" is now least recently used
+    render(registry, goals=("c",))  # evicts "b"
+    render(registry, goals=("a",))  # still cached
+    assert registry.cache_info() == {"hits": 2, "misses": 3, "size": 2, "max_size": 2}
+
+    render(registry, goals=("b",))
+    assert registry.cache_info()["misses"] == 4
+
+    # A new version is a new key, so the old render is never served
+    write(prompts / "triage_specialist.txt", TRIAGE + " Be kind.", 2_000)
+    registry.reload()
+    assert render(registry, goals=("b",))[0].endswith("Be kind.")
+    assert registry.cache_info()["misses"] == 5
+
+
+@pytest.mark.asyncio
+async def test_reload_endpoint_reports_every_version():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/llm/prompts/reload")
+
+    assert response.status_code == 200
+    assert response.json() == {"versions": llm_service.prompts.versions()}
+    assert "concierge_coordinator" in response.json()["versions"]
@@ -0,0 +1,96 @@
+import asyncio
+import uuid
+
+import fakeredis
+import pytest
+import socketio
+from socketio import async_redis_manager
+
+from app.core.realtime import InMemoryPubSubManager, InstrumentedRedisManager
+
+
+class Worker:
+    """A Socket.IO server with one client in a session room, recording what it is sent"""
+
+    def __init__(self, manager):
+        self.server = socketio.AsyncServer(async_mode="asgi", client_manager=manager)
+        self.sent = []
+
+        async def send_eio_packet(eio_sid, eio_pkt):
+            self.sent.append((eio_sid, self.server.packet_class(encoded_packet=eio_pkt.data).data))
+        self.server._send_eio_packet = send_eio_packet
+
+    async def start(self, room: str):
+        self.server.manager_initialized = True
+        self.server.manager.initialize()
+        sid = await self.server.manager.connect("eio-client", "/")
+        await self.server.manager.enter_room(sid, "/", room)
+        await asyncio.sleep(0.01)  # let the listener subscribe
+
+    async def stop(self):
+        self.server.manager.thread.cancel()
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def emit_across_workers(make_manager):
+    room = "session:abc"
+    emitter, receiver = Worker(make_manager()), Worker(make_manager())
+    await emitter.start("session:other")
+    await receiver.start(room)
+    try:
+        await emitter.server.emit("pipeline_events", {"events": [{"event": "stage_started"}]}, room=room)
+        await wait_for(lambda: receiver.sent)
+    finally:
+        await emitter.stop()
+        await receiver.stop()
+
+    assert receiver.sent == [("eio-client", ["pipeline_events", {"events": [{"event": "stage_started"}]}])]
+    assert emitter.sent == []
+    return emitter.server.manager, receiver.server.manager
+
+
+@pytest.mark.asyncio
+async def test_in_memory_queue_delivers_to_the_worker_holding_the_room():
+    channel = f"test-{uuid.uuid4().hex}"
+    emitter, receiver = await emit_across_workers(lambda: InMemoryPubSubManager(channel=channel))
+
+    assert emitter.get_delivery_stats()["published"] == 1
+    stats = receiver.get_delivery_stats()
+    assert stats["delivered"] == 1
+    assert stats["latency_max_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_redis_queue_delivers_across_workers_with_stats(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        async_redis_manager.aioredis.Redis, "from_url",
+        lambda url, **options: fakeredis.aioredis.FakeRedis(server=server)
+    )
+    emitter, receiver = await emit_across_workers(
+        lambda: InstrumentedRedisManager("redis://fake", channel="kyoryoku-test")
+    )
+
+    assert emitter.get_delivery_stats() == {"published": 1, "delivered": 0, "dropped": 0}
+    assert receiver.get_delivery_stats()["delivered"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_counts_a_dropped_emit(monkeypatch):
+    server = fakeredis.FakeServer()
+    server.connected = False
+    monkeypatch.setattr(
+        async_redis_manager.aioredis.Redis, "from_url",
+        lambda url, **options: fakeredis.aioredis.FakeRedis(server=server)
+    )
+    manager = InstrumentedRedisManager("redis://fake", channel="kyoryoku-test", write_only=True)
+    socketio.AsyncServer(async_mode="asgi", client_manager=manager)
+
+    await manager.emit("pipeline_events", {"events": []}, room="session:abc")
+    assert manager.get_delivery_stats() == {"published": 0, "delivered": 0, "dropped": 1}
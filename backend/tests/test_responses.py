@@ -0,0 +1,104 @@
+import gzip
+import uuid
+from datetime import datetime
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.responses import FastJSONResponse, select_fields
+from app.services.llm_service import AgentResponse
+
+BIG = {"content": "All quiet on the support queue. " * 100}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    async def big():
+        return FastJSONResponse(BIG)
+
+    @app.get("/small")
+    async def small():
+        return FastJSONResponse({"ok": True})
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"x" * 600, b"y" * 600]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_fast_json_renders_models_uuids_and_datetimes():
+    session_id = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    triage = AgentResponse(content="Route to billing", confidence=0.8, reasoning="Invoice question")
+    response = FastJSONResponse({
+        "session_id": session_id,
+        "at": datetime(2026, 1, 2, 3, 4, 5),
+        "triage": triage,
+        1: "non-string key"
+    })
+
+    assert orjson.loads(response.body) == {
+        "session_id": str(session_id),
+        "at": "2026-01-02T03:04:05",
+        "triage": triage.model_dump(),
+        "1": "non-string key"
+    }
+
+
+def test_select_fields_keeps_only_requested_top_level_keys():
+    results = {"triage": 1, "research": 2, "response": 3}
+    assert select_fields(results, "response, triage,unknown") == {"triage": 1, "response": 3}
+    assert select_fields(results, None) is results
+    assert select_fields(results, " , ") == {}
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0, br;q=0", "gzip"),
+    ("*", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding_prefers_brotli_and_honours_q0(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_choose_encoding_falls_back_to_gzip_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+
+
+def test_large_json_is_gzipped_with_matching_length(client):
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    # httpx decodes the body; the header still describes the wire bytes
+    assert int(response.headers["content-length"]) == len(gzip.compress(orjson.dumps(BIG), compresslevel=5))
+    assert response.json() == BIG
+
+
+def test_large_json_is_brotli_compressed_when_accepted(client):
+    response = client.get("/big", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == BIG
+
+
+@pytest.mark.parametrize("path, accept", [
+    ("/small", "gzip"),
+    ("/stream", "gzip"),
+    ("/big", "identity"),
+])
+def test_small_streamed_or_unaccepted_responses_pass_through(client, path, accept):
+    response = client.get(path, headers={"Accept-Encoding": accept})
+    assert "content-encoding" not in response.headers
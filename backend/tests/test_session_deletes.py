@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.database import AsyncSessionLocal
+from app.models import Message, Session, Team
+from app.models.message import MessageType
+from app.models.session import SessionStatus
+from app.services.session_service import SessionService
+
+
+async def seed(db, *statuses: SessionStatus, messages_each: int = 3):
+    team = Team(name="Support")
+    db.add(team)
+    await db.flush()
+    sessions = [Session(team_id=team.id, task_description="Help", status=status) for status in statuses]
+    db.add_all(sessions)
+    await db.flush()
+    db.add_all([
+        Message(session_id=session.id, message_type=MessageType.RESPONSE, content="Done")
+        for session in sessions
+        for _ in range(messages_each)
+    ])
+    await db.commit()
+    return [session.id for session in sessions]
+
+
+async def count(db, model) -> int:
+    return await db.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+async def test_delete_session_cascades_to_messages(database):
+    async with AsyncSessionLocal() as db:
+        doomed, kept = await seed(db, SessionStatus.PENDING, SessionStatus.PENDING)
+        service = SessionService(db)
+
+        assert await service.delete_session(doomed)
+        assert not await service.delete_session(doomed)
+        await db.commit()
+
+        assert await db.scalar(select(func.count()).where(Message.session_id == doomed)) == 0
+        assert await db.scalar(select(func.count()).where(Message.session_id == kept)) == 3
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_matching_sessions_in_chunks(database):
+    async with AsyncSessionLocal() as db:
+        await seed(db, *[SessionStatus.FAILED] * 5, SessionStatus.RUNNING)
+
+        purged = await SessionService(db).purge_sessions(statuses=[SessionStatus.FAILED], chunk_size=2)
+
+        assert purged == 5
+        assert await count(db, Session) == 1
+        assert await count(db, Message) == 3
+
+
+@pytest.mark.asyncio
+async def test_purge_by_age_keeps_recent_sessions(database):
+    async with AsyncSessionLocal() as db:
+        old, recent = await seed(db, SessionStatus.COMPLETED, SessionStatus.COMPLETED, messages_each=0)
+        old_session = await db.get(Session, old)
+        old_session.created_at = datetime.utcnow() - timedelta(days=30)
+        await db.commit()
+
+        purged = await SessionService(db).purge_sessions(older_than=datetime.utcnow() - timedelta(days=7))
+
+        assert purged == 1
+        assert await db.scalar(select(Session.id)) == recent
+
+
+@pytest.mark.asyncio
+async def test_purge_requires_a_filter(database):
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(ValueError):
+            await SessionService(db).purge_sessions()
@@ -0,0 +1,80 @@
+import httpx
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.database import AsyncSessionLocal, ReadOnlySessionLocal
+from app.main import app
+from app.models import Session, Team
+from app.schemas.session import SessionResponse, SessionStatusResponse
+from app.services.session_service import SessionService
+
+
+@pytest.fixture
+def client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def create_team() -> Team:
+    async with AsyncSessionLocal() as db:
+        team = Team(name="Support", coordination_pattern="sequential_pipeline")
+        db.add(team)
+        await db.commit()
+        return team
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_rejects_writes(database):
+    async with ReadOnlySessionLocal() as db:
+        with pytest.raises(DBAPIError, match="read-only transaction"):
+            await db.execute(text(
+                "INSERT INTO teams (id, name) VALUES (gen_random_uuid(), 'Sneaky')"
+            ))
+
+
+@pytest.mark.asyncio
+async def test_created_session_is_committed_by_the_request_session(database, client):
+    team = await create_team()
+    async with client:
+        response = await client.post("/api/sessions/", json={
+            "team_id": str(team.id),
+            "task_description": "Triage the backlog"
+        })
+        assert response.status_code == 200
+        session_id = response.json()["id"]
+
+        fetched = await client.get(f"/api/sessions/{session_id}")
+        assert fetched.status_code == 200
+        assert fetched.json()["task_description"] == "Triage the backlog"
+
+    async with AsyncSessionLocal() as db:
+        assert await db.scalar(select(Session.task_description).where(Session.id == session_id))
+
+
+@pytest.mark.asyncio
+async def test_failed_create_leaves_nothing_behind(database, client):
+    async with client:
+        response = await client.post("/api/sessions/", json={
+            "team_id": "00000000-0000-0000-0000-000000000000",
+            "task_description": "No such team"
+        })
+    assert response.status_code == 500
+
+    async with AsyncSessionLocal() as db:
+        assert await db.scalar(select(Session.id)) is None
+
+
+@pytest.mark.asyncio
+async def test_summary_reads_return_response_models(database):
+    team = await create_team()
+    async with AsyncSessionLocal() as db:
+        db.add(Session(team_id=team.id, task_description="Summarise"))
+        await db.commit()
+
+    async with ReadOnlySessionLocal() as db:
+        service = SessionService(db)
+        [summary] = await service.list_sessions()
+        assert isinstance(summary, SessionResponse)
+        assert summary.status == "PENDING"
+        assert await service.get_session_summary(summary.id) == summary
+        assert isinstance(await service.get_session_status(summary.id), SessionStatusResponse)
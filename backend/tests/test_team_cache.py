@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models import Agent, Team
+from app.schemas.agent import AgentUpdate
+from app.services.agent_service import AgentService
+from app.services.team_cache import TeamAgentConfig, TeamCompositionCache, team_composition_cache
+
+
+@pytest.fixture
+def cached_team():
+    team_id, agent_id = uuid.uuid4(), uuid.uuid4()
+    team_composition_cache._entries[team_id] = (float("inf"), [TeamAgentConfig(id=agent_id)])
+    yield team_id, agent_id
+    team_composition_cache._entries.pop(team_id, None)
+
+
+@pytest.mark.asyncio
+async def test_agent_invalidation_waits_for_commit(cached_team):
+    team_id, agent_id = cached_team
+    db = AsyncSession()
+
+    team_composition_cache.invalidate_on_commit(db, agent_ids=[agent_id])
+    assert team_id in team_composition_cache._entries
+
+    await db.commit()
+    assert team_id not in team_composition_cache._entries
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_write_keeps_the_entry(cached_team):
+    team_id, agent_id = cached_team
+    db = AsyncSession()
+
+    team_composition_cache.invalidate_on_commit(db, agent_ids=[agent_id])
+    await db.rollback()
+    await db.close()
+    assert team_id in team_composition_cache._entries
+
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_is_not_stored():
+    cache = TeamCompositionCache(ttl_seconds=60)
+    team_id, agent_id = uuid.uuid4(), uuid.uuid4()
+
+    async def load(db, team):
+        # A write commits while the old rows are being read
+        cache.invalidate_agent(agent_id)
+        return [TeamAgentConfig(id=agent_id)]
+
+    cache._load = load
+    assert await cache.get(None, team_id) == [TeamAgentConfig(id=agent_id)]
+    assert team_id not in cache._entries
+
+
+@pytest.mark.asyncio
+async def test_team_invalidation_waits_for_commit(cached_team):
+    team_id, _ = cached_team
+    db = AsyncSession()
+
+    team_composition_cache.invalidate_on_commit(db, team_ids=[team_id])
+    assert team_id in team_composition_cache._entries
+
+    await db.commit()
+    assert team_id not in team_composition_cache._entries
+
+
+@pytest.mark.asyncio
+async def test_agent_update_refreshes_its_cached_team(database):
+    async with AsyncSessionLocal() as db:
+        team = Team(name="Support")
+        agent = Agent(name="Triage", template_type="triage_specialist", goals=["Route fast"])
+        team.agents.append(agent)
+        db.add(team)
+        await db.commit()
+        assert (await team_composition_cache.get(db, team.id))[0].goals == ["Route fast"]
+
+        await AgentService(db).update_agent(agent.id, AgentUpdate(goals=["Route carefully"]))
+        assert (await team_composition_cache.get(db, team.id))[0].goals == ["Route fast"]
+        await db.commit()
+        assert (await team_composition_cache.get(db, team.id))[0].goals == ["Route carefully"]
+
+        await AgentService(db).delete_agent(agent.id)
+        await db.commit()
+        assert await team_composition_cache.get(db, team.id) == []
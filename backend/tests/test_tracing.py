@@ -0,0 +1,71 @@
+import json
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import FileSpanExporter, setup_tracing
+from app.services.llm_service import orchestrator
+
+
+@pytest.fixture(scope="module")
+def spans():
+    """Finished spans from this module's tests; the global provider can only be set once"""
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    exporter = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+
+@pytest.mark.asyncio
+async def test_pipeline_spans_nest_stages_and_llm_calls(spans, fake_llm):
+    fake_llm()
+    spans.clear()
+
+    await orchestrator.process_guest_concierge_request("A quiet dinner for two tonight")
+
+    finished = {span.name: span for span in spans.get_finished_spans()}
+    pipeline = finished["pipeline guest_concierge"]
+    stage = finished["stage coordination_plan"]
+    llm_calls = [span for span in spans.get_finished_spans() if span.name == "anthropic.messages.create"]
+
+    assert pipeline.attributes["kyoryoku.outcome"] == "ok"
+    assert stage.parent.span_id == pipeline.context.span_id
+    assert stage.attributes["kyoryoku.agent_type"] == "concierge_coordinator"
+    assert stage.attributes["kyoryoku.confidence"] > 0
+    assert len(llm_calls) == 2
+    assert {call.parent.span_id for call in llm_calls} == {
+        finished["stage experience_analysis"].context.span_id, stage.context.span_id
+    }
+    assert all(call.attributes["kyoryoku.outcome"] == "ok" for call in llm_calls)
+    assert all(call.attributes["gen_ai.usage.output_tokens"] > 0 for call in llm_calls)
+
+
+def test_file_exporter_appends_one_json_line_per_span(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(FileSpanExporter(str(path))))
+    tracer = provider.get_tracer("test")
+
+    with tracer.start_as_current_span("outer"):
+        with tracer.start_as_current_span("inner", attributes={"kyoryoku.stage": "triage"}):
+            pass
+    provider.shutdown()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["inner", "outer"]
+    assert lines[0]["attributes"] == {"kyoryoku.stage": "triage"}
+
+
+@pytest.mark.parametrize("exporter", ["none", "carrier-pigeon"])
+def test_disabled_or_unknown_exporter_installs_nothing(exporter, monkeypatch):
+    monkeypatch.setattr(settings, "TRACING_EXPORTER", exporter)
+    assert setup_tracing(app=None, engines=[]) is None
+    assert tracing._create_exporter(exporter) is None
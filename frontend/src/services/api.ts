@@ -7,6 +7,8 @@ const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {
     'Content-Type': 'application/json',
+    // Someone is waiting on the UI, so its LLM work gets the interactive share
+    'X-Traffic-Class': 'interactive',
   },
 });
 